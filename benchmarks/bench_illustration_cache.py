@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""
+Benchmark du cache d'illustrations partagé entre plusieurs thèmes
+
+Deux thèmes (« bench » et « bench2 ») illustrent les mêmes sorts avec des
+fichiers de même nom mais de contenu différent, et partagent le même dossier
+de sortie, donc le même cache de dérivés. Le script construit les thèmes en
+alternance (bench, bench2, bench, bench2), puis les deux en parallèle sur un
+cache vide, et mesure le temps de chaque construction.
+
+Le script se termine en erreur si une construction alternée, une fois les
+deux thèmes construits, réduit à nouveau des illustrations ou supprime des
+dérivés (les thèmes s'évinceraient l'un l'autre), ou si une construction
+parallèle échoue : il sert ainsi de test de non-régression.
+
+Usage :
+    python benchmarks/bench_illustration_cache.py --spells 20 --output bench_illustration_cache.json
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import shutil
+import sys
+import tempfile
+import time
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+
+from bench_pdf_build import make_workspace  # noqa: E402
+
+THEMES = ["bench", "bench2"]
+
+
+def add_second_theme(workspace: str):
+    """Copie le thème bench en bench2, avec des illustrations homonymes mais différentes"""
+    from PIL import Image as PILImage, ImageOps
+
+    source = os.path.join(workspace, "themes", "bench")
+    target = os.path.join(workspace, "themes", "bench2")
+    shutil.copytree(source, target)
+    illustrations = os.path.join(target, "illustrations")
+    for file in os.listdir(illustrations):
+        path = os.path.join(illustrations, file)
+        with PILImage.open(path) as img:
+            inverted = ImageOps.invert(img.convert("RGB"))
+        inverted.save(path)
+
+
+def cache_state(cache_dir: str) -> dict:
+    """Dérivés présents dans le cache, avec leur date de modification"""
+    if not os.path.isdir(cache_dir):
+        return {}
+    return {file: os.stat(os.path.join(cache_dir, file)).st_mtime_ns
+            for file in os.listdir(cache_dir) if not file.startswith(".")}
+
+
+def build(themes: list, output_dir: str, jobs: int) -> dict:
+    """Construit des thèmes et retourne la durée et le nombre d'échecs"""
+    from spell_book.batch import build_grimoires, discover_targets
+
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        results = build_grimoires(discover_targets(players=[], themes=themes), output_dir=output_dir, jobs=jobs)
+    return {"themes": themes, "jobs": jobs, "seconds": round(time.perf_counter() - start, 2),
+            "errors": [result.error for result in results if result.error]}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark du cache d'illustrations partagé entre thèmes")
+    parser.add_argument("--spells", type=int, default=20, help="Nombre de sorts illustrés")
+    parser.add_argument("--output", default="bench_illustration_cache.json", help="Fichier JSON de résultats")
+    args = parser.parse_args()
+
+    # Aucun appel réseau : pas de génération d'illustration
+    os.environ.pop("OPENAI_API_KEY", None)
+
+    root = tempfile.mkdtemp(prefix="bench_illustration_cache_")
+    results = {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "spells": args.spells,
+        "runs": [],
+    }
+    problems = []
+    previous_cwd = os.getcwd()
+    try:
+        workspace = make_workspace(root, args.spells, illustrated_ratio=1)
+        add_second_theme(workspace)
+        os.chdir(workspace)
+        cache_dir = os.path.join("grimoires", ".cache", "illustrations")
+
+        for i, theme in enumerate(THEMES * 2):
+            before = cache_state(cache_dir)
+            run = build([theme], "grimoires", jobs=1)
+            after = cache_state(cache_dir)
+            run["rendered"] = sum(1 for file, mtime in after.items() if before.get(file) != mtime)
+            run["removed"] = sum(1 for file in before if file not in after)
+            results["runs"].append(run)
+            print(f"🖼️  Thème {theme} : {run['seconds']:.2f}s, {run['rendered']} dérivé(s) réduit(s), "
+                  f"{run['removed']} supprimé(s)")
+            if i >= len(THEMES) and (run["rendered"] or run["removed"]):
+                problems.append(f"le thème {theme} a réduit {run['rendered']} et supprimé {run['removed']} "
+                                f"dérivé(s) alors que le cache était à jour")
+            problems += [f"thème {theme} : {error}" for error in run["errors"]]
+
+        shutil.rmtree("grimoires")
+        run = build(THEMES, "grimoires", jobs=len(THEMES))
+        run["derivatives"] = len(cache_state(cache_dir))
+        results["runs"].append(run)
+        print(f"🖼️  Thèmes en parallèle : {run['seconds']:.2f}s, {run['derivatives']} dérivés en cache")
+        problems += [f"construction parallèle : {error}" for error in run["errors"]]
+        if run["derivatives"] != len(THEMES) * args.spells:
+            problems.append(f"{run['derivatives']} dérivés en cache après la construction parallèle "
+                            f"(attendu : {len(THEMES) * args.spells})")
+    finally:
+        os.chdir(previous_cwd)
+        shutil.rmtree(root, ignore_errors=True)
+
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(results, f, indent=4, ensure_ascii=False)
+    print(f"📊 Résultats enregistrés : {args.output}")
+
+    if problems:
+        print("❌ " + " ; ".join(problems))
+        sys.exit(1)
+    print("✅ Les thèmes aux illustrations homonymes partagent le cache sans s'évincer")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""
+Benchmark du démarrage à froid du paquet spell_book
+
+Chaque scénario est exécuté dans un nouvel interpréteur (plusieurs fois, on
+retient la médiane) : import du paquet, import du corpus seul, import du
+générateur PDF, puis construction complète d'un petit grimoire hors ligne.
+Pour chaque scénario, le benchmark relève aussi les modules lourds chargés
+(SDK OpenAI, requests, dotenv, ReportLab, pypdf).
+
+Le scénario « build PDF » doit tenir dans le budget donné (--budget-ms) sans
+charger de client réseau : sinon le script se termine en erreur, ce qui
+permet de l'utiliser comme garde-fou.
+
+Usage :
+    python benchmarks/bench_import_time.py --repeat 5 --budget-ms 600 --output bench_import.json
+"""
+
+import argparse
+import json
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+
+from bench_pdf_build import make_workspace  # noqa: E402
+
+HEAVY_MODULES = ["openai", "requests", "dotenv", "reportlab.platypus", "pypdf", "PIL.Image"]
+# Clients réseau qu'une construction PDF hors ligne ne doit jamais charger
+NETWORK_MODULES = ["openai", "requests"]
+
+SCENARIOS = {
+    "import_package": "import spell_book",
+    "import_corpus": "from spell_book import SpellCorpus",
+    "import_generator": "from spell_book import SpellPDFGenerator",
+    "pdf_build": (
+        "import contextlib, io\n"
+        "from spell_book import SpellPDFGenerator\n"
+        "with contextlib.redirect_stdout(io.StringIO()):\n"
+        "    SpellPDFGenerator(theme='bench', output_dir='out').generate_theme_grimoire('out/grimoire.pdf')\n"
+    ),
+}
+
+CHILD_TEMPLATE = """
+import sys, time, json
+sys.path.insert(0, {repo!r})
+start = time.perf_counter()
+{code}
+elapsed = time.perf_counter() - start
+print(json.dumps({{"ms": elapsed * 1000, "modules": [m for m in {heavy!r} if m in sys.modules]}}))
+"""
+
+
+def run_scenario(code: str, workspace: str, repeat: int) -> dict:
+    """Exécute un scénario dans des interpréteurs neufs et retourne la médiane des durées"""
+    script = CHILD_TEMPLATE.format(repo=REPO_ROOT, code=code, heavy=HEAVY_MODULES)
+    env = {key: value for key, value in os.environ.items() if key != "OPENAI_API_KEY"}
+    timings, modules = [], []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        completed = subprocess.run([sys.executable, "-c", script], cwd=workspace, env=env,
+                                   capture_output=True, text=True, check=True)
+        process_ms = (time.perf_counter() - start) * 1000
+        result = json.loads(completed.stdout.strip().splitlines()[-1])
+        timings.append((result["ms"], process_ms))
+        modules = result["modules"]
+    return {
+        "median_ms": round(statistics.median(t[0] for t in timings), 1),
+        "median_process_ms": round(statistics.median(t[1] for t in timings), 1),
+        "heavy_modules": modules,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark du démarrage à froid de spell_book")
+    parser.add_argument("--repeat", type=int, default=5, help="Exécutions par scénario (médiane)")
+    parser.add_argument("--budget-ms", type=float, default=600, help="Budget du scénario de build PDF")
+    parser.add_argument("--output", default="bench_import.json", help="Fichier JSON de résultats")
+    args = parser.parse_args()
+
+    root = tempfile.mkdtemp(prefix="bench_import_")
+    results = {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "budget_ms": args.budget_ms,
+        "scenarios": {},
+    }
+    try:
+        workspace = make_workspace(root, 10, illustrated_ratio=0)
+        os.makedirs(os.path.join(workspace, "out"))
+        for name, code in SCENARIOS.items():
+            result = run_scenario(code, workspace, args.repeat)
+            results["scenarios"][name] = result
+            modules = ", ".join(result["heavy_modules"]) or "aucun"
+            print(f"🚀 {name} : {result['median_ms']:.0f} ms (processus {result['median_process_ms']:.0f} ms), "
+                  f"modules lourds : {modules}")
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(results, f, indent=4, ensure_ascii=False)
+    print(f"📊 Résultats enregistrés : {args.output}")
+
+    build = results["scenarios"]["pdf_build"]
+    problems = []
+    if build["median_ms"] > args.budget_ms:
+        problems.append(f"build PDF {build['median_ms']:.0f} ms > budget {args.budget_ms:.0f} ms")
+    network = [m for m in build["heavy_modules"] if m in NETWORK_MODULES]
+    if network:
+        problems.append(f"clients réseau chargés par un build hors ligne : {', '.join(network)}")
+    if problems:
+        print("❌ " + " ; ".join(problems))
+        sys.exit(1)
+    print(f"✅ Build PDF dans le budget ({build['median_ms']:.0f}/{args.budget_ms:.0f} ms)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,199 @@
+#!/usr/bin/env python3
+"""
+Benchmark du pipeline de génération de grimoire sur des corpus synthétiques
+
+Génère des corpus de N fiches de sorts (50, 500 et 5000 par défaut) avec des
+illustrations factices, puis mesure séparément le chargement, le filtrage,
+la construction du récit, le rendu ReportLab (doc.build) et l'écriture du
+fichier, ainsi que le pic mémoire du processus. Fonctionne hors ligne.
+
+Avec --trace-memory, le pic mémoire Python de chaque étape est aussi mesuré
+via tracemalloc (ce qui ralentit sensiblement les étapes mesurées).
+
+Usage :
+    python benchmarks/bench_pdf_build.py --sizes 50 500 --output bench_results.json
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import random
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+
+SCHOOLS = ["Abjuration", "Divination", "Enchantement", "Évocation", "Illusion", "Invocation", "Nécromancie", "Transmutation"]
+LOREM = ("Une énergie arcanique jaillit de vos mains et enveloppe la cible. "
+         "La créature doit réussir un jet de sauvegarde ou subir les effets du sort. ")
+
+BENCH_THEME = {
+    "title": "Grimoire de benchmark",
+    "fonts": {"body": "HomemadeApple-Regular.ttf", "title": "CaesarDressing-Regular.ttf"},
+    "colors": {"title": "#8B0000", "subtitle": "#2F4F4F", "body": "#000000"},
+    "spell_filter": "all",
+}
+
+
+def make_workspace(root: str, size: int, illustrated_ratio: float = 0.5, seed: int = 42) -> str:
+    """Crée un espace de travail complet (sorts, thème, polices, illustrations) et retourne son chemin"""
+    from PIL import Image as PILImage
+
+    rng = random.Random(seed)
+    workspace = os.path.join(root, f"corpus_{size}")
+    folder = os.path.join(workspace, "fiches_sorts")
+    illustrations = os.path.join(workspace, "themes", "bench", "illustrations")
+    os.makedirs(folder)
+    os.makedirs(illustrations)
+    shutil.copytree(os.path.join(REPO_ROOT, "fonts"), os.path.join(workspace, "fonts"))
+    with open(os.path.join(workspace, "themes", "bench", "config.json"), "w", encoding="utf-8") as f:
+        json.dump(BENCH_THEME, f, ensure_ascii=False)
+
+    placeholder = PILImage.radial_gradient("L").resize((1024, 1024)).convert("RGB")
+    for i in range(size):
+        name = f"Sort synthétique {i:05d}"
+        spell = {
+            "Nom": name,
+            "Nom original": f"Synthetic spell {i}",
+            "Niveau": rng.randint(0, 9),
+            "École": rng.choice(SCHOOLS),
+            "Temps d'incantation": "1 action",
+            "Portée": rng.choice([0, 9, 18, 36, "Contact", "Personnelle"]),
+            "Cible": "Une créature à portée",
+            "Composantes": "V, S, M",
+            "Durée": "1 minute",
+            "Concentration": rng.random() < 0.4,
+            "Rituel": "oui" if rng.random() < 0.1 else "non",
+            "Temps du rituel": None,
+            "Type d'attaque / sauvegarde": "Sauvegarde de Sagesse",
+            "Effet synthétique": "Effet de test.",
+            "Description complète": LOREM * rng.randint(2, 8),
+            "Effet en surcaste": "Les dégâts augmentent de 1d6 par niveau." if rng.random() < 0.5 else None,
+        }
+        filename = f"sort_synthetique_{i:05d}"
+        with open(os.path.join(folder, filename + ".json"), "w", encoding="utf-8") as f:
+            json.dump(spell, f, indent=4, ensure_ascii=False)
+        if rng.random() < illustrated_ratio:
+            placeholder.save(os.path.join(illustrations, filename + ".png"))
+    return workspace
+
+
+class StageTimer:
+    """Mesure la durée (et optionnellement le pic mémoire tracemalloc) d'étapes successives"""
+
+    def __init__(self, trace_memory: bool = False):
+        self.trace_memory = trace_memory
+        self.stages = {}
+
+    @contextlib.contextmanager
+    def stage(self, name: str):
+        if self.trace_memory:
+            tracemalloc.reset_peak()
+        start = time.perf_counter()
+        yield
+        elapsed = time.perf_counter() - start
+        self.stages[name] = {"seconds": round(elapsed, 4)}
+        if self.trace_memory:
+            self.stages[name]["peak_traced_bytes"] = tracemalloc.get_traced_memory()[1]
+
+
+def peak_rss_bytes() -> int:
+    """Pic de mémoire résidente du processus (None si indisponible)"""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def run_once(workspace: str, trace_memory: bool = False) -> dict:
+    """Exécute le pipeline complet dans un espace de travail et retourne les mesures"""
+    from spell_book import SpellPDFGenerator, SpellCorpus
+
+    timer = StageTimer(trace_memory)
+    output_path = os.path.join(workspace, "grimoire.pdf")
+    previous_cwd = os.getcwd()
+    os.chdir(workspace)
+    if trace_memory:
+        tracemalloc.start()
+    try:
+        with contextlib.redirect_stdout(io.StringIO()):
+            with timer.stage("load"):
+                corpus = SpellCorpus.from_folder("fiches_sorts")
+            with timer.stage("generator_init"):
+                generator = SpellPDFGenerator(theme="bench", output_dir=os.path.join(workspace, "out"), corpus=corpus)
+            with timer.stage("filter"):
+                document = generator.build_render_model(corpus)
+            with timer.stage("story"):
+                styles = generator._grimoire_styles()
+                story = []
+                generator._append_grimoire_toc(story, document, styles)
+                for record in document.spells():
+                    generator._append_spell_to_story(record, story, styles)
+            buffer = io.BytesIO()
+            with timer.stage("doc_build"):
+                generator._new_document(buffer).build(story)
+            with timer.stage("write"):
+                with open(output_path, "wb") as f:
+                    f.write(buffer.getvalue())
+    finally:
+        if trace_memory:
+            tracemalloc.stop()
+        os.chdir(previous_cwd)
+
+    return {
+        "spells": len(corpus),
+        "stages": timer.stages,
+        "total_seconds": round(sum(s["seconds"] for s in timer.stages.values()), 4),
+        "peak_rss_bytes": peak_rss_bytes(),
+        "output_bytes": os.path.getsize(output_path),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de génération de grimoire")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[50, 500, 5000], help="Tailles de corpus à mesurer")
+    parser.add_argument("--output", default="bench_results.json", help="Fichier JSON de résultats")
+    parser.add_argument("--keep", action="store_true", help="Conserver les corpus générés")
+    parser.add_argument("--trace-memory", action="store_true", help="Mesurer le pic mémoire Python de chaque étape")
+    args = parser.parse_args()
+
+    # Aucun appel réseau : pas de génération d'illustration
+    os.environ.pop("OPENAI_API_KEY", None)
+
+    root = tempfile.mkdtemp(prefix="bench_grimoire_")
+    results = {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "runs": [],
+    }
+    try:
+        for size in args.sizes:
+            workspace = make_workspace(root, size)
+            run = run_once(workspace, trace_memory=args.trace_memory)
+            results["runs"].append(run)
+            stages = ", ".join(f"{name} {s['seconds']:.2f}s" for name, s in run["stages"].items())
+            peak = f", pic RSS {run['peak_rss_bytes'] / 1024 / 1024:.0f} Mo" if run["peak_rss_bytes"] else ""
+            print(f"⏱️  {size} sorts : {run['total_seconds']:.2f}s ({stages}){peak}")
+    finally:
+        if not args.keep:
+            shutil.rmtree(root, ignore_errors=True)
+
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(results, f, indent=4, ensure_ascii=False)
+    print(f"📊 Résultats enregistrés : {args.output}")
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
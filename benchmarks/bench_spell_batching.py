@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+"""
+Benchmark de la génération groupée des fiches de sorts contre un serveur OpenAI factice
+
+Un serveur HTTP local imite l'API chat.completions : il répond aux requêtes
+individuelles par un objet JSON et aux requêtes groupées par un tableau, avec
+une latence fixe par requête, et compte les requêtes reçues. Une fraction des
+fiches peut être volontairement invalide (--invalid-rate) pour mesurer le coût
+des nouveaux essais individuels. Fonctionne hors ligne.
+
+Usage :
+    python benchmarks/bench_spell_batching.py --spells 200 --batch-sizes 1 5 10 20 --latency 0.2
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import random
+import re
+import shutil
+import sys
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+
+SINGLE_SPELL_PATTERN = re.compile(r'fiche complète du sort "(.+?)"')
+BATCH_SPELL_PATTERN = re.compile(r'^- "(.+)"$', re.MULTILINE)
+
+
+def fake_spell(name: str) -> dict:
+    return {
+        "Nom": name,
+        "Nom original": f"{name} (en)",
+        "Niveau": len(name) % 10,
+        "École": "Évocation",
+        "Temps d'incantation": "1 action",
+        "Portée": "18 mètres",
+        "Cible": "Une créature",
+        "Composantes": "V, S",
+        "Durée": "Instantanée",
+        "Concentration": False,
+        "Rituel": "non",
+        "Temps du rituel": None,
+        "Type d'attaque / sauvegarde": "Sauvegarde de Dextérité",
+        "Effet synthétique": "Une gerbe d'énergie frappe la cible.",
+        "Description complète": "Une gerbe d'énergie arcanique frappe la cible. " * 8,
+        "Effet en surcaste": None,
+    }
+
+
+class FakeOpenAIServer:
+    """Serveur chat.completions factice qui compte les requêtes reçues"""
+
+    def __init__(self, latency: float = 0.0, invalid_rate: float = 0.0, seed: int = 42):
+        self.latency = latency
+        self.invalid_rate = invalid_rate
+        self.rng = random.Random(seed)
+        self.requests = 0
+        self.spells_requested = 0
+        self.lock = threading.Lock()
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def do_POST(self):
+                body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+                content = server.respond(body["messages"][-1]["content"])
+                payload = json.dumps({
+                    "id": "bench", "object": "chat.completion", "created": 0, "model": body.get("model", "gpt-4"),
+                    "choices": [{"index": 0, "message": {"role": "assistant", "content": content}, "finish_reason": "stop"}],
+                }).encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        threading.Thread(target=self.httpd.serve_forever, daemon=True).start()
+
+    @property
+    def base_url(self) -> str:
+        return f"http://127.0.0.1:{self.httpd.server_port}/v1"
+
+    def _spell_or_invalid(self, name: str) -> dict:
+        with self.lock:
+            invalid = self.rng.random() < self.invalid_rate
+        return {"Nom": name} if invalid else fake_spell(name)
+
+    def respond(self, prompt: str) -> str:
+        time.sleep(self.latency)
+        single = SINGLE_SPELL_PATTERN.search(prompt)
+        names = [single.group(1)] if single else BATCH_SPELL_PATTERN.findall(prompt)
+        with self.lock:
+            self.requests += 1
+            self.spells_requested += len(names)
+        if single:
+            # Les requêtes individuelles (y compris les nouveaux essais) réussissent toujours
+            return json.dumps(fake_spell(names[0]), ensure_ascii=False)
+        return json.dumps([self._spell_or_invalid(name) for name in names], ensure_ascii=False)
+
+    def reset(self):
+        with self.lock:
+            self.requests = 0
+            self.spells_requested = 0
+
+    def close(self):
+        self.httpd.shutdown()
+
+
+def run_once(server: FakeOpenAIServer, root: str, spell_names: list, batch_size: int, max_workers: int) -> dict:
+    from character_sheet import SpellSheetGenerator
+
+    output_dir = os.path.join(root, f"batch_{batch_size}")
+    server.reset()
+    generator = SpellSheetGenerator(api_key="bench", output_dir=output_dir, base_url=server.base_url,
+                                    requests_per_second=1000)
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        generator.generate_spell_files(spell_names, max_workers=max_workers, batch_size=batch_size)
+    elapsed = time.perf_counter() - start
+
+    with open(os.path.join(output_dir, "index.json"), encoding="utf-8") as f:
+        indexed = len(json.load(f))
+    return {
+        "batch_size": batch_size,
+        "seconds": round(elapsed, 3),
+        "requests": server.requests,
+        "spells_requested": server.spells_requested,
+        "spells_indexed": indexed,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de la génération groupée des fiches de sorts")
+    parser.add_argument("--spells", type=int, default=100, help="Nombre de sorts à générer")
+    parser.add_argument("--batch-sizes", type=int, nargs="+", default=[1, 5, 10, 20], help="Tailles de lot à mesurer")
+    parser.add_argument("--latency", type=float, default=0.2, help="Latence simulée par requête (secondes)")
+    parser.add_argument("--invalid-rate", type=float, default=0.05, help="Part des fiches invalides dans un lot")
+    parser.add_argument("-j", "--jobs", type=int, default=1, help="Requêtes simultanées")
+    parser.add_argument("--output", default="bench_batching.json", help="Fichier JSON de résultats")
+    args = parser.parse_args()
+
+    spell_names = [f"Sort de test {i:04d}" for i in range(args.spells)]
+    server = FakeOpenAIServer(latency=args.latency, invalid_rate=args.invalid_rate)
+    root = tempfile.mkdtemp(prefix="bench_batching_")
+    results = {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "spells": args.spells,
+        "latency": args.latency,
+        "invalid_rate": args.invalid_rate,
+        "jobs": args.jobs,
+        "runs": [],
+    }
+    try:
+        for batch_size in args.batch_sizes:
+            run = run_once(server, root, spell_names, batch_size, args.jobs)
+            results["runs"].append(run)
+            print(f"⏱️  lots de {batch_size} : {run['seconds']:.2f}s, {run['requests']} requêtes, "
+                  f"{run['spells_indexed']}/{args.spells} fiches indexées")
+    finally:
+        server.close()
+        shutil.rmtree(root, ignore_errors=True)
+
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(results, f, indent=4, ensure_ascii=False)
+    print(f"📊 Résultats enregistrés : {args.output}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""
+Benchmark mémoire de la construction des très grands grimoires
+
+Sur des corpus synthétiques sans illustration (1000 et 5000 sorts par défaut),
+compare le pic de mémoire résidente pendant le rendu PDF selon le mode :
+  - « liste » : récit complet construit en mémoire puis doc.build (render_pdf) ;
+  - « flux » : flowables produits à la demande, un seul document (render_pdf_streaming) ;
+  - « parties » : flux écrit en parties de --chunk-size sorts, fusionnées à la fin.
+
+Chaque mesure est faite dans un nouvel interpréteur. Le corpus et le modèle de
+rendu sont chargés avant la mesure : seul le surcoût du rendu est comparé.
+
+Le script se termine en erreur si, sur le plus grand corpus, les modes
+« flux » ou « parties » ne consomment pas moins de mémoire que le mode
+« liste », ou si, entre le plus petit et le plus grand corpus, le pic du mode
+« parties » croît de plus de --max-growth-ratio fois la croissance du mode
+« liste » (mémoire non bornée) : il sert ainsi de test de non-régression.
+La croissance est comparée à celle du mode « liste » plutôt qu'à un seuil en
+Ko par sort, qui dépend des tailles mesurées (sur de petits corpus, le coût
+fixe du mode « parties » domine) et de l'allocateur.
+
+Usage :
+    python benchmarks/bench_streaming_memory.py --sizes 1000 5000 --chunk-size 250 --output bench_streaming.json
+"""
+
+import argparse
+import json
+import os
+import platform
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+
+from bench_pdf_build import make_workspace  # noqa: E402
+from spell_book.streaming import DEFAULT_CHUNK_SIZE  # noqa: E402
+
+MODES = ["liste", "flux", "parties"]
+
+CHILD_TEMPLATE = """
+import json, os, sys, time, contextlib
+sys.path.insert(0, {repo!r})
+sys.path.insert(0, {benchmarks!r})
+from bench_pdf_build import peak_rss_bytes
+from spell_book import SpellCorpus, SpellPDFGenerator
+
+mode, chunk_size = {mode!r}, {chunk_size!r}
+with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+    corpus = SpellCorpus.load("fiches_sorts")
+    generator = SpellPDFGenerator(theme="bench", output_dir="out", corpus=corpus)
+    document = generator.build_render_model(corpus)
+    baseline = peak_rss_bytes()
+    start = time.perf_counter()
+    if mode == "liste":
+        generator.render_pdf(document, "out/grimoire.pdf")
+    else:
+        generator.render_pdf_streaming(document, "out/grimoire.pdf", chunk_size if mode == "parties" else None)
+    elapsed = time.perf_counter() - start
+print(json.dumps({{"seconds": elapsed, "baseline_bytes": baseline, "peak_bytes": peak_rss_bytes(),
+                  "pdf_bytes": os.path.getsize("out/grimoire.pdf")}}))
+"""
+
+
+def run_mode(workspace: str, mode: str, chunk_size: int) -> dict:
+    """Rend le grimoire dans un interpréteur neuf et retourne le pic mémoire du rendu"""
+    script = CHILD_TEMPLATE.format(repo=REPO_ROOT, benchmarks=os.path.dirname(os.path.abspath(__file__)),
+                                   mode=mode, chunk_size=chunk_size)
+    env = {key: value for key, value in os.environ.items() if key != "OPENAI_API_KEY"}
+    completed = subprocess.run([sys.executable, "-c", script], cwd=workspace, env=env,
+                               capture_output=True, text=True, check=True)
+    result = json.loads(completed.stdout.strip().splitlines()[-1])
+    result["render_peak_bytes"] = result["peak_bytes"] - result["baseline_bytes"]
+    result["seconds"] = round(result["seconds"], 2)
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark mémoire du rendu des grands grimoires")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 5000], help="Tailles de corpus à mesurer")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE, help="Sorts par partie en mode « parties »")
+    parser.add_argument("--max-growth-ratio", type=float, default=0.25,
+                        help="Croissance maximale du pic en mode « parties », rapportée à celle du mode « liste »")
+    parser.add_argument("--output", default="bench_streaming.json", help="Fichier JSON de résultats")
+    args = parser.parse_args()
+
+    root = tempfile.mkdtemp(prefix="bench_streaming_")
+    results = {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "chunk_size": args.chunk_size,
+        "runs": [],
+    }
+    try:
+        for size in args.sizes:
+            workspace = make_workspace(root, size, illustrated_ratio=0)
+            os.makedirs(os.path.join(workspace, "out"))
+            run = {"spells": size, "modes": {}}
+            for mode in MODES:
+                m = run["modes"][mode] = run_mode(workspace, mode, args.chunk_size)
+                print(f"🧠 {size} sorts, mode {mode} : pic du rendu {m['render_peak_bytes'] / 1024 ** 2:.1f} Mo "
+                      f"({m['render_peak_bytes'] / size / 1024:.1f} Ko/sort), {m['seconds']:.1f}s, "
+                      f"PDF {m['pdf_bytes'] / 1024 ** 2:.1f} Mo")
+            results["runs"].append(run)
+            shutil.rmtree(workspace, ignore_errors=True)
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+
+    smallest = min(results["runs"], key=lambda run: run["spells"])
+    largest = max(results["runs"], key=lambda run: run["spells"])
+    listed = largest["modes"]["liste"]["render_peak_bytes"]
+    problems = []
+    for mode, label in (("flux", "en flux"), ("parties", "en parties")):
+        peak = largest["modes"][mode]["render_peak_bytes"]
+        if peak >= listed:
+            problems.append(f"{largest['spells']} sorts : le rendu {label} ({peak / 1024 ** 2:.1f} Mo) "
+                            f"ne consomme pas moins que le récit complet ({listed / 1024 ** 2:.1f} Mo)")
+    added = largest["spells"] - smallest["spells"]
+    if added:
+        growth = {mode: (largest["modes"][mode]["render_peak_bytes"]
+                         - smallest["modes"][mode]["render_peak_bytes"]) / added / 1024 for mode in MODES}
+        results["growth_kb_per_spell"] = {mode: round(value, 2) for mode, value in growth.items()}
+        limit = args.max_growth_ratio * growth["liste"]
+        if growth["parties"] > limit:
+            problems.append(f"le pic du rendu en parties croît de {growth['parties']:.1f} Ko par sort ajouté "
+                            f"(maximum {limit:.1f}, soit {args.max_growth_ratio:.0%} du récit complet)")
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(results, f, indent=4, ensure_ascii=False)
+    print(f"📊 Résultats enregistrés : {args.output}")
+
+    if problems:
+        print("❌ " + " ; ".join(problems))
+        sys.exit(1)
+    print(f"✅ {largest['spells']} sorts : rendu en flux {largest['modes']['flux']['render_peak_bytes'] / 1024 ** 2:.1f} Mo, "
+          f"en parties {largest['modes']['parties']['render_peak_bytes'] / 1024 ** 2:.1f} Mo, "
+          f"contre {listed / 1024 ** 2:.1f} Mo pour le récit complet")
+
+
+if __name__ == "__main__":
+    main()
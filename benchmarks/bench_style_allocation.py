@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""
+Benchmark des allocations par page de sort selon la gestion des styles
+
+Compare, sur des corpus synthétiques sans illustration, la construction du
+récit d'un grimoire :
+  - « reconstruits » : feuille de styles et TableStyle recréés pour chaque
+    sort, comme avant le partage des styles ;
+  - « partagés » : un seul StyleBundle par thème, réutilisé par toutes les pages.
+
+Pour chaque page, tracemalloc mesure le pic d'allocation transitoire et la
+mémoire retenue par le récit. Le coût de création de générateurs successifs
+pour un même thème (lots de grimoires) est aussi mesuré.
+
+Usage :
+    python benchmarks/bench_style_allocation.py --sizes 500 5000 --output bench_styles.json
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+
+from bench_pdf_build import make_workspace  # noqa: E402
+
+
+def measure_story(generator, document, shared: bool) -> dict:
+    """Construit le récit des fiches et mesure les allocations par page"""
+    from spell_book.styles import StyleBundle
+
+    spells = list(document.spells())
+    transient = 0
+    tracemalloc.start()
+    start_current = tracemalloc.get_traced_memory()[0]
+    start = time.perf_counter()
+    story = []
+    for record in spells:
+        tracemalloc.reset_peak()
+        before = tracemalloc.get_traced_memory()[0]
+        if shared:
+            styles = generator._grimoire_styles()
+        else:
+            styles = StyleBundle.build(generator.font_name, generator.font_name_title, generator.theme_colors)
+        generator._append_spell_to_story(record, story, styles)
+        transient += tracemalloc.get_traced_memory()[1] - before
+    elapsed = time.perf_counter() - start
+    retained = tracemalloc.get_traced_memory()[0] - start_current
+    tracemalloc.stop()
+    return {
+        "seconds": round(elapsed, 4),
+        "us_per_spell": round(elapsed / len(spells) * 1e6, 1),
+        "peak_bytes_per_spell": transient // len(spells),
+        "retained_bytes_per_spell": retained // len(spells),
+    }
+
+
+def measure_generator_init(count: int) -> dict:
+    """Crée plusieurs générateurs pour un même thème, comme un lot de grimoires dans un processus"""
+    from spell_book import SpellPDFGenerator
+
+    start = time.perf_counter()
+    generators = [SpellPDFGenerator(theme="bench", output_dir="out") for _ in range(count)]
+    elapsed = time.perf_counter() - start
+    return {
+        "generators": count,
+        "ms_per_generator": round(elapsed / count * 1000, 3),
+        "distinct_style_bundles": len({id(generator.styles) for generator in generators}),
+    }
+
+
+def run_once(workspace: str, generators: int) -> dict:
+    from spell_book import SpellPDFGenerator, SpellCorpus
+
+    previous_cwd = os.getcwd()
+    os.chdir(workspace)
+    try:
+        with contextlib.redirect_stdout(io.StringIO()):
+            corpus = SpellCorpus.from_folder("fiches_sorts")
+            generator = SpellPDFGenerator(theme="bench", output_dir="out", corpus=corpus)
+            document = generator.build_render_model(corpus)
+            rebuilt = measure_story(generator, document, shared=False)
+            shared = measure_story(generator, document, shared=True)
+            init = measure_generator_init(generators)
+    finally:
+        os.chdir(previous_cwd)
+    return {"spells": len(document), "rebuilt": rebuilt, "shared": shared, "generator_init": init}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark des allocations de styles par page de sort")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[500, 5000], help="Tailles de corpus à mesurer")
+    parser.add_argument("--generators", type=int, default=20, help="Générateurs créés pour un même thème")
+    parser.add_argument("--output", default="bench_styles.json", help="Fichier JSON de résultats")
+    args = parser.parse_args()
+
+    # Aucun appel réseau : pas de génération d'illustration
+    os.environ.pop("OPENAI_API_KEY", None)
+
+    root = tempfile.mkdtemp(prefix="bench_styles_")
+    results = {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "runs": [],
+    }
+    try:
+        for size in args.sizes:
+            run = run_once(make_workspace(root, size, illustrated_ratio=0), args.generators)
+            results["runs"].append(run)
+            for mode in ("rebuilt", "shared"):
+                m = run[mode]
+                print(f"🎨 {size} sorts, styles {'reconstruits' if mode == 'rebuilt' else 'partagés'} : "
+                      f"{m['us_per_spell']:.0f} µs/sort, pic {m['peak_bytes_per_spell'] / 1024:.1f} Ko/sort, "
+                      f"retenu {m['retained_bytes_per_spell'] / 1024:.1f} Ko/sort")
+            init = run["generator_init"]
+            print(f"🧙 {init['generators']} générateurs : {init['ms_per_generator']:.2f} ms chacun, "
+                  f"{init['distinct_style_bundles']} jeu(x) de styles construit(s)")
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(results, f, indent=4, ensure_ascii=False)
+    print(f"📊 Résultats enregistrés : {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,4 +1,29 @@
-from .spell_generator import SpellSheetGenerator
-from .utils import sanitize_filename
+import importlib
 
-__all__ = ["SpellSheetGenerator", "sanitize_filename"]
\ No newline at end of file
+# Exports chargés à la demande : importer le paquet (ou l'un de ses utilitaires)
+# ne charge pas le SDK OpenAI
+_EXPORTS = {
+    "SpellSheetGenerator": ".spell_generator",
+    "TokenBucket": ".rate_limit",
+    "RetryPolicy": ".retry",
+    "GenerationJournal": ".journal",
+    "JsonlSpellStore": ".spell_store",
+    "ZipSpellArchive": ".spell_store",
+    "ResponseCache": ".response_cache",
+    "sanitize_filename": ".utils",
+    "atomic_write_json": ".utils",
+}
+
+__all__ = ["SpellSheetGenerator", "TokenBucket", "RetryPolicy", "GenerationJournal", "JsonlSpellStore", "ZipSpellArchive", "ResponseCache", "sanitize_filename", "atomic_write_json"]
+
+
+def __getattr__(name):
+    if name in _EXPORTS:
+        value = getattr(importlib.import_module(_EXPORTS[name], __name__), name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
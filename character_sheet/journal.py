@@ -0,0 +1,82 @@
+import json
+import os
+import threading
+from typing import Any, Dict, Optional
+
+from character_sheet.utils import sanitize_filename
+
+
+class GenerationJournal:
+    """Journal d'avancement d'une génération de fiches, pour reprendre une exécution interrompue.
+
+    Chaque sort terminé ou en échec ajoute une ligne JSON, écrite et
+    synchronisée sur disque immédiatement. Au lancement suivant, les sorts
+    terminés sont ignorés et leurs entrées d'index sont récupérées, même si
+    l'exécution précédente a été tuée avant d'écrire index.json.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self.done: Dict[str, Optional[Dict[str, Any]]] = {}
+        self.failed: Dict[str, Dict[str, Any]] = {}
+        self._load()
+
+    def _load(self):
+        if not os.path.exists(self.path):
+            return
+        with open(self.path, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    continue  # Dernière ligne tronquée par un arrêt brutal
+                key = record.get("key")
+                if record.get("status") == "done":
+                    self.done[key] = record.get("entry")
+                    self.failed.pop(key, None)
+                elif record.get("status") == "failed" and key not in self.done:
+                    self.failed[key] = record
+
+    def _append(self, record: Dict[str, Any]):
+        line = json.dumps(record, ensure_ascii=False) + "\n"
+        with self._lock:
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(line)
+                f.flush()
+                os.fsync(f.fileno())
+
+    def record_done(self, spell_name: str, entry: Optional[Dict[str, Any]]):
+        """Note un sort terminé avec son entrée d'index (None si la fiche n'en a pas)"""
+        key = sanitize_filename(spell_name)
+        self._append({"key": key, "spell": spell_name, "status": "done", "entry": entry})
+        with self._lock:
+            self.done[key] = entry
+            self.failed.pop(key, None)
+
+    def record_failure(self, spell_name: str, error: str, raw_content: str = None):
+        """Note un sort en échec : il sera redemandé au prochain lancement"""
+        key = sanitize_filename(spell_name)
+        record = {"key": key, "spell": spell_name, "status": "failed", "error": error}
+        if raw_content is not None:
+            record["contenu_brut"] = raw_content
+        self._append(record)
+        with self._lock:
+            self.failed[key] = record
+
+    def is_done(self, spell_name: str) -> bool:
+        return sanitize_filename(spell_name) in self.done
+
+    def reset(self):
+        """Vide le journal une fois l'index écrit, en ne conservant que les échecs"""
+        with self._lock:
+            self.done = {}
+            if not self.failed:
+                if os.path.exists(self.path):
+                    os.remove(self.path)
+                return
+            tmp_path = self.path + ".tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                for record in self.failed.values():
+                    f.write(json.dumps(record, ensure_ascii=False) + "\n")
+            os.replace(tmp_path, self.path)
@@ -0,0 +1,206 @@
+import hashlib
+import json
+import os
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, Optional
+
+from character_sheet.rate_limit import TokenBucket
+from character_sheet.retry import RetryPolicy
+from character_sheet.utils import atomic_write_json
+
+DEFAULT_TTL_SECONDS = 30 * 24 * 3600
+DEFAULT_MAX_BYTES = 500 * 1024 * 1024
+
+
+class ResponseCache:
+    """Cache disque des réponses de l'API OpenAI (chat et images).
+
+    Une réponse est indexée par l'empreinte du point d'appel et de tous ses
+    paramètres (modèle, messages ou prompt, température, taille...). Les
+    entrées expirent après `ttl_seconds` et la taille totale est bornée par
+    une éviction LRU (date de dernier accès portée par le mtime des fichiers).
+    Les requêtes identiques lancées en même temps par plusieurs threads ne
+    partent qu'une seule fois vers l'API.
+    """
+
+    def __init__(self, cache_dir: str = os.path.join(".cache", "openai"),
+                 ttl_seconds: float = DEFAULT_TTL_SECONDS, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.cache_dir = cache_dir
+        self.ttl_seconds = ttl_seconds
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self._lock = threading.Lock()
+        self._in_flight: Dict[str, Future] = {}
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+    @staticmethod
+    def make_key(endpoint: str, params: Dict[str, Any]) -> str:
+        """Construit la clé d'une requête à partir du point d'appel et de ses paramètres"""
+        payload = json.dumps({"endpoint": endpoint, "params": params}, sort_keys=True, ensure_ascii=False)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, f"{key}.json")
+
+    def _is_expired(self, created: float) -> bool:
+        return self.ttl_seconds is not None and time.time() - created > self.ttl_seconds
+
+    def get(self, key: str) -> Optional[Any]:
+        """Retourne la réponse en cache (et la marque comme récente), ou None si absente ou expirée"""
+        path = self._path(key)
+        try:
+            with open(path, encoding="utf-8") as f:
+                entry = json.load(f)
+        except FileNotFoundError:
+            return None
+        except ValueError:
+            self.invalidate(key)  # Entrée corrompue
+            return None
+        if self._is_expired(entry.get("created", 0)):
+            self.invalidate(key)
+            return None
+        try:
+            os.utime(path)
+        except FileNotFoundError:
+            pass
+        return entry["value"]
+
+    def put(self, key: str, value: Any):
+        """Enregistre une réponse de façon atomique"""
+        atomic_write_json(self._path(key), {"created": time.time(), "value": value})
+
+    def invalidate(self, key: str):
+        """Supprime une réponse du cache"""
+        try:
+            os.remove(self._path(key))
+        except FileNotFoundError:
+            pass
+
+    def get_or_call(self, key: str, call: Callable[[], Any], validate: Callable[[Any], bool] = None) -> Any:
+        """
+        Retourne la réponse en cache, ou l'obtient via `call()` puis la stocke
+
+        Si la même clé est déjà en cours de calcul dans un autre thread, attend
+        son résultat au lieu de relancer la requête.
+
+        Args:
+            validate: Si fourni, une réponse pour laquelle il retourne False
+                      est renvoyée mais n'est pas mise en cache
+        """
+        value = self.get(key)
+        if value is not None:
+            with self._lock:
+                self.hits += 1
+            return value
+
+        with self._lock:
+            future = self._in_flight.get(key)
+            owner = future is None
+            if owner:
+                future = Future()
+                self._in_flight[key] = future
+            else:
+                self.coalesced += 1
+        if not owner:
+            return future.result()
+
+        try:
+            # Une requête identique a pu se terminer entre la lecture et l'enregistrement
+            value = self.get(key)
+            if value is not None:
+                with self._lock:
+                    self.hits += 1
+            else:
+                with self._lock:
+                    self.misses += 1
+                value = call()
+                if validate is None or validate(value):
+                    self.put(key, value)
+            future.set_result(value)
+            return value
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with self._lock:
+                self._in_flight.pop(key, None)
+
+    def _entries(self):
+        return [
+            entry for entry in os.scandir(self.cache_dir)
+            if entry.is_file() and entry.name.endswith(".json") and not entry.name.startswith(".tmp_")
+        ]
+
+    def size(self) -> int:
+        """Taille totale des réponses en cache, en octets"""
+        return sum(entry.stat().st_size for entry in self._entries())
+
+    def evict(self) -> int:
+        """Supprime les réponses expirées, puis les moins récemment utilisées au-delà de la taille maximale
+
+        Returns:
+            Nombre de réponses supprimées
+        """
+        now = time.time()
+        entries = sorted(self._entries(), key=lambda entry: entry.stat().st_mtime)
+        total = sum(entry.stat().st_size for entry in entries)
+        removed = 0
+        for entry in entries:
+            stat = entry.stat()
+            # Le mtime est rafraîchi à chaque lecture : une entrée non lue depuis le TTL est forcément expirée
+            expired = self.ttl_seconds is not None and now - stat.st_mtime > self.ttl_seconds
+            if not expired and total <= self.max_bytes:
+                continue
+            try:
+                os.remove(entry.path)
+            except FileNotFoundError:
+                continue  # Déjà supprimée par un autre processus
+            total -= stat.st_size
+            removed += 1
+        return removed
+
+    def report(self) -> str:
+        return f"{self.hits} en cache, {self.coalesced} dédoublonnées, {self.misses} envoyées à l'API"
+
+
+def _with_retry(attempt: Callable[[], Any], retry_policy: Optional[RetryPolicy], description: str) -> Callable[[], Any]:
+    if retry_policy is None:
+        return attempt
+    return lambda: retry_policy.call(attempt, description)
+
+
+def cached_chat_completion(client, params: Dict[str, Any], cache: ResponseCache = None,
+                           rate_limiter: TokenBucket = None, validate: Callable[[str], bool] = None,
+                           retry_policy: RetryPolicy = None) -> str:
+    """Appelle `chat.completions.create(**params)` via le cache et retourne le texte de la réponse"""
+    def attempt() -> str:
+        if rate_limiter is not None:
+            rate_limiter.acquire()  # Respect API (à chaque essai)
+        response = client.chat.completions.create(**params)
+        return response.choices[0].message.content
+
+    call = _with_retry(attempt, retry_policy, "chat.completions")
+
+    if cache is None:
+        return call()
+    return cache.get_or_call(cache.make_key("chat.completions", params), call, validate=validate)
+
+
+def cached_image_generation(client, params: Dict[str, Any], cache: ResponseCache = None,
+                            rate_limiter: TokenBucket = None, retry_policy: RetryPolicy = None) -> str:
+    """Appelle `images.generate(**params)` via le cache et retourne l'image encodée en base64"""
+    def attempt() -> str:
+        if rate_limiter is not None:
+            rate_limiter.acquire()
+        response = client.images.generate(**params)
+        return response.data[0].b64_json
+
+    call = _with_retry(attempt, retry_policy, "images.generate")
+
+    if cache is None:
+        return call()
+    return cache.get_or_call(cache.make_key("images.generate", params), call)
@@ -0,0 +1,85 @@
+import random
+import time
+from email.utils import parsedate_to_datetime
+from typing import Callable, Optional, TypeVar
+
+T = TypeVar("T")
+
+# Codes HTTP pour lesquels un nouvel essai a une chance d'aboutir
+RETRYABLE_STATUS_CODES = (408, 409, 429)
+
+
+def retry_after_seconds(error: BaseException) -> Optional[float]:
+    """Retourne le délai demandé par l'API (en-têtes retry-after-ms ou Retry-After), ou None"""
+    response = getattr(error, "response", None)
+    headers = getattr(response, "headers", None)
+    if not headers:
+        return None
+
+    retry_after_ms = headers.get("retry-after-ms")
+    if retry_after_ms:
+        try:
+            return max(0.0, float(retry_after_ms) / 1000)
+        except ValueError:
+            pass
+
+    retry_after = headers.get("retry-after")
+    if not retry_after:
+        return None
+    try:
+        return max(0.0, float(retry_after))
+    except ValueError:
+        pass
+    # Retry-After peut aussi être une date HTTP
+    try:
+        return max(0.0, parsedate_to_datetime(retry_after).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+class RetryPolicy:
+    """Nouvel essai des appels à l'API avec attente exponentielle et gigue.
+
+    Seules les erreurs transitoires sont réessayées : limite de débit (429),
+    délais dépassés, conflits, erreurs serveur (5xx) et erreurs de connexion.
+    Si l'API indique un délai (Retry-After), il est respecté.
+    """
+
+    def __init__(self, max_attempts: int = 5, base_delay: float = 1.0, max_delay: float = 60.0,
+                 jitter: bool = True, sleep: Callable[[float], None] = time.sleep):
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.jitter = jitter
+        self.sleep = sleep
+
+    @staticmethod
+    def is_retryable(error: BaseException) -> bool:
+        status_code = getattr(error, "status_code", None)
+        if status_code is not None:
+            return status_code in RETRYABLE_STATUS_CODES or status_code >= 500
+        from openai import APIConnectionError  # Inclut APITimeoutError
+        return isinstance(error, (APIConnectionError, ConnectionError, TimeoutError))
+
+    def delay(self, attempt: int, error: BaseException = None) -> float:
+        """Délai avant l'essai suivant le n-ième échec (attempt commence à 1)"""
+        requested = retry_after_seconds(error) if error is not None else None
+        if requested is not None:
+            return requested
+        backoff = min(self.max_delay, self.base_delay * 2 ** (attempt - 1))
+        if not self.jitter:
+            return backoff
+        # Gigue « equal jitter » : évite que tous les threads réessaient au même instant
+        return backoff / 2 + random.uniform(0, backoff / 2)
+
+    def call(self, function: Callable[[], T], description: str = "requête") -> T:
+        """Appelle `function()` en réessayant les erreurs transitoires"""
+        for attempt in range(1, self.max_attempts + 1):
+            try:
+                return function()
+            except Exception as e:
+                if attempt >= self.max_attempts or not self.is_retryable(e):
+                    raise
+                delay = self.delay(attempt, e)
+                print(f"🔁 {description} : {e.__class__.__name__}, essai {attempt + 1}/{self.max_attempts} dans {delay:.1f}s")
+                self.sleep(delay)
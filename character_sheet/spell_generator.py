@@ -1,17 +1,127 @@
 import os
 import json
-from time import sleep
-from openai import OpenAI
-from character_sheet.utils import sanitize_filename
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from character_sheet.journal import GenerationJournal
+from character_sheet.rate_limit import TokenBucket
+from character_sheet.response_cache import ResponseCache, cached_chat_completion
+from character_sheet.retry import RetryPolicy
+from character_sheet.spell_store import JsonlSpellStore
+from character_sheet.utils import sanitize_filename, atomic_write_json
+
+SPELL_SHEET_SPEC = """- "Nom" (en français)
+- "Nom original" (en anglais, tel qu’indiqué dans les sources officielles)
+- "Niveau" (entier entre 0 et 9 ; 0 si c’est un tour de magie)
+- "École"
+- "Temps d'incantation"
+- "Portée" (en **mètres**, pas en pieds. Convertis précisément. Par exemple : 30 feet → 9 mètres.)
+- "Cible" (description de la ou des cibles principales du sort)
+- "Composantes"
+- "Durée"
+- "Concentration" (true si le sort nécessite de la concentration, false sinon)
+- "Rituel" (oui ou non)
+- "Temps du rituel" (si applicable, sinon null)
+- "Type d'attaque / sauvegarde"
+- "Effet synthétique" (résumé en 1-2 phrases)
+- "Description complète"
+- "Effet en surcaste" (si applicable, sinon null)
+
+Les données doivent être exactes selon les règles officielles de D&D 5e (édition 2014). Utilise comme référence :
+- https://www.aidedd.org/dnd-filters/spells-5e.php
+- https://dnd5e.wikidot.com/
+
+⚠️ Important : toutes les distances et zones doivent être données **en mètres**. Utilise une conversion réaliste (1 pied = 0,3 mètre), avec arrondis raisonnables (ex: 10 pieds → 3 m, 30 pieds → 9 m, 60 pieds → 18 m, 120 pieds → 36 m)."""
+
+# Champs nécessaires à l'entrée d'index d'une fiche
+INDEX_FIELDS = ("Nom", "Nom original", "Niveau")
+JOURNAL_FILENAME = ".generation_journal.jsonl"
+
+
+def _is_json(content: str) -> bool:
+    try:
+        json.loads(content)
+        return True
+    except (TypeError, ValueError):
+        return False
+
+
+def _is_valid_spell(data) -> bool:
+    """Une fiche est exploitable si c'est un objet JSON contenant les champs de l'index"""
+    return isinstance(data, dict) and all(field in data for field in INDEX_FIELDS)
+
+
+def _spell_matches(spell_name: str, data: dict) -> bool:
+    """La fiche porte le nom demandé, en français ou en anglais (sans tenir compte des accents ni de la casse)"""
+    key = sanitize_filename(spell_name.strip())
+    return any(isinstance(data[field], str) and sanitize_filename(data[field].strip()) == key
+               for field in ("Nom", "Nom original"))
+
+
+def _match_batch(spell_names: list[str], data: list) -> dict:
+    """Associe chaque sort demandé à la fiche du tableau qui porte son nom (l'ordre n'est pas garanti)"""
+    remaining = [spell for spell in data if _is_valid_spell(spell)]
+    matched = {}
+    for name in spell_names:
+        for position, spell in enumerate(remaining):
+            if _spell_matches(name, spell):
+                matched[name] = remaining.pop(position)
+                break
+    return matched
+
+
+def _is_complete_batch(content: str, spell_names: list[str]) -> bool:
+    """La réponse groupée contient une fiche valide pour chacun des sorts demandés"""
+    try:
+        data = json.loads(content)
+    except (TypeError, ValueError):
+        return False
+    return isinstance(data, list) and len(_match_batch(spell_names, data)) == len(spell_names)
+
+
+def pending_spells(spell_list: list[str], output_dir: str, store: JsonlSpellStore = None) -> list[str]:
+    """Sorts de la liste qui restent à générer : sans fiche et non terminés dans le journal (sans appel à l'API)"""
+    journal = GenerationJournal(os.path.join(output_dir, JOURNAL_FILENAME))
+    pending = []
+    for spell in dict.fromkeys(spell_list):
+        key = sanitize_filename(spell)
+        if journal.is_done(spell):
+            continue
+        if store is not None and key in store:
+            continue
+        if store is None and os.path.exists(os.path.join(output_dir, f"{key}.json")):
+            continue
+        pending.append(spell)
+    return pending
+
 
 class SpellSheetGenerator:
-    def __init__(self, api_key: str, output_dir: str = "fiches_sorts"):
+    def __init__(self, api_key: str, output_dir: str = "fiches_sorts", base_url: str = None,
+                 requests_per_second: float = 1.0, store: JsonlSpellStore = None,
+                 response_cache: ResponseCache = None, retry_policy: RetryPolicy = None):
+        """
+        Args:
+            api_key: Clé API OpenAI
+            output_dir: Dossier de sortie des fiches de sorts
+            base_url: URL alternative de l'API (ex: serveur OpenAI factice local pour les tests)
+            requests_per_second: Débit maximal de requêtes vers l'API
+            store: Stockage JSONL à utiliser à la place d'un fichier JSON par sort
+            response_cache: Cache disque des réponses de l'API (évite de repayer une requête déjà faite)
+            retry_policy: Politique de nouvel essai des appels à l'API (par défaut 5 essais)
+        """
+        from openai import OpenAI  # Import différé : le SDK est lourd et inutile hors génération
+
         self.api_key = api_key
         self.output_dir = output_dir
-        self.client = OpenAI(api_key=self.api_key)
+        # Les nouveaux essais sont gérés par retry_policy, pas par le client
+        self.client = OpenAI(api_key=self.api_key, base_url=base_url, max_retries=0)
+        self.rate_limiter = TokenBucket(rate=requests_per_second)
+        self.store = store
+        self.response_cache = response_cache
+        self.retry_policy = retry_policy if retry_policy is not None else RetryPolicy()
         os.makedirs(self.output_dir, exist_ok=True)
         self.index_path = os.path.join(self.output_dir, "index.json")
         self.index_data = self._load_index()
+        self.journal = GenerationJournal(os.path.join(self.output_dir, JOURNAL_FILENAME))
+        self._recover_from_journal()
 
     def _load_index(self):
         if os.path.exists(self.index_path):
@@ -20,8 +130,34 @@ class SpellSheetGenerator:
         return []
 
     def _save_index(self):
-        with open(self.index_path, "w", encoding="utf-8") as f:
-            json.dump(self.index_data, f, indent=4, ensure_ascii=False)
+        atomic_write_json(self.index_path, self.index_data)
+
+    def _recover_from_journal(self):
+        """Ajoute à l'index les sorts terminés par une exécution interrompue avant d'écrire index.json"""
+        indexed = {entry.get("Fichier") for entry in self.index_data}
+        recovered = [
+            entry for entry in self.journal.done.values()
+            if entry and entry.get("Fichier") not in indexed
+        ]
+        if recovered:
+            print(f"♻️  Reprise : {len(recovered)} fiche(s) récupérée(s) depuis le journal.")
+            self.index_data.extend(recovered)
+            self._save_index()
+        if self.store is not None:
+            self.store.save_index()
+        self.journal.reset()
+        if self.journal.failed:
+            print(f"♻️  {len(self.journal.failed)} sort(s) en échec lors d'une exécution précédente seront redemandés.")
+
+    def _checkpoint_done(self):
+        """Écrit l'index puis vide le journal (l'index fait alors foi)"""
+        self._save_index()
+        if self.store is not None:
+            self.store.save_index()
+        self.journal.reset()
+        if self.journal.failed:
+            failed = ", ".join(record["spell"] for record in self.journal.failed.values())
+            print(f"❌ {len(self.journal.failed)} sort(s) non générés, à relancer : {failed}")
 
     def _create_prompt(self, spell_name: str) -> str:
         return f"""
@@ -29,73 +165,191 @@ Tu es un expert de Donjons & Dragons 5e (règles officielles de l'édition 2014)
 
 Donne-moi la fiche complète du sort "{spell_name}" en français, sous forme d’un **objet JSON** strictement conforme, avec les champs suivants :
 
-- "Nom" (en français)
-- "Nom original" (en anglais, tel qu’indiqué dans les sources officielles)
-- "Niveau" (entier entre 0 et 9 ; 0 si c’est un tour de magie)
-- "École"
-- "Temps d'incantation"
-- "Portée" (en **mètres**, pas en pieds. Convertis précisément. Par exemple : 30 feet → 9 mètres.)
-- "Cible" (description de la ou des cibles principales du sort)
-- "Composantes"
-- "Durée"
-- "Concentration" (true si le sort nécessite de la concentration, false sinon)
-- "Rituel" (oui ou non)
-- "Temps du rituel" (si applicable, sinon null)
-- "Type d'attaque / sauvegarde"
-- "Effet synthétique" (résumé en 1-2 phrases)
-- "Description complète"
-- "Effet en surcaste" (si applicable, sinon null)
+{SPELL_SHEET_SPEC}
 
-Les données doivent être exactes selon les règles officielles de D&D 5e (édition 2014). Utilise comme référence :
-- https://www.aidedd.org/dnd-filters/spells-5e.php
-- https://dnd5e.wikidot.com/
+Fournis uniquement du JSON sans texte explicatif autour.
+"""
 
-⚠️ Important : toutes les distances et zones doivent être données **en mètres**. Utilise une conversion réaliste (1 pied = 0,3 mètre), avec arrondis raisonnables (ex: 10 pieds → 3 m, 30 pieds → 9 m, 60 pieds → 18 m, 120 pieds → 36 m).
+    def _create_batch_prompt(self, spell_names: list[str]) -> str:
+        requested = "\n".join(f'- "{name}"' for name in spell_names)
+        return f"""
+Tu es un expert de Donjons & Dragons 5e (règles officielles de l'édition 2014).
 
-Fournis uniquement du JSON sans texte explicatif autour.
+Donne-moi les fiches complètes des {len(spell_names)} sorts suivants en français :
+
+{requested}
+
+Réponds par un **tableau JSON** contenant exactement un objet par sort, dans le même ordre que la liste. Chaque objet doit être strictement conforme, avec les champs suivants :
+
+{SPELL_SHEET_SPEC}
+
+Fournis uniquement le tableau JSON sans texte explicatif autour.
 """
 
+    def _already_generated(self, spell_name: str, filepath: str) -> bool:
+        if self.journal.is_done(spell_name):
+            return True
+        if self.store is not None:
+            return sanitize_filename(spell_name) in self.store
+        return os.path.exists(filepath)
+
     def generate_spell_file(self, spell_name: str):
+        entry = self._generate_spell(spell_name)
+        if entry:
+            self.index_data.append(entry)
+        self._checkpoint_done()
+
+    def _generate_spell(self, spell_name: str):
+        """Génère la fiche d'un sort et retourne son entrée d'index (ou None)"""
         filename = f"{sanitize_filename(spell_name)}.json"
         filepath = os.path.join(self.output_dir, filename)
 
-        if os.path.exists(filepath):
+        if self._already_generated(spell_name, filepath):
             print(f"⏭️  Sort déjà généré : {filename} — ignoré.")
-            return
+            return None
 
         print(f"📤 Génération du sort : {spell_name}")
         try:
-            response = self.client.chat.completions.create(
-                model="gpt-4",
-                messages=[{"role": "user", "content": self._create_prompt(spell_name)}],
-                temperature=0.5,
-            )
-            content = response.choices[0].message.content
-
-            try:
-                data = json.loads(content)
-            except json.JSONDecodeError:
-                print(f"⚠️ Erreur de parsing JSON pour {spell_name}, sauvegarde brute.")
-                data = {"erreur": "JSON non valide", "contenu_brut": content}
-
-            with open(filepath, 'w', encoding='utf-8') as f:
-                json.dump(data, f, indent=4, ensure_ascii=False)
-
-            # Mise à jour de l’index (si pas en erreur)
-            if "Nom" in data and "Nom original" in data and "Niveau" in data:
-                self.index_data.append({
-                    "Nom": data["Nom"],
-                    "Nom original": data["Nom original"],
-                    "Niveau": data["Niveau"],
-                    "Fichier": filename
-                })
-                self._save_index()
-
-            sleep(1)  # Respect API
-
+            params = {
+                "model": "gpt-4",
+                "messages": [{"role": "user", "content": self._create_prompt(spell_name)}],
+                "temperature": 0.5,
+            }
+            # Une réponse qui n'est pas du JSON valide n'est pas mise en cache, pour pouvoir la redemander
+            content = cached_chat_completion(self.client, params, cache=self.response_cache,
+                                             rate_limiter=self.rate_limiter, validate=_is_json,
+                                             retry_policy=self.retry_policy)
         except Exception as e:
             print(f"❌ Erreur pour le sort {spell_name} : {e}")
+            self.journal.record_failure(spell_name, f"{e.__class__.__name__}: {e}")
+            return None
+
+        try:
+            data = json.loads(content)
+        except json.JSONDecodeError:
+            # Réponse brute conservée dans le journal ; le sort sera redemandé au prochain lancement
+            print(f"⚠️ Erreur de parsing JSON pour {spell_name}, réponse brute conservée dans le journal.")
+            self.journal.record_failure(spell_name, "JSON non valide", raw_content=content)
+            return None
+
+        try:
+            return self._save_spell(spell_name, data)
+        except OSError as e:
+            print(f"❌ Erreur d'écriture pour le sort {spell_name} : {e}")
+            self.journal.record_failure(spell_name, f"{e.__class__.__name__}: {e}")
+            return None
+
+    def _save_spell(self, spell_name: str, data: dict):
+        """Enregistre la fiche d'un sort et retourne son entrée d'index (None si la fiche est en erreur)"""
+        filename = f"{sanitize_filename(spell_name)}.json"
+        if self.store is not None:
+            self.store.put(data, key=sanitize_filename(spell_name))
+        else:
+            atomic_write_json(os.path.join(self.output_dir, filename), data)
+
+        # Entrée d’index (si pas en erreur)
+        entry = None
+        if _is_valid_spell(data):
+            entry = {
+                "Nom": data["Nom"],
+                "Nom original": data["Nom original"],
+                "Niveau": data["Niveau"],
+                "Fichier": filename
+            }
+        self.journal.record_done(spell_name, entry)
+        return entry
+
+    def _generate_batch(self, spell_names: list[str]) -> dict:
+        """
+        Génère les fiches de plusieurs sorts en une seule requête
+
+        Chaque élément du tableau retourné est validé séparément et associé au
+        sort demandé par son « Nom » ou son « Nom original » : seuls les sorts
+        sans fiche valide à leur nom sont redemandés, un par un. Si la réponse
+        n'est pas un tableau JSON exploitable, tout le lot repasse en requêtes
+        individuelles. Une réponse incomplète n'est pas mise en cache.
 
-    def generate_spell_files(self, spell_list: list[str]):
+        Returns:
+            Dictionnaire nom du sort -> entrée d'index (ou None)
+        """
+        if len(spell_names) == 1:
+            return {spell_names[0]: self._generate_spell(spell_names[0])}
+
+        print(f"📤 Génération groupée de {len(spell_names)} sorts : {', '.join(spell_names)}")
+        try:
+            params = {
+                "model": "gpt-4",
+                "messages": [{"role": "user", "content": self._create_batch_prompt(spell_names)}],
+                "temperature": 0.5,
+            }
+            content = cached_chat_completion(self.client, params, cache=self.response_cache,
+                                             rate_limiter=self.rate_limiter,
+                                             validate=lambda content: _is_complete_batch(content, spell_names),
+                                             retry_policy=self.retry_policy)
+            data = json.loads(content)
+        except Exception as e:
+            print(f"⚠️ Échec de la requête groupée ({e}), repli sur des requêtes individuelles.")
+            return {name: self._generate_spell(name) for name in spell_names}
+
+        if not isinstance(data, list):
+            print("⚠️ La réponse groupée n'est pas un tableau JSON, repli sur des requêtes individuelles.")
+            return {name: self._generate_spell(name) for name in spell_names}
+
+        matched = _match_batch(spell_names, data)
+        entries, failed = {}, []
+        for name in spell_names:
+            if name in matched:
+                entries[name] = self._save_spell(name, matched[name])
+            else:
+                failed.append(name)
+        if failed:
+            print(f"🔁 {len(failed)} fiche(s) invalide(s) ou absente(s) du lot, nouvel essai individuel : {', '.join(failed)}")
+            for name in failed:
+                entries[name] = self._generate_spell(name)
+        return entries
+
+    def generate_spell_files(self, spell_list: list[str], max_workers: int = 1, batch_size: int = 1):
+        """
+        Génère les fiches d'une liste de sorts
+
+        Args:
+            spell_list: Noms des sorts à générer
+            max_workers: Nombre de requêtes simultanées vers l'API (1 = séquentiel)
+            batch_size: Nombre de sorts demandés par requête (1 = une requête par sort)
+
+        Le débit global reste borné par `requests_per_second` et l'index
+        n'est écrit qu'une seule fois, à la fin. Chaque sort terminé est noté
+        dans le journal : une exécution interrompue reprend là où elle s'était
+        arrêtée au lancement suivant.
+        """
+        spell_list = list(dict.fromkeys(spell_list))  # Supprimer les doublons
+        pending = []
         for spell in spell_list:
-            self.generate_spell_file(spell)
+            filename = f"{sanitize_filename(spell)}.json"
+            if self._already_generated(spell, os.path.join(self.output_dir, filename)):
+                print(f"⏭️  Sort déjà généré : {filename} — ignoré.")
+            else:
+                pending.append(spell)
+
+        batch_size = max(1, batch_size)
+        batches = [pending[i:i + batch_size] for i in range(0, len(pending), batch_size)]
+        entries = {}
+        if max_workers <= 1:
+            for batch in batches:
+                entries.update(self._generate_batch(batch))
+        else:
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                futures = [executor.submit(self._generate_batch, batch) for batch in batches]
+                for future in as_completed(futures):
+                    entries.update(future.result())
+
+        # Conserver l'ordre de la liste demandée dans l'index
+        new_entries = [entries[spell] for spell in spell_list if entries.get(spell)]
+        self.index_data.extend(new_entries)
+        self._checkpoint_done()
+        self._report_cache()
+
+    def _report_cache(self):
+        if self.response_cache is not None:
+            self.response_cache.evict()
+            print(f"🗄️  Cache des réponses API : {self.response_cache.report()}")
@@ -0,0 +1,288 @@
+import json
+import os
+import threading
+import zipfile
+from typing import Dict, Iterator, List, Tuple
+
+from character_sheet.utils import sanitize_filename, atomic_write_json
+
+
+def is_junk_member(name: str) -> bool:
+    """Indique si un membre d'archive est un artefact à ignorer (ressources macOS, fichiers cachés)"""
+    base = os.path.basename(name)
+    return name.startswith("__MACOSX/") or "/__MACOSX/" in name or base.startswith("._") or base == ".DS_Store"
+
+
+class ZipSpellArchive:
+    """Archive de fiches de sorts (ex: fiches_sorts.zip), lue sans extraction.
+
+    Le répertoire central de l'archive est lu une seule fois : l'index des
+    fiches (nom de fiche -> membre, hors artefacts comme `__MACOSX/._*`) est
+    gardé en mémoire avec l'archive ouverte, et partagé par tous les lecteurs
+    du processus tant que le fichier n'a pas changé (voir `open`). Chaque
+    fiche est ensuite décompressée directement depuis l'archive, à la demande.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        stat = os.stat(path)
+        self.signature = (stat.st_mtime_ns, stat.st_size)
+        self._lock = threading.Lock()
+        self._archive = zipfile.ZipFile(path)
+        self._index: Dict[str, zipfile.ZipInfo] = {}
+        for info in sorted(self._archive.infolist(), key=lambda info: info.filename):
+            base = os.path.basename(info.filename)
+            if info.is_dir() or not base.endswith(".json") or base == "index.json" or is_junk_member(info.filename):
+                continue
+            self._index.setdefault(base[:-5], info)
+
+    @classmethod
+    def open(cls, path: str) -> "ZipSpellArchive":
+        """Retourne l'archive du processus pour ce chemin, rouverte seulement si le fichier a changé"""
+        key = (os.path.abspath(path), os.getpid())
+        stat = os.stat(path)
+        with _ARCHIVES_LOCK:
+            archive = _ARCHIVES.get(key)
+            if archive is None or archive.signature != (stat.st_mtime_ns, stat.st_size):
+                if archive is not None:
+                    archive.close()
+                archive = _ARCHIVES[key] = cls(path)
+            return archive
+
+    def close(self):
+        with self._lock:
+            self._archive.close()
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._index
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def keys(self) -> List[str]:
+        return list(self._index.keys())
+
+    def get(self, name: str):
+        """Lit une fiche (un sort ou une liste de sorts) par son nom de fichier sans .json, ou None"""
+        info = self._index.get(name) or self._index.get(sanitize_filename(name))
+        if info is None:
+            return None
+        with self._lock:
+            return json.loads(self._archive.read(info))
+
+    def items(self) -> Iterator[Tuple[str, object]]:
+        """Parcourt les fiches dans l'ordre des noms, une par une, sans extraire l'archive"""
+        for name in self.keys():
+            yield name, self.get(name)
+
+
+# Archives ouvertes, avec leur index, par chemin et par processus
+_ARCHIVES: Dict[Tuple[str, int], ZipSpellArchive] = {}
+_ARCHIVES_LOCK = threading.Lock()
+
+
+class JsonlSpellStore:
+    """Stockage des fiches de sorts dans un seul fichier JSONL, en ajout seul.
+
+    Chaque ligne contient {"key": ..., "spell": {...}}. Un index des positions
+    (clé -> [offset, longueur]) est conservé dans un fichier `.idx` à côté des
+    données : une fiche se lit en un seul accès disque, et une lecture complète
+    se fait en un seul parcours séquentiel. Réécrire une fiche ajoute une ligne
+    et l'index pointe vers la plus récente ; `compact()` élimine les anciennes.
+
+    Aucun fichier n'est créé avant le premier ajout de fiche.
+    """
+
+    def __init__(self, path: str, readonly: bool = False):
+        """
+        Args:
+            path: Fichier JSONL des fiches
+            readonly: Lecture seule : les données doivent exister (FileNotFoundError sinon)
+                      et aucun fichier n'est écrit, pas même l'index
+        """
+        self.path = path
+        self.index_path = path + ".idx"
+        self.readonly = readonly
+        self._lock = threading.Lock()
+        self._index: Dict[str, Tuple[int, int]] = {}
+        if os.path.exists(self.path):
+            self._load_index()
+        elif readonly:
+            raise FileNotFoundError(f"Stockage de fiches introuvable : {self.path}")
+
+    # --- Index ---
+
+    def _load_index(self):
+        """Charge l'index s'il correspond aux données, sinon le reconstruit par un parcours complet"""
+        size = os.path.getsize(self.path)
+        if os.path.exists(self.index_path):
+            try:
+                with open(self.index_path, encoding="utf-8") as f:
+                    saved = json.load(f)
+                if saved.get("size") == size:
+                    self._index = {key: tuple(pos) for key, pos in saved["offsets"].items()}
+                    return
+            except (OSError, ValueError, KeyError):
+                pass
+        self._rebuild_index()
+
+    def _rebuild_index(self):
+        self._index = {}
+        offset = 0
+        with open(self.path, "rb") as f:
+            for line in f:
+                if line.strip():
+                    try:
+                        key = json.loads(line)["key"]
+                        self._index[key] = (offset, len(line))
+                    except (ValueError, KeyError):
+                        print(f"⚠️ Ligne illisible ignorée dans {self.path} (offset {offset})")
+                offset += len(line)
+        if not self.readonly:
+            self.save_index()
+
+    def save_index(self):
+        """Enregistre l'index de façon atomique (rien à enregistrer tant qu'aucune fiche n'a été ajoutée)"""
+        if not os.path.exists(self.path):
+            return
+        with self._lock:
+            offsets = {key: list(pos) for key, pos in self._index.items()}
+            size = os.path.getsize(self.path)
+        atomic_write_json(self.index_path, {"size": size, "offsets": offsets})
+
+    # --- Accès ---
+
+    @staticmethod
+    def key_for(spell: dict, fallback: str = None) -> str:
+        """Clé d'une fiche : nom nettoyé du sort (ou nom de fichier d'origine à défaut)"""
+        if "Nom" in spell:
+            return sanitize_filename(spell["Nom"])
+        return fallback or "sort_inconnu"
+
+    def put(self, spell: dict, key: str = None) -> str:
+        """Ajoute (ou remplace) une fiche et retourne sa clé"""
+        self._check_writable()
+        key = key or self.key_for(spell)
+        line = (json.dumps({"key": key, "spell": spell}, ensure_ascii=False) + "\n").encode("utf-8")
+        with self._lock:
+            if not self._index:
+                os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            with open(self.path, "ab") as f:
+                offset = f.tell()
+                f.write(line)
+            self._index[key] = (offset, len(line))
+        return key
+
+    def _check_writable(self):
+        if self.readonly:
+            raise PermissionError(f"Stockage de fiches ouvert en lecture seule : {self.path}")
+
+    def get(self, key: str) -> dict:
+        """Lit une fiche par sa clé (nom nettoyé), ou None si absente"""
+        position = self._index.get(key) or self._index.get(sanitize_filename(key))
+        if position is None:
+            return None
+        offset, length = position
+        with open(self.path, "rb") as f:
+            f.seek(offset)
+            return json.loads(f.read(length))["spell"]
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._index
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def keys(self) -> List[str]:
+        return list(self._index.keys())
+
+    def items(self) -> Iterator[Tuple[str, dict]]:
+        """Parcourt toutes les fiches à jour en une seule lecture séquentielle"""
+        latest = {offset: key for key, (offset, _) in self._index.items()}
+        if not latest:
+            return
+        offset = 0
+        with open(self.path, "rb") as f:
+            for line in f:
+                key = latest.get(offset)
+                if key is not None:
+                    yield key, json.loads(line)["spell"]
+                offset += len(line)
+
+    def __iter__(self) -> Iterator[dict]:
+        for _, spell in self.items():
+            yield spell
+
+    def compact(self):
+        """Réécrit le fichier sans les versions remplacées des fiches"""
+        self._check_writable()
+        if not self._index:
+            return
+        tmp_path = self.path + ".tmp"
+        index = {}
+        with open(tmp_path, "wb") as out:
+            for key, spell in self.items():
+                line = (json.dumps({"key": key, "spell": spell}, ensure_ascii=False) + "\n").encode("utf-8")
+                index[key] = (out.tell(), len(line))
+                out.write(line)
+        with self._lock:
+            os.replace(tmp_path, self.path)
+            self._index = index
+        self.save_index()
+
+    # --- Import / export ---
+
+    def _import_document(self, data, fallback: str) -> int:
+        """Ajoute le contenu d'un fichier de fiches (un sort ou une liste de sorts)"""
+        spells = data if isinstance(data, list) else [data]
+        for spell in spells:
+            # Le nom de fichier ne sert de clé de secours que pour un fichier à un seul sort
+            self.put(spell, key=self.key_for(spell, fallback if len(spells) == 1 else None))
+        return len(spells)
+
+    def import_folder(self, folder_path: str) -> int:
+        """Importe les fiches JSON d'un dossier au format fiches_sorts/ et retourne leur nombre"""
+        count = 0
+        for file in sorted(os.listdir(folder_path)):
+            if not file.endswith(".json") or file == "index.json":
+                continue
+            with open(os.path.join(folder_path, file), encoding="utf-8") as f:
+                count += self._import_document(json.load(f), fallback=file[:-5])
+        self.save_index()
+        return count
+
+    def import_zip(self, zip_path: str) -> int:
+        """Importe les fiches JSON d'une archive (ex: fiches_sorts.zip) et retourne leur nombre"""
+        count = 0
+        for name, data in ZipSpellArchive.open(zip_path).items():
+            count += self._import_document(data, fallback=name)
+        self.save_index()
+        return count
+
+    def export_folder(self, folder_path: str) -> int:
+        """Exporte les fiches au format fiches_sorts/ (un JSON par sort et index.json)"""
+        os.makedirs(folder_path, exist_ok=True)
+        index = []
+        for key, spell in self.items():
+            filename = f"{key}.json"
+            atomic_write_json(os.path.join(folder_path, filename), spell)
+            if "Nom" in spell and "Nom original" in spell and "Niveau" in spell:
+                index.append({
+                    "Nom": spell["Nom"],
+                    "Nom original": spell["Nom original"],
+                    "Niveau": spell["Niveau"],
+                    "Fichier": filename
+                })
+        atomic_write_json(os.path.join(folder_path, "index.json"), index)
+        return len(index)
+
+    def export_zip(self, zip_path: str, folder_name: str = "fiches_sorts") -> int:
+        """Exporte les fiches dans une archive au format fiches_sorts.zip"""
+        count = 0
+        tmp_path = zip_path + ".tmp"
+        with zipfile.ZipFile(tmp_path, "w", compression=zipfile.ZIP_DEFLATED) as archive:
+            for key, spell in self.items():
+                archive.writestr(f"{folder_name}/{key}.json", json.dumps(spell, indent=4, ensure_ascii=False))
+                count += 1
+        os.replace(tmp_path, zip_path)
+        return count
@@ -1,4 +1,7 @@
+import json
+import os
 import re
+import tempfile
 import unicodedata
 
 def sanitize_filename(name: str) -> str:
@@ -11,4 +14,17 @@ def sanitize_filename(name: str) -> str:
     name = re.sub(r'\s+', '_', name)
     
     # 4. Mettre en minuscules
-    return name.lower()
\ No newline at end of file
+    return name.lower()
+
+def atomic_write_json(path: str, data) -> None:
+    """Écrit un fichier JSON de façon atomique (fichier temporaire puis renommage)"""
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".tmp_", suffix=".json")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(data, f, indent=4, ensure_ascii=False)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
@@ -0,0 +1,33 @@
+#!/usr/bin/env python3
+"""
+Script pour générer en une fois les grimoires de plusieurs joueurs et thèmes
+"""
+
+import argparse
+import logging
+
+from spell_book.batch import discover_targets, build_grimoires
+from spell_book.corpus import default_spell_source
+
+def main():
+    parser = argparse.ArgumentParser(description="Génère plusieurs grimoires en parallèle")
+    parser.add_argument("--players", nargs="*", help="Joueurs à générer (tous ceux de players/ par défaut)")
+    parser.add_argument("--themes", nargs="*", help="Thèmes à générer (tous ceux de themes/ par défaut)")
+    parser.add_argument("--spells-folder", "--spells", dest="spells_folder", nargs="+",
+                        help="Sources des fiches : dossier, fichier JSONL ou archive zip (plusieurs possibles, "
+                             "la dernière l'emporte pour un même sort ; fiches_sorts/ ou fiches_sorts.zip par défaut)")
+    parser.add_argument("-j", "--jobs", type=int, default=None, help="Nombre de processus (nombre de cœurs par défaut)")
+    parser.add_argument("-o", "--output-dir", default="grimoires", help="Dossier de sortie des PDFs")
+    parser.add_argument("--incremental", action="store_true", help="Ne reconstruit que ce qui a changé")
+    parser.add_argument("--profile", action="store_true", help="Profile chaque grimoire (cProfile, journalisé en DEBUG)")
+    parser.add_argument("-v", "--verbose", action="store_true", help="Affiche le rapport détaillé de chaque grimoire")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.DEBUG if args.verbose else logging.WARNING, format="%(message)s")
+
+    targets = discover_targets(players=args.players, themes=args.themes)
+    build_grimoires(targets, spells_folder=args.spells_folder or [default_spell_source()],
+                    output_dir=args.output_dir, jobs=args.jobs,
+                    incremental=args.incremental, profile=args.profile)
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
@@ -1,6 +1,6 @@
 import os
 from dotenv import load_dotenv
-from character_sheet import SpellSheetGenerator
+from character_sheet import SpellSheetGenerator, ResponseCache
 
 # Charger les variables d'environnement depuis .env
 load_dotenv()
@@ -22,7 +22,7 @@ sorts = [
 ]
 
 # Initialiser le générateur
-generator = SpellSheetGenerator(api_key=API_KEY, output_dir="fiches_sorts")
+generator = SpellSheetGenerator(api_key=API_KEY, output_dir="fiches_sorts", response_cache=ResponseCache())
 
 # Générer tous les sorts
-generator.generate_spell_files(sorts)
\ No newline at end of file
+generator.generate_spell_files(sorts, max_workers=4)
\ No newline at end of file
@@ -1,9 +1,45 @@
 # spell_book/__init__.py
 
-from .generator import SpellPDFGenerator
-from .theme_manager import ThemeManager
-from .player_manager import PlayerManager
-from .illustrations import SpellIllustrationGenerator
+import importlib
 
+# Exports chargés à la demande : ReportLab n'est importé qu'avec le générateur PDF
+# et le SDK OpenAI qu'au moment de générer des illustrations
+_EXPORTS = {
+    "SpellPDFGenerator": ".generator",
+    "ThemeManager": ".theme_manager",
+    "PlayerManager": ".player_manager",
+    "SpellIllustrationGenerator": ".illustrations",
+    "SpellCorpus": ".corpus",
+    "SpellRecord": ".corpus",
+    "Spell": ".spell",
+    "SpellValidationError": ".spell",
+    "validate_spell": ".spell",
+    "SpellPageCache": ".page_cache",
+    "IllustrationCache": ".image_cache",
+    "SpellCatalogue": ".catalogue",
+    "GrimoireDocument": ".render_model",
+    "HtmlExporter": ".exporters",
+    "MarkdownExporter": ".exporters",
+    "PdfExporter": ".exporters",
+    "PageLayout": ".layout",
+    "Imposition": ".layout",
+}
 
-__all__ = ["SpellPDFGenerator", "ThemeManager", "PlayerManager", "SpellIllustrationGenerator"]
\ No newline at end of file
+
+__all__ = ["SpellPDFGenerator", "ThemeManager", "PlayerManager", "SpellIllustrationGenerator",
+           "SpellCorpus", "SpellRecord", "Spell", "SpellValidationError", "validate_spell", "SpellPageCache",
+           "IllustrationCache", "SpellCatalogue",
+           "GrimoireDocument", "HtmlExporter", "MarkdownExporter", "PdfExporter",
+           "PageLayout", "Imposition"]
+
+
+def __getattr__(name):
+    if name in _EXPORTS:
+        value = getattr(importlib.import_module(_EXPORTS[name], __name__), name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -0,0 +1,175 @@
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass
+from typing import List, Optional
+
+from .corpus import SpellCorpus, default_spell_source
+from .instrumentation import BuildInstrumentation
+
+# Corpus partagé par les grimoires construits dans un même processus
+_WORKER_CORPUS: Optional[SpellCorpus] = None
+
+
+@dataclass
+class GrimoireTarget:
+    """Grimoire à construire : pour un joueur, ou pour un thème seul"""
+    player: str = None
+    theme: str = None
+    output_path: str = None
+
+    @property
+    def label(self) -> str:
+        return f"joueur '{self.player}'" if self.player else f"thème '{self.theme}'"
+
+
+@dataclass
+class GrimoireResult:
+    """Résultat de la construction d'un grimoire"""
+    target: GrimoireTarget
+    output_path: str = None
+    seconds: float = 0.0
+    error: str = None
+    report: dict = None
+
+
+def _list_configured(folder: str) -> List[str]:
+    """Liste les sous-dossiers contenant un config.json"""
+    if not os.path.isdir(folder):
+        return []
+    return sorted(
+        name for name in os.listdir(folder)
+        if os.path.exists(os.path.join(folder, name, "config.json"))
+    )
+
+
+def discover_targets(players: List[str] = None, themes: List[str] = None,
+                     players_dir: str = "players", themes_dir: str = "themes") -> List[GrimoireTarget]:
+    """
+    Construit la liste des grimoires à générer
+
+    Args:
+        players: Joueurs à inclure (tous ceux de players/ si None)
+        themes: Thèmes à inclure (tous ceux de themes/ si None)
+    """
+    if players is None:
+        players = _list_configured(players_dir)
+    if themes is None:
+        themes = _list_configured(themes_dir)
+    return [GrimoireTarget(player=p) for p in players] + [GrimoireTarget(theme=t) for t in themes]
+
+
+def target_output_path(generator, target: GrimoireTarget, output_dir: str) -> str:
+    """Chemin du PDF d'un grimoire : celui de la cible, sinon dérivé du titre du joueur ou du thème"""
+    if target.output_path is not None:
+        return target.output_path
+    if generator.player:
+        filename = generator._sanitize_filename(generator.player.get_grimoire_title()) + ".pdf"
+    else:
+        filename = f"Grimoire_Theme_{generator._sanitize_filename(target.theme)}.pdf"
+    return os.path.join(output_dir, filename)
+
+
+def _init_worker(corpus: SpellCorpus):
+    """Initialise un processus de travail avec le corpus déjà parsé"""
+    global _WORKER_CORPUS
+    _WORKER_CORPUS = corpus
+
+
+def _build_one(target: GrimoireTarget, output_dir: str, incremental: bool = False,
+               profile: bool = False) -> GrimoireResult:
+    """Construit un grimoire dans le processus courant et mesure son temps de génération"""
+    from .generator import SpellPDFGenerator
+
+    start = time.perf_counter()
+    result = GrimoireResult(target=target)
+    instrumentation = BuildInstrumentation(profile=profile)
+    try:
+        generator = SpellPDFGenerator(player=target.player, theme=target.theme,
+                                      output_dir=output_dir, corpus=_WORKER_CORPUS,
+                                      instrumentation=instrumentation)
+        output_path = target_output_path(generator, target, output_dir)
+
+        if generator.player:
+            generator.generate_player_grimoire(output_path, incremental=incremental)
+        else:
+            generator.generate_theme_grimoire(output_path, incremental=incremental)
+        result.output_path = output_path
+    except Exception as e:
+        result.error = str(e)
+    result.seconds = time.perf_counter() - start
+    result.report = instrumentation.report()
+    return result
+
+
+def build_grimoires(targets: List[GrimoireTarget], spells_folder=None,
+                    output_dir: str = "grimoires", jobs: int = None,
+                    incremental: bool = False, profile: bool = False,
+                    corpus: SpellCorpus = None) -> List[GrimoireResult]:
+    """
+    Construit plusieurs grimoires en parallèle sur les cœurs disponibles
+
+    Le corpus de sorts est parsé une seule fois puis transmis à chaque processus
+    de travail, qui le réutilise pour tous les grimoires qu'il construit.
+
+    Args:
+        targets: Grimoires à construire
+        spells_folder: Dossier des fiches de sorts, fichier JSONL, archive zip ou liste de ces sources
+                       (fiches_sorts/ ou fiches_sorts.zip si None)
+        output_dir: Dossier de sortie des PDFs
+        jobs: Nombre de processus (nombre de cœurs si None, 1 = sans pool)
+        incremental: Ne reconstruit que les grimoires et pages dont les entrées ont changé
+        profile: Joint un profil cProfile au rapport de chaque grimoire
+        corpus: Corpus déjà chargé (spells_folder est alors ignoré)
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    if corpus is None:
+        corpus = SpellCorpus.load(spells_folder if spells_folder is not None else default_spell_source())
+    jobs = jobs or os.cpu_count() or 1
+
+    start = time.perf_counter()
+    results = []
+    if jobs <= 1 or len(targets) <= 1:
+        _init_worker(corpus)
+        for target in targets:
+            results.append(_report(_build_one(target, output_dir, incremental, profile)))
+    else:
+        with ProcessPoolExecutor(max_workers=min(jobs, len(targets)),
+                                 initializer=_init_worker, initargs=(corpus,)) as executor:
+            futures = {executor.submit(_build_one, target, output_dir, incremental, profile): i for i, target in enumerate(targets)}
+            done = {}
+            for future in as_completed(futures):
+                done[futures[future]] = _report(future.result())
+            results = [done[i] for i in range(len(targets))]
+
+    ok = sum(1 for r in results if not r.error)
+    print(f"📚 {ok}/{len(targets)} grimoires générés en {time.perf_counter() - start:.2f}s")
+    _report_slowest(results)
+    return results
+
+
+def _report_slowest(results: List[GrimoireResult], top: int = 5):
+    """Affiche les étapes cumulées (hors sous-étapes, sans double compte) et les sorts les plus lents du lot"""
+    stages = {}
+    spells = []
+    for result in results:
+        if not result.report:
+            continue
+        for name, entry in result.report["stages"].items():
+            stages[name] = stages.get(name, 0.0) + entry["self_seconds"]
+        spells.extend((entry["seconds"], entry["spell"], result.target.label) for entry in result.report["slowest_spells"])
+
+    if stages:
+        slowest = sorted(stages.items(), key=lambda item: item[1], reverse=True)[:top]
+        print("🐢 Étapes les plus lentes : " + ", ".join(f"{name} {seconds:.2f}s" for name, seconds in slowest))
+    for seconds, spell, label in sorted(spells, reverse=True)[:top]:
+        print(f"🐢 {spell} ({label}) : {seconds:.3f}s")
+
+
+def _report(result: GrimoireResult) -> GrimoireResult:
+    """Affiche le temps de génération d'un grimoire"""
+    if result.error:
+        print(f"❌ Grimoire {result.target.label} en échec après {result.seconds:.2f}s : {result.error}")
+    else:
+        print(f"⏱️  Grimoire {result.target.label} : {result.output_path} ({result.seconds:.2f}s)")
+    return result
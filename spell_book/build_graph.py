@@ -0,0 +1,119 @@
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional
+
+
+@dataclass
+class BuildTask:
+    """Cible du graphe de construction (fiches, illustrations d'un thème, grimoire...)
+
+    `action` effectue le travail (en ignorant ce qui est déjà à jour) et
+    `stale` liste, sans rien modifier, les éléments qui seraient régénérés.
+    """
+    name: str
+    action: Callable[[], Any]
+    deps: List[str] = field(default_factory=list)
+    stale: Optional[Callable[[], List[str]]] = None
+
+
+@dataclass
+class TaskResult:
+    """Résultat de l'exécution d'une cible"""
+    name: str
+    status: str = "ok"  # "ok", "échec" ou "ignorée"
+    seconds: float = 0.0
+    error: str = None
+
+
+class BuildGraph:
+    """Petit graphe de construction à la make : les cibles indépendantes s'exécutent en parallèle,
+    chaque cible attend que ses dépendances aient réussi"""
+
+    def __init__(self):
+        self.tasks: Dict[str, BuildTask] = {}
+
+    def add(self, task: BuildTask) -> BuildTask:
+        if task.name in self.tasks:
+            raise ValueError(f"Cible déjà déclarée : {task.name}")
+        self.tasks[task.name] = task
+        return task
+
+    def _order(self) -> List[str]:
+        """Ordre topologique des cibles (dépendances d'abord)"""
+        order, state = [], {}
+
+        def visit(name: str, path: List[str]):
+            if state.get(name) == "done":
+                return
+            if state.get(name) == "visiting":
+                raise ValueError(f"Dépendance circulaire : {' -> '.join(path + [name])}")
+            if name not in self.tasks:
+                raise ValueError(f"Dépendance inconnue : {name} (requise par {path[-1]})")
+            state[name] = "visiting"
+            for dep in self.tasks[name].deps:
+                visit(dep, path + [name])
+            state[name] = "done"
+            order.append(name)
+
+        for name in self.tasks:
+            visit(name, [])
+        return order
+
+    def plan(self) -> Dict[str, List[str]]:
+        """
+        Liste ce qui serait régénéré, sans rien construire
+
+        Une cible est à refaire si l'un de ses éléments est périmé ou si l'une
+        de ses dépendances est à refaire.
+
+        Returns:
+            Dictionnaire cible -> éléments périmés (liste vide si la cible est à jour)
+        """
+        plan = {}
+        for name in self._order():
+            task = self.tasks[name]
+            items = list(task.stale()) if task.stale else []
+            stale_deps = [dep for dep in task.deps if plan[dep]]
+            if stale_deps and not items:
+                items = [f"dépend de {', '.join(stale_deps)}"]
+            plan[name] = items
+        return plan
+
+    def run(self, jobs: int = 1) -> Dict[str, TaskResult]:
+        """Exécute toutes les cibles, jusqu'à `jobs` à la fois, dans l'ordre des dépendances"""
+        order = self._order()
+        results: Dict[str, TaskResult] = {}
+        pending = list(order)
+        running = {}
+
+        def execute(task: BuildTask) -> TaskResult:
+            start = time.perf_counter()
+            result = TaskResult(task.name)
+            try:
+                task.action()
+            except Exception as e:
+                result.status, result.error = "échec", str(e)
+            result.seconds = time.perf_counter() - start
+            return result
+
+        with ThreadPoolExecutor(max_workers=max(1, jobs)) as executor:
+            while pending or running:
+                for name in list(pending):
+                    task = self.tasks[name]
+                    failed = [dep for dep in task.deps if dep in results and results[dep].status != "ok"]
+                    if failed:
+                        results[name] = TaskResult(name, status="ignorée", error=f"dépendance en échec : {', '.join(failed)}")
+                        pending.remove(name)
+                    elif all(dep in results for dep in task.deps):
+                        running[executor.submit(execute, task)] = name
+                        pending.remove(name)
+                if not running:
+                    continue
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    result = future.result()
+                    results[running.pop(future)] = result
+                    if result.error:
+                        print(f"❌ {result.name} : {result.error}")
+        return {name: results[name] for name in order}
@@ -0,0 +1,229 @@
+import json
+import os
+import sqlite3
+from typing import Dict, List, Optional
+
+from .spell import Spell, SpellValidationError
+from .manifest import file_hash
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS files (
+    path TEXT PRIMARY KEY,
+    mtime_ns INTEGER NOT NULL,
+    size INTEGER NOT NULL,
+    hash TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS spells (
+    id INTEGER PRIMARY KEY,
+    key TEXT NOT NULL,
+    name TEXT NOT NULL,
+    level INTEGER NOT NULL,
+    school TEXT NOT NULL,
+    ritual INTEGER NOT NULL,
+    concentration INTEGER NOT NULL,
+    description TEXT NOT NULL,
+    source_file TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_spells_key ON spells(key);
+CREATE INDEX IF NOT EXISTS idx_spells_level ON spells(level);
+CREATE INDEX IF NOT EXISTS idx_spells_school ON spells(school);
+CREATE INDEX IF NOT EXISTS idx_spells_ritual ON spells(ritual);
+CREATE INDEX IF NOT EXISTS idx_spells_concentration ON spells(concentration);
+CREATE INDEX IF NOT EXISTS idx_spells_source ON spells(source_file, position);
+"""
+
+# Le tokenizer trigram permet des recherches de sous-chaînes, comme le filtre des thèmes
+FTS_SCHEMA = "CREATE VIRTUAL TABLE IF NOT EXISTS spells_fts USING fts5(name, description, tokenize='trigram')"
+TRIGRAM_MIN_LENGTH = 3
+
+
+class SpellCatalogue:
+    """Catalogue SQLite des sorts, synchronisé de façon incrémentale avec fiches_sorts/.
+
+    Les colonnes niveau, école, rituel et concentration sont indexées, et un
+    index plein texte (FTS5) couvre les noms et descriptions. Les filtres des
+    thèmes et les listes de sorts des joueurs deviennent des requêtes indexées
+    au lieu d'un parcours de toutes les fiches à chaque génération.
+    """
+
+    def __init__(self, db_path: str = "fiches_sorts.sqlite"):
+        self.db_path = db_path
+        self.connection = sqlite3.connect(db_path)
+        self.connection.executescript(SCHEMA)
+        try:
+            self.connection.execute(FTS_SCHEMA)
+            self.has_fts = True
+        except sqlite3.OperationalError:
+            # SQLite sans FTS5 ou sans tokenizer trigram : repli sur LIKE
+            self.has_fts = False
+        self.connection.commit()
+
+    def close(self):
+        self.connection.close()
+
+    # --- Synchronisation ---
+
+    def sync(self, folder_path: str = "fiches_sorts") -> Dict[str, int]:
+        """
+        Met à jour le catalogue depuis un dossier de fiches JSON
+
+        Seuls les fichiers dont la date ou la taille a changé sont relus, et ne
+        sont réindexés que si leur empreinte a réellement changé.
+
+        Returns:
+            Nombre de fichiers mis à jour, supprimés et inchangés, et de fiches invalides écartées
+        """
+        folder_path = os.path.normpath(folder_path)
+        stats = {"updated": 0, "removed": 0, "unchanged": 0, "invalid": 0}
+        invalid = []
+        known = {
+            path: (mtime_ns, size, digest)
+            for path, mtime_ns, size, digest in self.connection.execute("SELECT path, mtime_ns, size, hash FROM files")
+        }
+        seen = set()
+        with self.connection:
+            for file in sorted(os.listdir(folder_path)):
+                if not file.endswith(".json") or file == "index.json":
+                    continue
+                path = os.path.join(folder_path, file)
+                seen.add(path)
+                stat = os.stat(path)
+                previous = known.get(path)
+                if previous and previous[:2] == (stat.st_mtime_ns, stat.st_size):
+                    stats["unchanged"] += 1
+                    continue
+                digest = file_hash(path)
+                if previous and previous[2] == digest:
+                    self._upsert_file(path, stat, digest)
+                    stats["unchanged"] += 1
+                    continue
+                try:
+                    with open(path, encoding="utf-8") as f:
+                        data = json.load(f)
+                except (ValueError, UnicodeDecodeError) as e:
+                    # Fichier tronqué ou mal formé : ses sorts sont retirés et il sera relu à la prochaine synchronisation
+                    self._delete_spells(file)
+                    invalid.append((file, [f"JSON illisible : {e}"]))
+                    continue
+                invalid.extend(self._replace_spells(path, file, data))
+                self._upsert_file(path, stat, digest)
+                stats["updated"] += 1
+
+            for path in set(known) - seen:
+                if os.path.dirname(path) != folder_path:
+                    continue
+                self._delete_spells(os.path.basename(path))
+                self.connection.execute("DELETE FROM files WHERE path = ?", (path,))
+                stats["removed"] += 1
+
+        stats["invalid"] = len(invalid)
+        if invalid:
+            print(f"⚠️ {len(invalid)} fiche(s) de sort invalide(s) non cataloguée(s) :")
+            for source_file, problems in invalid:
+                print(f"   - {source_file} : {'; '.join(problems)}")
+        return stats
+
+    def _upsert_file(self, path: str, stat: os.stat_result, digest: str):
+        self.connection.execute(
+            "INSERT OR REPLACE INTO files (path, mtime_ns, size, hash) VALUES (?, ?, ?, ?)",
+            (path, stat.st_mtime_ns, stat.st_size, digest),
+        )
+
+    def _delete_spells(self, source_file: str):
+        if self.has_fts:
+            self.connection.execute(
+                "DELETE FROM spells_fts WHERE rowid IN (SELECT id FROM spells WHERE source_file = ?)", (source_file,)
+            )
+        self.connection.execute("DELETE FROM spells WHERE source_file = ?", (source_file,))
+
+    def _replace_spells(self, path: str, source_file: str, data):
+        """Remplace les sorts issus d'un fichier (un sort ou une liste de sorts)"""
+        self._delete_spells(source_file)
+        sorts = data if isinstance(data, list) else [data]
+        invalid = []
+        for position, spell in enumerate(sorts):
+            try:
+                record = Spell.from_dict(spell, source_file=source_file)
+            except SpellValidationError as e:
+                invalid.append((source_file, e.problems))
+                continue
+            cursor = self.connection.execute(
+                "INSERT INTO spells (key, name, level, school, ritual, concentration, description, source_file, position, data) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (record.sanitized_name, record.name, record.level, record.school, int(record.ritual),
+                 int(record.concentration), record.description, source_file, position,
+                 json.dumps(record.to_dict(), ensure_ascii=False)),
+            )
+            if self.has_fts:
+                self.connection.execute(
+                    "INSERT INTO spells_fts (rowid, name, description) VALUES (?, ?, ?)",
+                    (cursor.lastrowid, record.name, record.description),
+                )
+        return invalid
+
+    # --- Requêtes ---
+
+    def _name_filter_clause(self, terms: List[str]):
+        """Clause SQL « le nom contient l'un des termes », via l'index FTS quand c'est possible"""
+        clauses, params = [], []
+        fts_terms = [t for t in terms if self.has_fts and len(t) >= TRIGRAM_MIN_LENGTH]
+        if fts_terms:
+            query = " OR ".join('"' + t.replace('"', '""') + '"' for t in fts_terms)
+            clauses.append("id IN (SELECT rowid FROM spells_fts WHERE spells_fts MATCH ?)")
+            params.append("name : (" + query + ")")
+        for term in terms:
+            if term not in fts_terms:
+                clauses.append("lower(name) LIKE ?")
+                params.append(f"%{term.lower()}%")
+        return "(" + " OR ".join(clauses) + ")", params
+
+    def select(self, known_spells: Optional[List[str]] = None, name_filters: Optional[List[str]] = None,
+               level: int = None, school: str = None, ritual: bool = None,
+               concentration: bool = None) -> List[Spell]:
+        """
+        Retourne les sorts correspondant à tous les critères fournis, dans l'ordre des fichiers
+
+        Args:
+            known_spells: Noms nettoyés des sorts autorisés (liste d'un joueur)
+            name_filters: Le nom doit contenir l'un de ces termes (filtre d'un thème)
+        """
+        where, params = [], []
+        if known_spells is not None:
+            where.append("key IN (SELECT value FROM json_each(?))")
+            params.append(json.dumps(list(known_spells)))
+        if name_filters is not None:
+            if not name_filters:
+                return []
+            clause, clause_params = self._name_filter_clause(name_filters)
+            where.append(clause)
+            params.extend(clause_params)
+        for column, value in (("level", level), ("school", school), ("ritual", ritual), ("concentration", concentration)):
+            if value is not None:
+                where.append(f"{column} = ?")
+                params.append(int(value) if isinstance(value, bool) else value)
+
+        sql = "SELECT source_file, data FROM spells"
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        sql += " ORDER BY source_file, position"
+        return [
+            Spell.from_dict(json.loads(data), source_file=source_file)
+            for source_file, data in self.connection.execute(sql, params)
+        ]
+
+    def search(self, text: str) -> List[Spell]:
+        """Recherche plein texte dans les noms et descriptions"""
+        if not self.has_fts or len(text) < TRIGRAM_MIN_LENGTH:
+            sql = ("SELECT source_file, data FROM spells WHERE lower(name) LIKE ? OR lower(description) LIKE ? "
+                   "ORDER BY source_file, position")
+            rows = self.connection.execute(sql, (f"%{text.lower()}%", f"%{text.lower()}%"))
+        else:
+            sql = ("SELECT source_file, data FROM spells WHERE id IN "
+                   "(SELECT rowid FROM spells_fts WHERE spells_fts MATCH ?) ORDER BY source_file, position")
+            rows = self.connection.execute(sql, ('"' + text.replace('"', '""') + '"',))
+        return [Spell.from_dict(json.loads(data), source_file=source_file) for source_file, data in rows]
+
+    def __len__(self) -> int:
+        return self.connection.execute("SELECT COUNT(*) FROM spells").fetchone()[0]
@@ -0,0 +1,364 @@
+"""
+Interface en ligne de commande : python -m spell_book <commande>
+
+Commandes :
+    spells         génère les fiches de sorts manquantes (API OpenAI)
+    illustrations  génère les illustrations manquantes des grimoires ciblés
+    build          construit les grimoires : illustrations puis PDF, cibles indépendantes en parallèle
+    watch          surveille fiches et configurations, et reconstruit les grimoires concernés
+
+Avec --plan, une commande liste les fiches, illustrations et PDF périmés qui
+seraient régénérés, sans rien construire ni appeler l'API.
+
+Exemples :
+    python -m spell_book spells --file sorts.txt --api-workers 4
+    python -m spell_book build --player bastian fadette --theme druide -j 4
+    python -m spell_book build --plan
+    python -m spell_book watch --player bastian --debounce 1
+"""
+
+import argparse
+import logging
+import os
+import sys
+import threading
+import time
+from typing import Dict, List
+
+from .batch import GrimoireTarget, discover_targets, target_output_path
+from .build_graph import BuildGraph, BuildTask
+
+SPELLS_TASK = "fiches"
+PLAN_PREVIEW = 8  # Éléments affichés par cible dans le plan
+
+
+def _api_key() -> str:
+    """Clé API OpenAI, lue dans l'environnement ou le fichier .env"""
+    from dotenv import load_dotenv
+    load_dotenv()
+    return os.getenv("OPENAI_API_KEY")
+
+
+def _read_spell_names(names: List[str], path: str = None) -> List[str]:
+    """Noms de sorts passés en argument et/ou listés dans un fichier (un par ligne, # pour commenter)"""
+    names = list(names or [])
+    if path:
+        with open(path, encoding="utf-8") as f:
+            names += [line.strip() for line in f if line.strip() and not line.lstrip().startswith("#")]
+    return list(dict.fromkeys(names))
+
+
+class BuildContext:
+    """État partagé par les cibles d'une commande : corpus, générateurs et pool de processus, créés à la demande"""
+
+    def __init__(self, args):
+        self.args = args
+        self._lock = threading.Lock()
+        self._corpus = None
+        self._generators: Dict[str, object] = {}
+        self._pool = None
+
+    def corpus(self):
+        """Corpus de sorts, chargé au premier usage (après la génération éventuelle des fiches)"""
+        from .corpus import SpellCorpus
+        with self._lock:
+            if self._corpus is None:
+                self._corpus = SpellCorpus.load(self.args.spells_folder)
+            return self._corpus
+
+    def generator(self, target: GrimoireTarget):
+        """Générateur PDF d'une cible, pour la planification et la sélection des sorts"""
+        from .generator import SpellPDFGenerator
+        corpus = self.corpus()
+        with self._lock:
+            if target.label not in self._generators:
+                self._generators[target.label] = SpellPDFGenerator(
+                    player=target.player, theme=target.theme,
+                    output_dir=self.args.output_dir, corpus=corpus)
+            return self._generators[target.label]
+
+    def build_grimoire(self, target: GrimoireTarget):
+        """Construit un grimoire, dans le pool de processus si plusieurs tâches sont autorisées"""
+        from . import batch
+        incremental = not self.args.full
+        if self.args.jobs <= 1:
+            batch._init_worker(self.corpus())
+            result = batch._build_one(target, self.args.output_dir, incremental, self.args.profile)
+        else:
+            result = self._process_pool().submit(
+                batch._build_one, target, self.args.output_dir, incremental, self.args.profile).result()
+        if result.error:
+            raise RuntimeError(result.error)
+        batch._report(result)
+
+    def _process_pool(self):
+        from concurrent.futures import ProcessPoolExecutor
+        from . import batch
+        corpus = self.corpus()
+        with self._lock:
+            if self._pool is None:
+                self._pool = ProcessPoolExecutor(max_workers=self.args.jobs, initializer=batch._init_worker,
+                                                 initargs=(corpus,))
+            return self._pool
+
+    def close(self):
+        if self._pool is not None:
+            self._pool.shutdown()
+
+
+def _spells_task(names: List[str], output_dir: str, args) -> BuildTask:
+    """Cible de génération des fiches de sorts manquantes"""
+    from character_sheet.spell_generator import pending_spells
+
+    def action():
+        if not pending_spells(names, output_dir):
+            return
+        api_key = _api_key()
+        if not api_key:
+            raise RuntimeError("Clé API OpenAI manquante (OPENAI_API_KEY dans l'environnement ou le fichier .env)")
+        from character_sheet import ResponseCache, SpellSheetGenerator
+        generator = SpellSheetGenerator(api_key=api_key, output_dir=output_dir, response_cache=ResponseCache())
+        generator.generate_spell_files(names, max_workers=args.api_workers, batch_size=args.batch_size)
+
+    return BuildTask(SPELLS_TASK, action, stale=lambda: pending_spells(names, output_dir))
+
+
+def _illustration_tasks(graph: BuildGraph, context: BuildContext, targets: List[GrimoireTarget],
+                        deps: List[str], require_key: bool) -> Dict[str, str]:
+    """
+    Ajoute une cible d'illustrations par dossier d'illustrations (les joueurs d'un même thème le partagent)
+
+    Returns:
+        Dictionnaire libellé de la cible grimoire -> nom de sa cible d'illustrations
+    """
+    folders: Dict[str, List[GrimoireTarget]] = {}
+    for target in targets:
+        theme_name = target.theme or _player_theme(target.player)
+        folders.setdefault(theme_name, []).append(target)
+
+    task_by_target = {}
+    for theme_name, theme_targets in folders.items():
+        task_name = f"illustrations:{theme_name}"
+
+        def needed(theme_targets=theme_targets):
+            spells = {}
+            for target in theme_targets:
+                generator = context.generator(target)
+                for spell in generator._select_spells(context.corpus()):
+                    spells.setdefault(spell.sanitized_name, spell)
+            return generator, list(spells.values())
+
+        def stale(needed=needed):
+            from .illustrations import is_illustrated
+            generator, spells = needed()
+            return [spell.name for spell in spells if not is_illustrated(generator.illustrations_folder, spell.name)]
+
+        def action(needed=needed, stale=stale, theme_name=theme_name):
+            if not stale():
+                return
+            api_key = _api_key()
+            if not api_key:
+                if require_key:
+                    raise RuntimeError("Clé API OpenAI manquante (OPENAI_API_KEY dans l'environnement ou le fichier .env)")
+                print(f"⚠️  Pas de clé API : illustrations du thème '{theme_name}' non générées")
+                return
+            from character_sheet.response_cache import ResponseCache
+            from .illustrations import SpellIllustrationGenerator
+            generator, spells = needed()
+            illustrateur = SpellIllustrationGenerator(api_key=api_key, output_dir=generator.illustrations_folder,
+                                                      theme_manager=generator.theme, response_cache=ResponseCache())
+            illustrateur.generate_missing_illustrations([spell.to_dict() for spell in spells],
+                                                        max_workers=context.args.api_workers)
+
+        graph.add(BuildTask(task_name, action, deps=list(deps), stale=stale))
+        for target in theme_targets:
+            task_by_target[target.label] = task_name
+    return task_by_target
+
+
+def _player_theme(player: str) -> str:
+    from .player_manager import PlayerManager
+    return PlayerManager(player).theme.theme_name
+
+
+def _grimoire_tasks(graph: BuildGraph, context: BuildContext, targets: List[GrimoireTarget],
+                    deps_by_target: Dict[str, List[str]]):
+    """Ajoute une cible par grimoire PDF"""
+    for target in targets:
+        def stale(target=target):
+            generator = context.generator(target)
+            output_path = target_output_path(generator, target, context.args.output_dir)
+            if context.args.full:
+                return [f"{output_path} (reconstruction complète demandée)"]
+            reason = generator.stale_reason(output_path)
+            return [f"{output_path} ({reason})"] if reason else []
+
+        graph.add(BuildTask(f"grimoire:{target.label}", lambda target=target: context.build_grimoire(target),
+                            deps=deps_by_target.get(target.label, []), stale=stale))
+
+
+def _targets(args) -> List[GrimoireTarget]:
+    """Grimoires ciblés : ceux demandés, ou tous les joueurs et thèmes configurés"""
+    if args.players is None and args.themes is None:
+        return discover_targets()
+    return discover_targets(players=args.players or [], themes=args.themes or [])
+
+
+def _print_plan(plan: Dict[str, List[str]]) -> int:
+    print("📋 Plan de construction :")
+    for name, items in plan.items():
+        if not items:
+            print(f"  ✅ {name} : à jour")
+            continue
+        preview = ", ".join(items[:PLAN_PREVIEW]) + (f", … (+{len(items) - PLAN_PREVIEW})" if len(items) > PLAN_PREVIEW else "")
+        print(f"  🔄 {name} : {len(items)} à refaire — {preview}")
+    stale = sum(1 for items in plan.values() if items)
+    print(f"📋 {stale}/{len(plan)} cibles à refaire")
+    return stale
+
+
+def _run_graph(graph: BuildGraph, jobs: int) -> int:
+    start = time.perf_counter()
+    results = graph.run(jobs=jobs)
+    failed = [r for r in results.values() if r.status == "échec"]
+    skipped = [r for r in results.values() if r.status == "ignorée"]
+    for result in skipped:
+        print(f"⏭️  {result.name} ignorée : {result.error}")
+    print(f"🏁 {len(results) - len(failed) - len(skipped)}/{len(results)} cibles terminées "
+          f"en {time.perf_counter() - start:.2f}s")
+    return 1 if failed or skipped else 0
+
+
+def cmd_spells(args) -> int:
+    names = _read_spell_names(args.names, args.file)
+    if not names:
+        print("❌ Aucun sort demandé (noms en argument ou --file)")
+        return 2
+    graph = BuildGraph()
+    graph.add(_spells_task(names, args.output_dir, args))
+    if args.plan:
+        _print_plan(graph.plan())
+        return 0
+    return _run_graph(graph, 1)
+
+
+def cmd_illustrations(args) -> int:
+    context = BuildContext(args)
+    graph = BuildGraph()
+    _illustration_tasks(graph, context, _targets(args), deps=[], require_key=not args.plan)
+    if args.plan:
+        _print_plan(graph.plan())
+        return 0
+    return _run_graph(graph, args.jobs)
+
+
+def cmd_build(args) -> int:
+    context = BuildContext(args)
+    targets = _targets(args)
+    graph = BuildGraph()
+    upstream = []
+    names = _read_spell_names([], args.spells_file)
+    if names:
+        if args.spells_folder[0].endswith((".zip", ".jsonl")):
+            print(f"❌ Les fiches générées sont écrites dans un dossier, pas dans {args.spells_folder[0]}")
+            return 2
+        graph.add(_spells_task(names, args.spells_folder[0], args))
+        upstream = [SPELLS_TASK]
+
+    deps_by_target = {target.label: list(upstream) for target in targets}
+    if not args.no_illustrations and not _api_key():
+        # Sans clé, les illustrations manquantes ne peuvent pas être générées : elles ne rendent pas les grimoires périmés
+        print("⚠️  Pas de clé API OpenAI : les illustrations manquantes ne seront pas générées")
+    elif not args.no_illustrations:
+        illustrations = _illustration_tasks(graph, context, targets, deps=upstream, require_key=False)
+        for target in targets:
+            deps_by_target[target.label].append(illustrations[target.label])
+    _grimoire_tasks(graph, context, targets, deps_by_target)
+
+    try:
+        if args.plan:
+            _print_plan(graph.plan())
+            return 0
+        return _run_graph(graph, args.jobs)
+    finally:
+        context.close()
+
+
+def cmd_watch(args) -> int:
+    from .watch import GrimoireWatcher
+    watcher = GrimoireWatcher(players=args.players, themes=args.themes, spells_folder=args.spells_folder,
+                              output_dir=args.output_dir, jobs=args.jobs, interval=args.interval,
+                              debounce=args.debounce)
+    try:
+        watcher.run()
+    except KeyboardInterrupt:
+        print("👋 Surveillance arrêtée")
+    return 0
+
+
+def _add_target_arguments(parser):
+    parser.add_argument("--player", "--players", dest="players", nargs="+", action="extend",
+                        help="Joueurs ciblés (tous ceux de players/ si ni joueur ni thème n'est donné)")
+    parser.add_argument("--theme", "--themes", dest="themes", nargs="+", action="extend",
+                        help="Thèmes ciblés (tous ceux de themes/ si ni joueur ni thème n'est donné)")
+    parser.add_argument("--spells-folder", "--spells", dest="spells_folder", nargs="+",
+                        help="Sources des fiches : dossier, fichier JSONL ou archive zip (plusieurs possibles, "
+                             "la dernière l'emporte pour un même sort ; fiches_sorts/ ou fiches_sorts.zip par défaut)")
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="python -m spell_book", description="Fiches de sorts, illustrations et grimoires")
+    parser.add_argument("-v", "--verbose", action="store_true", help="Affiche le rapport détaillé de chaque grimoire")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    spells = subparsers.add_parser("spells", help="Génère les fiches de sorts manquantes")
+    spells.add_argument("names", nargs="*", help="Noms des sorts")
+    spells.add_argument("--file", help="Fichier listant les sorts, un par ligne")
+    spells.add_argument("-o", "--output-dir", default="fiches_sorts", help="Dossier des fiches")
+    spells.add_argument("--api-workers", type=int, default=4, help="Requêtes simultanées vers l'API")
+    spells.add_argument("--batch-size", type=int, default=1, help="Sorts demandés par requête")
+    spells.add_argument("--plan", action="store_true", help="Liste les sorts à générer sans appeler l'API")
+    spells.set_defaults(func=cmd_spells)
+
+    illustrations = subparsers.add_parser("illustrations", help="Génère les illustrations manquantes des grimoires")
+    _add_target_arguments(illustrations)
+    illustrations.add_argument("-j", "--jobs", type=int, default=2, help="Thèmes illustrés en parallèle")
+    illustrations.add_argument("--api-workers", type=int, default=4, help="Sorts illustrés simultanément par thème")
+    illustrations.add_argument("--plan", action="store_true", help="Liste les illustrations manquantes sans appeler l'API")
+    illustrations.set_defaults(func=cmd_illustrations, output_dir="grimoires")
+
+    build = subparsers.add_parser("build", help="Construit les grimoires (illustrations puis PDF)")
+    _add_target_arguments(build)
+    build.add_argument("-j", "--jobs", type=int, default=os.cpu_count() or 1, help="Cibles construites en parallèle")
+    build.add_argument("-o", "--output-dir", default="grimoires", help="Dossier de sortie des PDF")
+    build.add_argument("--spells-file", help="Sorts à générer d'abord s'ils manquent (un par ligne)")
+    build.add_argument("--api-workers", type=int, default=4, help="Requêtes simultanées vers l'API")
+    build.add_argument("--batch-size", type=int, default=1, help="Sorts demandés par requête")
+    build.add_argument("--no-illustrations", action="store_true", help="Ne génère pas les illustrations manquantes")
+    build.add_argument("--full", action="store_true", help="Reconstruction complète, sans cache de pages ni manifeste")
+    build.add_argument("--profile", action="store_true", help="Profile chaque grimoire (cProfile, journalisé en DEBUG)")
+    build.add_argument("--plan", action="store_true", help="Liste les cibles périmées sans rien construire")
+    build.set_defaults(func=cmd_build)
+
+    watch = subparsers.add_parser("watch", help="Reconstruit les grimoires concernés à chaque modification")
+    _add_target_arguments(watch)
+    watch.add_argument("-j", "--jobs", type=int, default=1, help="Grimoires reconstruits en parallèle")
+    watch.add_argument("-o", "--output-dir", default="grimoires", help="Dossier de sortie des PDF")
+    watch.add_argument("--interval", type=float, default=0.5, help="Intervalle de scrutation des fichiers (s)")
+    watch.add_argument("--debounce", type=float, default=0.5,
+                       help="Délai sans modification avant de reconstruire (s), pour regrouper les modifications")
+    watch.set_defaults(func=cmd_watch)
+    return parser
+
+
+def main(argv: List[str] = None) -> int:
+    args = build_parser().parse_args(argv)
+    if "spells_folder" in vars(args) and args.spells_folder is None:
+        from .corpus import default_spell_source
+        args.spells_folder = [default_spell_source()]
+    logging.basicConfig(level=logging.DEBUG if args.verbose else logging.WARNING, format="%(message)s")
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,154 @@
+import json
+import os
+from typing import Any, Dict, Iterable, Iterator, List, Sequence, Tuple, Union
+
+from character_sheet.spell_store import JsonlSpellStore, ZipSpellArchive
+from character_sheet.utils import sanitize_filename
+from .spell import Spell, SpellValidationError
+
+# Ancien nom du record de sort, conservé pour compatibilité
+SpellRecord = Spell
+
+
+def default_spell_source(folder: str = "fiches_sorts") -> str:
+    """Source de fiches par défaut : le dossier, ou son archive zip s'il n'a pas été extrait"""
+    if not os.path.isdir(folder) and os.path.exists(folder + ".zip"):
+        return folder + ".zip"
+    return folder
+
+
+class SpellCorpus:
+    """Ensemble des sorts d'un dossier, chargé une seule fois et indexé.
+
+    Un même corpus peut être partagé par plusieurs `SpellPDFGenerator`
+    (un par joueur) pour éviter de relire et reparser les fiches à chaque PDF.
+    Les fiches non conformes au schéma sont écartées au chargement et
+    signalées toutes ensemble, au lieu d'interrompre la mise en page.
+    """
+
+    def __init__(self, records: Iterable[Spell] = (), folder_path: str = None):
+        self.folder_path = folder_path
+        self.records: List[Spell] = []
+        self.by_level: Dict[int, List[Spell]] = {}
+        self.by_school: Dict[str, List[Spell]] = {}
+        self.by_name: Dict[str, Spell] = {}
+        self.rituals: List[Spell] = []
+        self.concentration: List[Spell] = []
+        self.invalid: List[Tuple[str, List[str]]] = []
+        for record in records:
+            self.add(record)
+
+    @classmethod
+    def from_folder(cls, folder_path: str) -> "SpellCorpus":
+        """Charge toutes les fiches JSON d'un dossier (hors index.json)"""
+        corpus = cls(folder_path=folder_path)
+        for file in sorted(os.listdir(folder_path)):
+            if not file.endswith(".json") or file == "index.json":
+                continue
+            try:
+                with open(os.path.join(folder_path, file), encoding='utf-8') as f:
+                    data = json.load(f)
+            except (ValueError, UnicodeDecodeError) as e:
+                # Fichier tronqué ou mal formé : signalé avec les autres fiches écartées
+                corpus.invalid.append((file, [f"JSON illisible : {e}"]))
+                continue
+            # Gestion des fichiers contenant une liste ou un seul sort
+            sorts = data if isinstance(data, list) else [data]
+            for spell in sorts:
+                corpus.add_dict(spell, source_file=file)
+        corpus.report_invalid()
+        return corpus
+
+    @classmethod
+    def from_jsonl(cls, path: str) -> "SpellCorpus":
+        """Charge toutes les fiches d'un stockage JSONL en une seule lecture séquentielle"""
+        corpus = cls(folder_path=path)
+        for key, spell in JsonlSpellStore(path, readonly=True).items():
+            corpus.add_dict(spell, source_file=f"{key}.json")
+        corpus.report_invalid()
+        return corpus
+
+    @classmethod
+    def from_zip(cls, path: str) -> "SpellCorpus":
+        """Charge les fiches d'une archive zip sans l'extraire (artefacts __MACOSX ignorés)"""
+        corpus = cls(folder_path=path)
+        archive = ZipSpellArchive.open(path)
+        for name in archive.keys():
+            try:
+                data = archive.get(name)
+            except (ValueError, UnicodeDecodeError) as e:
+                corpus.invalid.append((f"{name}.json", [f"JSON illisible : {e}"]))
+                continue
+            sorts = data if isinstance(data, list) else [data]
+            for spell in sorts:
+                corpus.add_dict(spell, source_file=f"{name}.json")
+        corpus.report_invalid()
+        return corpus
+
+    @classmethod
+    def from_sources(cls, sources: Sequence[str]) -> "SpellCorpus":
+        """Fusionne plusieurs sources ; un sort présent dans plusieurs sources est pris dans la dernière"""
+        records: Dict[str, Spell] = {}
+        invalid = []
+        for source in sources:
+            corpus = cls.load(source)
+            records.update(corpus.by_name)
+            invalid.extend(corpus.invalid)
+        corpus = cls(records.values(), folder_path=tuple(sources))
+        corpus.invalid = invalid
+        return corpus
+
+    @classmethod
+    def load(cls, source: Union[str, Sequence[str]]) -> "SpellCorpus":
+        """Charge un corpus depuis un dossier de fiches JSON, un fichier JSONL, une archive zip ou une liste de ces sources"""
+        if isinstance(source, (list, tuple)):
+            if len(source) == 1:
+                return cls.load(source[0])
+            return cls.from_sources(source)
+        if source.endswith(".jsonl"):
+            return cls.from_jsonl(source)
+        if source.endswith(".zip"):
+            return cls.from_zip(source)
+        return cls.from_folder(source)
+
+    def add(self, record: Spell):
+        """Ajoute un sort au corpus et met à jour les index"""
+        self.records.append(record)
+        self.by_level.setdefault(record.level, []).append(record)
+        self.by_school.setdefault(record.school, []).append(record)
+        self.by_name[record.sanitized_name] = record
+        if record.ritual:
+            self.rituals.append(record)
+        if record.concentration:
+            self.concentration.append(record)
+
+    def add_dict(self, data: Dict[str, Any], source_file: str = "") -> bool:
+        """Valide et ajoute une fiche brute ; une fiche invalide est notée dans `invalid`"""
+        try:
+            self.add(Spell.from_dict(data, source_file=source_file))
+            return True
+        except SpellValidationError as e:
+            self.invalid.append((source_file, e.problems))
+            return False
+
+    def report_invalid(self):
+        """Affiche en une fois toutes les fiches écartées au chargement"""
+        if not self.invalid:
+            return
+        print(f"⚠️ {len(self.invalid)} fiche(s) de sort invalide(s) ignorée(s) :")
+        for source_file, problems in self.invalid:
+            print(f"   - {source_file or 'fiche'} : {'; '.join(problems)}")
+
+    def get(self, spell_name: str) -> Spell:
+        """Retourne un sort par son nom (brut ou déjà nettoyé), ou None"""
+        return self.by_name.get(sanitize_filename(spell_name))
+
+    def levels(self) -> List[int]:
+        """Retourne les niveaux présents dans le corpus, triés"""
+        return sorted(self.by_level.keys())
+
+    def __iter__(self) -> Iterator[Spell]:
+        return iter(self.records)
+
+    def __len__(self) -> int:
+        return len(self.records)
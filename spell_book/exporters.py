@@ -0,0 +1,179 @@
+import html
+import os
+from abc import ABC, abstractmethod
+from typing import Dict, List, Optional
+
+from .render_model import GrimoireDocument
+from .spell import Spell
+
+DEFAULT_COLORS = {"title": "#8B0000", "subtitle": "#2F4F4F", "body": "#000000"}
+
+
+def _yes_no(value: bool) -> str:
+    return "Oui" if value else "Non"
+
+
+def _relative_path(path: Optional[str], output_path: str) -> Optional[str]:
+    """Chemin d'une illustration relatif au fichier produit (liens portables)"""
+    if not path:
+        return None
+    start = os.path.dirname(os.path.abspath(output_path))
+    return os.path.relpath(os.path.abspath(path), start).replace(os.sep, "/")
+
+
+def _md_cell(value) -> str:
+    """Contenu d'une cellule de tableau Markdown : « | » et retours à la ligne casseraient la ligne"""
+    text = str(value).replace("\\", "\\\\").replace("|", "\\|")
+    return "<br>".join(line.strip() for line in text.splitlines()) or "-"
+
+
+def _spell_details(spell: Spell) -> List[tuple]:
+    """Informations secondaires d'une fiche, dans l'ordre d'affichage du grimoire"""
+    return [(label, value) for label, value in (
+        ("Type", spell.attack_save),
+        ("Cible", spell.target),
+        ("Composantes", spell.components),
+    ) if value]
+
+
+class Exporter(ABC):
+    """Backend de rendu d'un `GrimoireDocument` vers un format de fichier
+
+    Tous les backends sont construits de la même façon, avec le générateur qui
+    les utilise (seul le rendu PDF s'en sert pour sa mise en page).
+    """
+
+    format_name = ""
+    extension = ""
+
+    def __init__(self, generator=None):
+        self.generator = generator
+
+    @abstractmethod
+    def render(self, document: GrimoireDocument, output_path: str):
+        """Écrit le document dans `output_path`"""
+
+
+class PdfExporter(Exporter):
+    """Rendu PDF (ReportLab) via la mise en page du `SpellPDFGenerator`"""
+
+    format_name = "pdf"
+    extension = ".pdf"
+
+    def render(self, document: GrimoireDocument, output_path: str):
+        self.generator.render_pdf(document, output_path)
+
+
+class HtmlExporter(Exporter):
+    """Page HTML statique autonome : tableau des sorts puis fiches détaillées"""
+
+    format_name = "html"
+    extension = ".html"
+
+    def render(self, document: GrimoireDocument, output_path: str):
+        colors = {**DEFAULT_COLORS, **document.colors}
+        esc = html.escape
+        parts = [
+            "<!DOCTYPE html>",
+            '<html lang="fr">',
+            "<head>",
+            '<meta charset="utf-8">',
+            '<meta name="viewport" content="width=device-width, initial-scale=1">',
+            f"<title>{esc(document.title)}</title>",
+            "<style>",
+            f"body {{ font-family: Georgia, serif; color: {colors['body']}; max-width: 52rem; margin: 0 auto; padding: 1rem; }}",
+            f"h1, h3 {{ color: {colors['title']}; }}",
+            f"h2, th, .label {{ color: {colors['subtitle']}; }}",
+            "table { border-collapse: collapse; width: 100%; margin-bottom: 2rem; }",
+            "th, td { border-bottom: 1px solid #ccc; padding: 0.3rem 0.5rem; text-align: left; }",
+            ".spell { border-top: 1px solid #ccc; padding-top: 0.5rem; overflow: hidden; }",
+            ".spell img { float: right; width: 96px; height: 96px; margin-left: 1rem; }",
+            ".preparable { text-align: right; }",
+            "</style>",
+            "</head>",
+            "<body>",
+            f"<h1>{esc(document.title)}</h1>",
+            f'<p class="preparable">Préparable : {document.max_prepared}</p>',
+            "<table>",
+            "<thead><tr><th>Sort</th><th>Niveau</th><th>École</th><th>Rituel</th><th>Concentration</th>"
+            "<th>Temps</th><th>Portée</th></tr></thead>",
+            "<tbody>",
+        ]
+        for spell in document.spells():
+            parts.append(
+                f'<tr><td><a href="#{esc(spell.sanitized_name)}">{esc(spell.name)}</a></td><td>{spell.level}</td>'
+                f"<td>{esc(spell.school)}</td><td>{_yes_no(spell.ritual)}</td><td>{_yes_no(spell.concentration)}</td>"
+                f"<td>{esc(spell.casting_time or '-')}</td><td>{esc(spell.range_text)}</td></tr>"
+            )
+        parts += ["</tbody>", "</table>"]
+
+        for section in document.sections:
+            parts.append(f"<h2>{esc(section.title)}</h2>")
+            for spell in section.spells:
+                parts.append(f'<section class="spell" id="{esc(spell.sanitized_name)}">')
+                image = _relative_path(document.illustration(spell), output_path)
+                if image:
+                    parts.append(f'<img src="{esc(image)}" alt="">')
+                parts.append(f"<h3>{esc(spell.name)}</h3>")
+                parts.append(
+                    f"<p>{esc(spell.school)} · Rituel : {_yes_no(spell.ritual)} · "
+                    f"Temps : {esc(spell.casting_time or '-')} · Portée : {esc(spell.range_text)} · "
+                    f"Concentration : {_yes_no(spell.concentration)}</p>"
+                )
+                for label, value in _spell_details(spell):
+                    parts.append(f'<p><span class="label"><b>{label} :</b></span> {esc(value)}</p>')
+                parts.append(f"<p>{esc(spell.description)}</p>")
+                if spell.higher_levels:
+                    parts.append(f'<p><span class="label"><b>Effet en surcaste :</b></span> {esc(spell.higher_levels)}</p>')
+                parts.append("</section>")
+        parts += ["</body>", "</html>", ""]
+
+        with open(output_path, "w", encoding="utf-8") as f:
+            f.write("\n".join(parts))
+
+
+class MarkdownExporter(Exporter):
+    """Document Markdown : sommaire par niveau puis une section par sort"""
+
+    format_name = "md"
+    extension = ".md"
+
+    def render(self, document: GrimoireDocument, output_path: str):
+        lines = [f"# {document.title}", "", f"Préparable : {document.max_prepared}", ""]
+        for section in document.sections:
+            lines.append(f"- **{section.title}** : " + ", ".join(
+                ("(R) " if spell.ritual else "") + spell.name for spell in section.spells
+            ))
+        lines.append("")
+
+        for section in document.sections:
+            lines += [f"## {section.title}", ""]
+            for spell in section.spells:
+                lines += [f"### {spell.name}", ""]
+                image = _relative_path(document.illustration(spell), output_path)
+                if image:
+                    lines += [f"![{spell.name}]({image})", ""]
+                lines += [
+                    "| Niveau | École | Rituel | Temps | Portée | Concentration |",
+                    "|---|---|---|---|---|---|",
+                    "| " + " | ".join(_md_cell(value) for value in (
+                        spell.level, spell.school or "-", _yes_no(spell.ritual), spell.casting_time or "-",
+                        spell.range_text, _yes_no(spell.concentration),
+                    )) + " |",
+                    "",
+                ]
+                for label, value in _spell_details(spell):
+                    lines.append(f"**{label} :** {value}  ")
+                lines += ["", spell.description, ""]
+                if spell.higher_levels:
+                    lines += [f"**Effet en surcaste :** {spell.higher_levels}", ""]
+
+        with open(output_path, "w", encoding="utf-8") as f:
+            f.write("\n".join(lines))
+
+
+EXPORTERS: Dict[str, type] = {
+    "pdf": PdfExporter,
+    "html": HtmlExporter,
+    "md": MarkdownExporter,
+}
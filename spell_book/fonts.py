@@ -0,0 +1,121 @@
+import copy
+import os
+import threading
+from typing import Dict, Tuple
+
+from reportlab.pdfbase import pdfmetrics
+from reportlab.pdfbase.ttfonts import TTFont
+from reportlab.pdfgen.canvas import Canvas
+
+
+class FontRegistry:
+    """Registre des polices TrueType du processus.
+
+    Chaque fichier TTF n'est analysé qu'une seule fois, quel que soit le nombre
+    de générateurs créés, tant qu'il n'est pas modifié (date ou taille). Les polices sont enregistrées sous un nom propre au
+    thème (« Manuscrite-druide »...) : plusieurs thèmes peuvent ainsi coexister
+    dans un même processus sans écraser les polices les uns des autres, et ceux
+    qui partagent un fichier partagent aussi sa table de glyphes.
+    """
+
+    def __init__(self):
+        self._fonts: Dict[str, TTFont] = {}   # chemin absolu -> police analysée
+        self._names: Dict[str, str] = {}      # nom enregistré -> chemin absolu
+        self._signatures: Dict[str, Tuple[int, int]] = {}  # chemin absolu -> (date, taille) à l'analyse
+        self._lock = threading.Lock()
+        self.parsed = 0
+        self.reused = 0
+        # Statistiques de sous-ensemble par fichier de police, cumulées sur les documents produits
+        self.subsets: Dict[str, Dict[str, int]] = {}
+
+    @staticmethod
+    def font_name(role: str, namespace: str) -> str:
+        """Nom d'enregistrement d'une police pour un thème"""
+        return f"{role}-{namespace}"
+
+    def register(self, role: str, namespace: str, path: str) -> str:
+        """
+        Enregistre une police pour un thème, en réutilisant le fichier s'il a déjà été analysé
+
+        Args:
+            role: Rôle de la police ("Manuscrite", "TitreFont")
+            namespace: Espace de noms, en général le nom du thème
+            path: Chemin du fichier TTF
+
+        Returns:
+            Nom sous lequel la police est enregistrée dans ReportLab
+        """
+        name = self.font_name(role, namespace)
+        key = os.path.abspath(path)
+        stat = os.stat(key)
+        signature = (stat.st_mtime_ns, stat.st_size)
+        with self._lock:
+            if key in self._fonts and self._signatures[key] != signature:
+                self._forget(key)
+            if self._names.get(name) == key:
+                self.reused += 1
+                return name
+            base = self._fonts.get(key)
+            if base is None:
+                font = self._fonts[key] = TTFont(name, path)
+                self._signatures[key] = signature
+                self.parsed += 1
+            else:
+                # Même fichier sous un autre nom : ReportLab associe ce nom à la police
+                # déjà enregistrée pour la même face, sans relire le fichier
+                font = copy.copy(base)
+                font.fontName = name
+                self.reused += 1
+            pdfmetrics.registerFont(font)
+            self._names[name] = key
+        return name
+
+    def _forget(self, key: str):
+        """Oublie une police dont le fichier a changé, pour qu'elle soit relue et réenregistrée"""
+        font = self._fonts.pop(key)
+        del self._signatures[key]
+        self.subsets.pop(key, None)
+        # ReportLab ignore un nom déjà enregistré et associe une face connue à l'ancienne police
+        for name in [name for name, path in self._names.items() if path == key]:
+            del self._names[name]
+            pdfmetrics._fonts.pop(name, None)
+        if pdfmetrics._dynFaceNames.get(font.face.name) is font:
+            del pdfmetrics._dynFaceNames[font.face.name]
+
+    def record_document(self, doc):
+        """Cumule les glyphes intégrés dans un document PDF (à appeler avant son enregistrement)"""
+        with self._lock:
+            for path, font in self._fonts.items():
+                state = font.state.get(doc)
+                if state is None:
+                    continue
+                entry = self.subsets.setdefault(path, {"documents": 0, "glyphs": 0, "subsets": 0,
+                                                       "font_glyphs": font.face.numGlyphs})
+                entry["documents"] += 1
+                entry["glyphs"] += len(state.assignments)
+                entry["subsets"] += len(state.subsets)
+
+    def report(self, font_paths=None) -> str:
+        """Résumé des polices analysées et des glyphes intégrés par document"""
+        paths = None if font_paths is None else {os.path.abspath(path) for path in font_paths}
+        parts = [f"{self.parsed} police(s) analysée(s), {self.reused} réutilisée(s)"]
+        for path, entry in self.subsets.items():
+            if paths is not None and path not in paths:
+                continue
+            average = entry["glyphs"] / entry["documents"]
+            parts.append(f"{os.path.basename(path)} : {average:.0f}/{entry['font_glyphs']} glyphes intégrés "
+                         f"par document ({entry['documents']} document(s))")
+        return " ; ".join(parts)
+
+
+# Registre partagé par tous les générateurs du processus
+FONT_REGISTRY = FontRegistry()
+
+
+class FontStatsCanvas(Canvas):
+    """Canvas qui relève les sous-ensembles de polices du document juste avant son enregistrement
+    (ReportLab les libère en écrivant le fichier)"""
+
+    def save(self):
+        FONT_REGISTRY.record_document(self._doc)
+        super().save()
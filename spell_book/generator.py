@@ -1,49 +1,38 @@
 import os
 import json
-import requests
-from dotenv import load_dotenv
+import shutil
+from itertools import chain, islice
+from typing import Iterable, Iterator
 
-from reportlab.pdfgen import canvas
-from reportlab.lib.pagesizes import A5
 from reportlab.lib.units import cm
-from reportlab.pdfbase import pdfmetrics
-from reportlab.pdfbase.ttfonts import TTFont
 from reportlab.platypus import (
-    SimpleDocTemplate, Paragraph, Spacer, PageBreak, Table, TableStyle, Image
+    SimpleDocTemplate, Paragraph, Spacer, PageBreak, Table, Image
 )
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-from reportlab.lib.enums import TA_CENTER, TA_LEFT
-from reportlab.lib import colors
 
-from .illustrations import SpellIllustrationGenerator
 from .theme_manager import ThemeManager
 from .player_manager import PlayerManager
+from .corpus import SpellCorpus, default_spell_source
+from .spell import Spell
+from .render_model import GrimoireDocument, level_title
+from .exporters import EXPORTERS
+from .layout import PageLayout, Imposition, impose_cards
+from .fonts import FONT_REGISTRY, FontStatsCanvas
+from .styles import StyleBundle, SPACER_MEDIUM, SPACER_LARGE
+from .manifest import BuildManifest, file_hash, data_hash
+from .page_cache import SpellPageCache
+from .image_cache import IllustrationCache
+from .instrumentation import BuildInstrumentation, instrumented_build
+from .catalogue import SpellCatalogue
+from .pdf_utils import concat_pdfs_streaming, merge_pdfs
+from .streaming import DEFAULT_CHUNK_SIZE, StreamingDocTemplate
 from character_sheet.utils import sanitize_filename
 
-# Charger les variables d'environnement depuis le fichier .env
-load_dotenv()
-
-# Constantes de mise en page et style
-FONT_SIZE_TITLE = 20
-FONT_SIZE_SUBTITLE = 12
-FONT_SIZE_BODY = 11
-LINE_HEIGHT_BODY = 14
-
-COLOR_TITLE = colors.darkred
-COLOR_SUBTITLE = colors.slategrey
-COLOR_BODY = colors.black
-
-# Marges et espacements
-MARGIN_LEFT = 1.2 * cm
-MARGIN_RIGHT = 1.0 * cm
-MARGIN_TOP = 0.5 * cm
-MARGIN_BOTTOM = 1.0 * cm
-SPACER_SMALL = 5
-SPACER_MEDIUM = 7
-SPACER_LARGE = 9
 
 class SpellPDFGenerator:
-    def __init__(self, player: str = None, theme: str = None, output_dir: str = "pdf_sorts"):
+    def __init__(self, player: str = None, theme: str = None, output_dir: str = "pdf_sorts",
+                 corpus: SpellCorpus = None, page_cache: SpellPageCache = None,
+                 image_cache: IllustrationCache = None, instrumentation: BuildInstrumentation = None,
+                 catalogue: SpellCatalogue = None, layout: PageLayout = None):
         """
         Initialise le générateur de PDF de sorts
         
@@ -51,6 +40,12 @@ class SpellPDFGenerator:
             player: Nom du joueur (utilise sa configuration personnalisée)
             theme: Nom du thème à utiliser (si pas de joueur spécifique)
             output_dir: Dossier de sortie pour les PDFs
+            corpus: Corpus de sorts déjà chargé, partageable entre plusieurs générateurs
+            page_cache: Cache des pages de sorts rendues, pour les constructions incrémentales
+            image_cache: Cache des illustrations réduites à la résolution d'impression
+            instrumentation: Chronomètres et profilage des étapes de génération
+            catalogue: Catalogue SQLite synchronisé, utilisé comme source de sorts par défaut
+            layout: Format de page et marges (A5 et marges historiques par défaut)
         """
         if not player and not theme:
             raise ValueError("Vous devez spécifier soit un joueur soit un thème. Exemple: SpellPDFGenerator(player='bastian') ou SpellPDFGenerator(theme='necromancien')")
@@ -58,6 +53,17 @@ class SpellPDFGenerator:
         self.output_dir = output_dir
         os.makedirs(output_dir, exist_ok=True)
         
+        # Corpus de sorts (chargé à la demande si non fourni)
+        self.corpus = corpus
+        self.catalogue = catalogue
+        self._corpora = {}
+        self._selection = None
+        self._font_hashes = {}
+        self.page_cache = page_cache
+        self.image_cache = image_cache
+        self.instrumentation = instrumentation if instrumentation is not None else BuildInstrumentation()
+        self.layout = layout if layout is not None else PageLayout()
+        
         # Mode joueur spécifique (priorité la plus haute)
         if player:
             self.player = PlayerManager(player)
@@ -76,34 +82,32 @@ class SpellPDFGenerator:
             self._setup_theme_colors()
         
         # Enregistrement des polices
-        self._register_fonts()
+        with self.instrumentation.stage("fonts"):
+            self._register_fonts()
+        
+        # Styles de paragraphes et de tableaux, construits une fois par thème et réutilisés
+        with self.instrumentation.stage("styles"):
+            self.styles = StyleBundle.for_theme(self.font_name, self.font_name_title, self.theme_colors)
     
     def _setup_theme_colors(self):
-        """Configure les couleurs selon le thème"""
-        theme_colors = self.theme.get_colors()
+        """Détermine les couleurs du thème, avec les surcharges du joueur (sans modifier la configuration)"""
+        theme_colors = dict(self.theme.get_colors())
         
         # Appliquer les surcharges du joueur si applicable
         if self.player:
-            custom_colors = self.player.get_custom_overrides().get("colors", {})
-            theme_colors.update(custom_colors)
-        
-        # Convertir les couleurs hex en objets Color de ReportLab
-        global COLOR_TITLE, COLOR_SUBTITLE, COLOR_BODY
-        COLOR_TITLE = colors.toColor(theme_colors.get("title", "#8B0000"))
-        COLOR_SUBTITLE = colors.toColor(theme_colors.get("subtitle", "#2F4F4F"))
-        COLOR_BODY = colors.toColor(theme_colors.get("body", "#000000"))
+            theme_colors.update(self.player.get_custom_overrides().get("colors", {}))
+        self.theme_colors = theme_colors
     
 
     def _register_fonts(self):
-        """Enregistre les polices utilisées"""
+        """Enregistre les polices utilisées, sous des noms propres au thème (fichiers analysés une seule fois)"""
+        namespace = self.theme.theme_name
         try:
             # Police du corps de texte
-            pdfmetrics.registerFont(TTFont("Manuscrite", self.font_path))
-            self.font_name = "Manuscrite"
+            self.font_name = FONT_REGISTRY.register("Manuscrite", namespace, self.font_path)
             
             # Police du titre
-            pdfmetrics.registerFont(TTFont("TitreFont", self.font_path_title))
-            self.font_name_title = "TitreFont"
+            self.font_name_title = FONT_REGISTRY.register("TitreFont", namespace, self.font_path_title)
         except Exception as e:
             print(f"Erreur lors de l'enregistrement des polices: {e}")
             # Fallback vers les polices par défaut
@@ -122,128 +126,165 @@ class SpellPDFGenerator:
             if file.endswith(".json"):
                 self.generate_from_file(os.path.join(folder_path, file))
 
-    def generate_compiled_pdf(self, folder_path: str, output_path: str = "grimoire_complet.pdf"):
-        styles = getSampleStyleSheet()
-        styles.add(ParagraphStyle(name='Titre', fontName=self.font_name_title, fontSize=FONT_SIZE_TITLE, alignment=TA_CENTER, spaceAfter=SPACER_LARGE, textColor=COLOR_TITLE))
-        styles.add(ParagraphStyle(name='SousTitre', fontName=self.font_name, fontSize=FONT_SIZE_SUBTITLE, alignment=TA_LEFT, spaceAfter=SPACER_SMALL, textColor=COLOR_SUBTITLE))
-        styles.add(ParagraphStyle(name='Corps', fontName=self.font_name, fontSize=FONT_SIZE_BODY, alignment=TA_LEFT, leading=LINE_HEIGHT_BODY, textColor=COLOR_BODY))
+    @instrumented_build
+    def generate_compiled_pdf(self, folder_path, output_path: str = "grimoire_complet.pdf"):
+        styles = self._grimoire_styles()
+
+        records = self._select_spells(folder_path)
+        self._prepare_illustrations(records)
 
         story = []
-        fichiers = sorted(os.listdir(folder_path))
-
-        for file in fichiers:
-            if not file.endswith(".json") or file == "index.json":
-                continue
-            with open(os.path.join(folder_path, file), encoding='utf-8') as f:
-                data = json.load(f)
-                if isinstance(data, list):
-                    for spell in data:
-                        # Vérifier si le sort doit être inclus selon la configuration joueur/thème
-                        nom_sort = spell.get("Nom", "Sort inconnu")
-                        if self.player and not self.player.should_include_spell(sanitize_filename(nom_sort)):
-                            continue
-                        elif self.theme and not self.theme.should_include_spell(nom_sort):
-                            continue
-                        self._append_spell_to_story(spell, story, styles)
-                else:
-                    # Vérifier si le sort doit être inclus selon la configuration joueur/thème
-                    nom_sort = data.get("Nom", "Sort inconnu")
-                    if self.player and not self.player.should_include_spell(sanitize_filename(nom_sort)):
-                        continue
-                    elif self.theme and not self.theme.should_include_spell(nom_sort):
-                        continue
-                    self._append_spell_to_story(data, story, styles)
-
-        doc = SimpleDocTemplate(output_path, pagesize=A5,
-                                leftMargin=MARGIN_LEFT, rightMargin=MARGIN_RIGHT,
-                                topMargin=MARGIN_TOP, bottomMargin=MARGIN_BOTTOM)
-        doc.build(story)
-
-    def _append_spell_to_story(self, spell: dict, story: list, styles):
-        titre = spell.get("Nom", "Sort inconnu")
+        for record in records:
+            self._append_spell_to_story(record, story, styles)
+
+        self._build_document(story, output_path)
+
+    def _load_corpus(self, source) -> SpellCorpus:
+        """Retourne le corpus d'une source (dossier, fichier JSONL, archive zip, liste de sources ou SpellCorpus), chargé une seule fois"""
+        if isinstance(source, SpellCorpus):
+            return source
+        if isinstance(source, list):
+            source = tuple(source)
+        if self.corpus is not None and self.corpus.folder_path == source:
+            return self.corpus
+        if source not in self._corpora:
+            with self.instrumentation.stage("load"):
+                self._corpora[source] = SpellCorpus.load(source)
+            self.instrumentation.count("spells_loaded", len(self._corpora[source]))
+        return self._corpora[source]
+
+    def _default_source(self):
+        """Source de sorts par défaut : le catalogue ou le corpus fourni, sinon le dossier fiches_sorts (ou son archive)"""
+        if self.catalogue is not None:
+            return self.catalogue
+        return self.corpus if self.corpus is not None else default_spell_source()
+
+    def _select_spells(self, source) -> list[Spell]:
+        """Retourne les sorts du corpus retenus pour ce joueur/thème (filtrage mis en cache)"""
+        if isinstance(source, SpellCatalogue):
+            return self._select_from_catalogue(source)
+        corpus = self._load_corpus(source)
+        if self._selection is not None and self._selection[0] is corpus:
+            return self._selection[1]
+
+        selected = []
+        with self.instrumentation.stage("filter"):
+            for record in corpus:
+                # Vérifier si le sort doit être inclus selon la configuration joueur/thème
+                if self.player and not self.player.should_include_spell(record.sanitized_name):
+                    continue
+                elif self.theme and not self.theme.should_include_spell(record.name):
+                    continue
+                selected.append(record)
+        self._selection = (corpus, selected)
+        return selected
+
+    def _select_from_catalogue(self, catalogue: SpellCatalogue) -> list[Spell]:
+        """Sélectionne les sorts par requêtes indexées sur le catalogue SQLite"""
+        if self._selection is not None and self._selection[0] is catalogue:
+            return self._selection[1]
+
+        # Mêmes règles que should_include_spell : liste du joueur puis filtre du thème
+        known_spells = self.player.get_known_spells() if self.player else None
+        with self.instrumentation.stage("filter"):
+            selected = catalogue.select(
+                known_spells=known_spells or None,
+                name_filters=self.theme.get_spell_filter() if self.theme else None,
+            )
+        self._selection = (catalogue, selected)
+        return selected
+
+    def _spells_by_level(self, source) -> dict[int, list[Spell]]:
+        """Regroupe les sorts retenus par niveau, triés par nom"""
+        sorts_par_niveau = {}
+        for record in self._select_spells(source):
+            sorts_par_niveau.setdefault(record.level, []).append(record)
+        return {
+            niveau: sorted(sorts_par_niveau[niveau], key=lambda r: r.name)
+            for niveau in sorted(sorts_par_niveau.keys())
+        }
+
+    def _prepare_illustrations(self, records: list[Spell], max_workers: int = 4):
+        """Génère en lot, avant la mise en page, les illustrations manquantes des sorts"""
+        missing = [
+            record for record in records
+            if not os.path.exists(f"{self.illustrations_folder}/{record.sanitized_name}.png")
+        ]
+        if not missing:
+            return
+
+        # Le fichier .env n'est lu que si des illustrations sont à générer
+        from dotenv import load_dotenv
+        load_dotenv()
+        api_key = os.getenv("OPENAI_API_KEY")
+        if not api_key:
+            return
+        missing = [record.to_dict() for record in missing]
+        from character_sheet.response_cache import ResponseCache
+        from .illustrations import SpellIllustrationGenerator
+        illustrateur = SpellIllustrationGenerator(
+            api_key=api_key,
+            output_dir=self.illustrations_folder,
+            theme_manager=self.theme,
+            response_cache=ResponseCache()
+        )
+        with self.instrumentation.stage("illustrations"):
+            illustrateur.generate_missing_illustrations(missing, max_workers=max_workers)
+        self.instrumentation.count("illustrations_requested", len(missing))
+
+    def _append_spell_to_story(self, spell: Spell, story: list, styles):
+        with self.instrumentation.spell(spell.name), self.instrumentation.stage("story_spells"):
+            self._append_spell_flowables(spell, story, styles)
+        self.instrumentation.count("spells_rendered")
+
+    def _append_spell_flowables(self, spell: Spell, story: list, styles):
+        titre = spell.name
         
         # Vérifier si une illustration existe déjà
-        spell_name_clean = sanitize_filename(titre)
-        image_path = f"{self.illustrations_folder}/{spell_name_clean}.png"
-        
-        # Utiliser l'illustration existante si elle existe
-        if os.path.exists(image_path):
-            print(f"✔ Illustration existante utilisée pour '{titre}': {image_path}")
-        # Sinon, générer une illustration seulement si la clé API est disponible
-        elif os.getenv("OPENAI_API_KEY"):
-            try:
-                # Utiliser le bon dossier de destination selon le thème
-                output_dir = self.illustrations_folder
-                
-                # Obtenir le style d'illustration selon le thème
-                if self.theme:
-                    illustration_style = self.theme.get_illustration_style()
-                else:
-                    illustration_style = "fantasy art"
-                
-                illustrateur = SpellIllustrationGenerator(
-                    api_key=os.getenv("OPENAI_API_KEY"), 
-                    output_dir=output_dir,
-                    theme_manager=self.theme
-                )
-                image_path = illustrateur.generate_illustration(spell["Nom"], spell.get("Description complète", ""))
-                illustrateur.generate_large_illustration(spell["Nom"], spell.get("Description complète", ""))
-                print(f"🎨 Illustration générée pour '{titre}': {image_path}")
-            except Exception as e:
-                print(f"❌ Impossible de générer l'illustration pour {titre}: {e}")
+        with self.instrumentation.stage("illustration_lookup"):
+            image_path = f"{self.illustrations_folder}/{spell.sanitized_name}.png"
+            
+            # Les illustrations manquantes sont générées en amont par _prepare_illustrations
+            if os.path.exists(image_path):
+                print(f"✔ Illustration existante utilisée pour '{titre}': {image_path}")
+                image_path = self._get_image_cache().get(image_path, 90, 90)
+                self.instrumentation.count("illustrations_found")
+            else:
+                print(f"⚠ Pas d'illustration disponible pour '{titre}'")
                 image_path = None
-        else:
-            print(f"⚠ Pas d'illustration disponible pour '{titre}' (pas de clé API)")
-            image_path = None
+                self.instrumentation.count("illustrations_missing")
 
         title_para = Paragraph(titre, styles["Titre"])
-        if image_path and os.path.exists(image_path):
+        if image_path:
             img = Image(image_path, width=90, height=90)
-            title_table = Table([[title_para, img]], colWidths=[None, 2.5*cm])
-            title_table.setStyle(TableStyle([
-                ("VALIGN", (0, 0), (0, 0), "MIDDLE"),
-                ("ALIGN", (0, 0), (0, 0), "RIGHT"),
-                ("VALIGN", (1, 0), (1, 0), "TOP"),
-                ("ALIGN", (1, 0), (1, 0), "RIGHT"),
-            ]))
+            title_table = Table([[title_para, img]], colWidths=[None, self._width(2.5*cm)])
+            title_table.setStyle(styles.title_with_image)
         else:
-            title_table = Table([[title_para]], colWidths=[10.5*cm])
+            title_table = Table([[title_para]], colWidths=[self._width(10.5*cm)])
 
         story.append(title_table)
         story.append(Spacer(1, SPACER_MEDIUM))
 
-        portee = spell.get("Portée", "-")
-        if isinstance(portee, int) or (isinstance(portee, str) and portee.isdigit()):
-            portee = f"{portee} mètres"
-
         headers = ["Niveau", "École", "Rituel"]
-        values1 = [spell.get("Niveau", "-"), spell.get("École", "-"), spell.get("Rituel", "-")]
+        values1 = [spell.level, spell.school or "-", "Oui" if spell.ritual else "Non"]
         headers2 = ["Temps", "Portée", "Concentration"]
-        values2 = [spell.get("Temps d'incantation", "-"), portee, "Oui" if spell.get("Concentration") else "Non"]
+        values2 = [spell.casting_time or "-", spell.range_text, "Oui" if spell.concentration else "Non"]
 
         table_data = [headers, values1, headers2, values2]
-        table = Table(table_data, colWidths=[5*cm]*3)
-        table.setStyle(TableStyle([
-            ('TEXTCOLOR', (0, 0), (-1, 0), colors.slategrey),
-            ('TEXTCOLOR', (0, 2), (-1, 2), colors.slategrey),
-            ('FONTNAME', (0, 0), (-1, -1), self.font_name),
-            ('FONTSIZE', (0, 0), (-1, -1), 10),
-            ('BOTTOMPADDING', (0, 0), (-1, -1), 6),
-            ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-            ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
-        ]))
+        table = Table(table_data, colWidths=[self._width(5*cm)]*3)
+        table.setStyle(styles.spell_stats)
         story.append(table)
         story.append(Spacer(1, SPACER_LARGE))
 
-        self._ajouter_info(story, "Type", spell.get("Type d'attaque / sauvegarde"), styles)
-        self._ajouter_info(story, "Cible", spell.get("Cible"), styles)
-        self._ajouter_info(story, "Composantes", spell.get("Composantes"), styles)
+        self._ajouter_info(story, "Type", spell.attack_save, styles)
+        self._ajouter_info(story, "Cible", spell.target, styles)
+        self._ajouter_info(story, "Composantes", spell.components, styles)
 
         story.append(Spacer(1, SPACER_MEDIUM))
         story.append(Paragraph("<b>Description :</b>", styles["SousTitre"]))
-        story.append(Paragraph(spell.get("Description complète", ""), styles["Corps"]))
+        story.append(Paragraph(spell.description, styles["Corps"]))
 
-        effet_surcaste = spell.get("Effet en surcaste")
+        effet_surcaste = spell.higher_levels
         if effet_surcaste:
             story.append(Spacer(1, SPACER_MEDIUM))
             story.append(Paragraph("<b>Effet en surcaste :</b>", styles["SousTitre"]))
@@ -251,36 +292,10 @@ class SpellPDFGenerator:
 
         story.append(PageBreak())
 
-    def generate_table_of_contents(self, folder_path: str, output_path: str = "sommaire_grimoire.pdf"):
+    @instrumented_build
+    def generate_table_of_contents(self, folder_path, output_path: str = "sommaire_grimoire.pdf"):
         """Génère une page de sommaire avec la liste des sorts organisée par niveau"""
-        styles = getSampleStyleSheet()
-        
-        # Styles personnalisés pour le sommaire
-        styles.add(ParagraphStyle(
-            name='TitreSommaire', 
-            fontName=self.font_name_title, 
-            fontSize=24, 
-            alignment=TA_CENTER, 
-            spaceAfter=20, 
-            textColor=COLOR_TITLE
-        ))
-        styles.add(ParagraphStyle(
-            name='NiveauHeader', 
-            fontName=self.font_name, 
-            fontSize=16, 
-            alignment=TA_LEFT, 
-            spaceAfter=8, 
-            spaceBefore=15,
-            textColor=COLOR_SUBTITLE
-        ))
-        styles.add(ParagraphStyle(
-            name='SortEntry', 
-            fontName=self.font_name, 
-            fontSize=11, 
-            alignment=TA_LEFT, 
-            spaceAfter=2,
-            textColor=COLOR_BODY
-        ))
+        styles = self._grimoire_styles()
 
         story = []
         
@@ -288,219 +303,420 @@ class SpellPDFGenerator:
         story.append(Paragraph("Sommaire du Grimoire", styles["TitreSommaire"]))
         story.append(Spacer(1, 15))
 
-        # Lire tous les sorts et les organiser (avec filtrage)
-        sorts_par_niveau = {}
-        fichiers = [f for f in os.listdir(folder_path) if f.endswith(".json") and f != "index.json"]
-        
-        for file in fichiers:
-            with open(os.path.join(folder_path, file), encoding='utf-8') as f:
-                data = json.load(f)
-                # Gestion des fichiers contenant une liste ou un seul sort
-                sorts = data if isinstance(data, list) else [data]
-                
-                for spell in sorts:
-                    # Filtrer les sorts selon le joueur/thème AVANT de les organiser
-                    nom_sort = spell.get("Nom", "Sort inconnu")
-                    if self.player and not self.player.should_include_spell(sanitize_filename(nom_sort)):
-                        continue
-                    elif self.theme and not self.theme.should_include_spell(nom_sort):
-                        continue
-                    
-                    niveau = spell.get("Niveau", 0)
-                    if niveau not in sorts_par_niveau:
-                        sorts_par_niveau[niveau] = []
-                    sorts_par_niveau[niveau].append(spell)
-
-        # Trier les sorts par niveau, puis par nom
-        for niveau in sorted(sorts_par_niveau.keys()):
-            sorts_par_niveau[niveau].sort(key=lambda x: x.get("Nom", ""))
+        # Sorts filtrés et organisés par niveau, puis par nom
+        sorts_par_niveau = self._spells_by_level(folder_path)
 
         # Générer le contenu du sommaire
         for niveau in sorted(sorts_par_niveau.keys()):
             # En-tête de niveau
-            niveau_text = f"Niveau {niveau}" if niveau > 0 else "Tours de magie"
+            niveau_text = level_title(niveau)
             story.append(Paragraph(f"<b>{niveau_text}</b>", styles["NiveauHeader"]))
             
             # Liste des sorts pour ce niveau
             table_data = []
-            for spell in sorts_par_niveau[niveau]:
-                nom_sort = spell.get("Nom", "Sort inconnu")
-                rituel = spell.get("Rituel", "Non")
-                
+            for record in sorts_par_niveau[niveau]:
                 # Détermine le symbole : case vide, R pour rituel
-                if rituel.lower() in ["oui", "yes", "true"]:
+                if record.ritual:
                     symbole = "R"
                 else:
                     symbole = "☐"  # Case à cocher vide
                 
                 # Créer une ligne du tableau
-                table_data.append([symbole, nom_sort])
+                table_data.append([symbole, record.name])
             
             if table_data:
                 # Créer le tableau pour ce niveau
-                table = Table(table_data, colWidths=[0.8*cm, 12*cm])
-                table.setStyle(TableStyle([
-                    ('FONTNAME', (0, 0), (0, -1), self.font_name_title),  # Police titre pour les symboles
-                    ('FONTNAME', (1, 0), (1, -1), self.font_name),        # Police manuscrite pour les noms
-                    ('FONTSIZE', (0, 0), (-1, -1), 11),
-                    ('ALIGN', (0, 0), (0, -1), 'CENTER'),  # Centrer les symboles
-                    ('ALIGN', (1, 0), (1, -1), 'LEFT'),    # Aligner les noms à gauche
-                    ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
-                    ('LEFTPADDING', (0, 0), (-1, -1), 3),
-                    ('RIGHTPADDING', (0, 0), (-1, -1), 3),
-                    ('TOPPADDING', (0, 0), (-1, -1), 2),
-                    ('BOTTOMPADDING', (0, 0), (-1, -1), 2),
-                ]))
+                table = Table(table_data, colWidths=[self._width(0.8*cm), self._width(12*cm)])
+                table.setStyle(styles.toc_level)
                 story.append(table)
                 story.append(Spacer(1, 10))
 
         # Créer le PDF
-        doc = SimpleDocTemplate(output_path, pagesize=A5,
-                                leftMargin=MARGIN_LEFT, rightMargin=MARGIN_RIGHT,
-                                topMargin=MARGIN_TOP, bottomMargin=MARGIN_BOTTOM)
-        doc.build(story)
+        self._write_document(story, output_path)
         print(f"Sommaire généré : {output_path}")
 
-    def generate_grimoire_with_table_of_contents(self, folder_path: str, output_path: str = "grimoire_avec_sommaire.pdf"):
+    @instrumented_build
+    def generate_grimoire_with_table_of_contents(self, folder_path, output_path: str = "grimoire_avec_sommaire.pdf"):
         """Génère un grimoire complet avec sommaire intégré en première page"""
-        styles = getSampleStyleSheet()
-        styles.add(ParagraphStyle(name='Titre', fontName=self.font_name_title, fontSize=FONT_SIZE_TITLE, alignment=TA_CENTER, spaceAfter=SPACER_LARGE, textColor=COLOR_TITLE))
-        styles.add(ParagraphStyle(name='SousTitre', fontName=self.font_name, fontSize=FONT_SIZE_SUBTITLE, alignment=TA_LEFT, spaceAfter=SPACER_SMALL, textColor=COLOR_SUBTITLE))
-        styles.add(ParagraphStyle(name='Corps', fontName=self.font_name, fontSize=FONT_SIZE_BODY, alignment=TA_LEFT, leading=LINE_HEIGHT_BODY, textColor=COLOR_BODY))
-        
-        # Styles pour le sommaire
-        styles.add(ParagraphStyle(
-            name='TitreSommaire', 
-            fontName=self.font_name_title, 
-            fontSize=24, 
-            alignment=TA_CENTER, 
-            spaceAfter=20, 
-            textColor=COLOR_TITLE
-        ))
-        styles.add(ParagraphStyle(
-            name='NiveauHeader', 
-            fontName=self.font_name, 
-            fontSize=16, 
-            alignment=TA_LEFT, 
-            spaceAfter=8, 
-            spaceBefore=15,
-            textColor=COLOR_SUBTITLE
-        ))
-        styles.add(ParagraphStyle(
-            name='SortsPreparesStyle', 
-            fontName=self.font_name, 
-            fontSize=12, 
-            alignment=TA_CENTER, 
-            spaceAfter=8,
-            textColor=colors.darkblue
-        ))
+        document = self.build_render_model(folder_path)
+        self.render_pdf(document, output_path)
+        print(f"Grimoire avec sommaire généré : {output_path}")
+
+    @instrumented_build
+    def generate_grimoire_streaming(self, folder_path, output_path: str = "grimoire_avec_sommaire.pdf",
+                                    chunk_size: int = DEFAULT_CHUNK_SIZE):
+        """
+        Génère le grimoire avec sommaire sans jamais construire tout le récit en mémoire
+
+        Les flowables de chaque sort sont produits à la demande, niveau par
+        niveau, pendant la mise en page (voir StreamingDocTemplate). Le grimoire
+        est écrit en parties de `chunk_size` sorts, fusionnées à la fin : la
+        mémoire du document ReportLab (pages déjà rendues, polices) ne dépend
+        que de la taille d'une partie. En un seul document (chunk_size None),
+        elle croît avec le nombre de pages, moins vite qu'avec le récit complet.
+
+        Args:
+            folder_path: Source des sorts
+            output_path: Chemin du PDF
+            chunk_size: Sorts par partie (un seul document si None ou 0)
+        """
+        document = self.build_render_model(folder_path)
+        self.render_pdf_streaming(document, output_path, chunk_size)
+        print(f"Grimoire avec sommaire généré : {output_path}")
 
+    def build_render_model(self, source) -> GrimoireDocument:
+        """Construit le modèle de rendu du grimoire (sorts filtrés, triés et illustrés) une seule fois"""
+        # Sorts filtrés et organisés par niveau, puis par nom
+        sorts_par_niveau = self._spells_by_level(source)
+        self._prepare_illustrations(self._select_spells(source))
+        grimoire_title, max_spells = self._grimoire_heading()
+        with self.instrumentation.stage("render_model"):
+            return GrimoireDocument.build(grimoire_title, max_spells, self.theme.theme_name, self.theme_colors,
+                                          sorts_par_niveau, self.illustrations_folder)
+
+    def render_pdf(self, document: GrimoireDocument, output_path: str):
+        """Rend un modèle de grimoire en PDF : sommaire puis une page par sort"""
+        styles = self._grimoire_styles()
         story = []
         
         # === GÉNÉRATION DU SOMMAIRE ===
+        with self.instrumentation.stage("toc"):
+            self._append_grimoire_toc(story, document, styles)
+
+        # === GÉNÉRATION DES FICHES DE SORTS ===
+        for record in document.spells():
+            self._append_spell_to_story(record, story, styles)
+
+        # Construire le PDF final
+        self._build_document(story, output_path)
+
+    def render_pdf_streaming(self, document: GrimoireDocument, output_path: str, chunk_size: int = None):
+        """Rend un modèle de grimoire en PDF par flux de sorts, en un seul document ou en parties fusionnées"""
+        styles = self._grimoire_styles()
+        spells = document.spells()
+
+        if not chunk_size:
+            with self.instrumentation.stage("doc_build"):
+                self._write_document_stream(chain(self._toc_chunk(document, styles),
+                                                  self._spell_chunks(spells, styles)), output_path)
+        else:
+            parts_dir = os.path.join(self._build_dir(output_path), "parties")
+            os.makedirs(parts_dir, exist_ok=True)
+            parts = []
+            while True:
+                records = list(islice(spells, chunk_size))
+                if not records and parts:
+                    break
+                part_path = os.path.join(parts_dir, f"partie_{len(parts):05d}.pdf")
+                # Le sommaire ouvre la première partie
+                head = self._toc_chunk(document, styles) if not parts else []
+                with self.instrumentation.stage("doc_build"):
+                    self._write_document_stream(chain(head, self._spell_chunks(records, styles)), part_path)
+                parts.append(part_path)
+            with self.instrumentation.stage("merge"):
+                concat_pdfs_streaming(parts, output_path)
+            shutil.rmtree(parts_dir, ignore_errors=True)
+            self.instrumentation.count("pdf_parts", len(parts))
+        self._report_output_size(output_path)
+
+    def _toc_chunk(self, document: GrimoireDocument, styles) -> Iterator[list]:
+        """Produit le sommaire au moment de sa mise en page (aucune référence gardée ensuite)"""
+        story = []
+        with self.instrumentation.stage("toc"):
+            self._append_grimoire_toc(story, document, styles)
+        yield story
+
+    def _spell_chunks(self, records: Iterable[Spell], styles) -> Iterator[list]:
+        """Produit à la demande les flowables de chaque sort, un paquet par sort"""
+        for record in records:
+            story = []
+            self._append_spell_to_story(record, story, styles)
+            yield story
+
+    @instrumented_build
+    def export_grimoire(self, output_base: str, formats=("pdf", "html", "md"), source=None) -> dict:
+        """
+        Exporte le grimoire dans plusieurs formats en une seule passe
+
+        Le corpus est lu, filtré et trié une seule fois ; chaque backend rend
+        ensuite le même modèle de document.
+
+        Args:
+            output_base: Chemin de sortie sans extension (ex: grimoires/bastian)
+            formats: Formats à produire parmi "pdf", "html" et "md"
+            source: Source des sorts (source par défaut du générateur si None)
+
+        Returns:
+            Dictionnaire format -> chemin du fichier produit
+        """
+        unknown = [name for name in formats if name not in EXPORTERS]
+        if unknown:
+            raise ValueError(f"Format(s) inconnu(s) : {', '.join(unknown)} (disponibles : {', '.join(EXPORTERS)})")
+
+        document = self.build_render_model(source if source is not None else self._default_source())
+        outputs = {}
+        for name in formats:
+            exporter = EXPORTERS[name](self)
+            output_path = output_base + exporter.extension
+            directory = os.path.dirname(output_path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            with self.instrumentation.stage(f"export_{name}"):
+                exporter.render(document, output_path)
+            outputs[name] = output_path
+            print(f"📄 Export {name.upper()} : {output_path}")
+        return outputs
+
+    @instrumented_build
+    def generate_spell_cards(self, output_path: str, imposition: Imposition = None, source=None) -> int:
+        """
+        Imprime les fiches de sorts à plusieurs par feuille (2 ou 4 par A4), avec traits de coupe
+
+        Chaque fiche garde la mise en page d'une page du grimoire (format
+        `layout`) et est réduite pour tenir dans sa cellule.
+
+        Args:
+            output_path: Chemin du PDF à imprimer
+            imposition: Nombre de fiches par feuille, format de feuille et traits de coupe (2 par A4 par défaut)
+            source: Source des sorts (source par défaut du générateur si None)
+
+        Returns:
+            Nombre de feuilles produites
+        """
+        imposition = imposition if imposition is not None else Imposition()
+        document = self.build_render_model(source if source is not None else self._default_source())
+        styles = self._grimoire_styles()
+        cards = []
+        for record in document.spells():
+            card = []
+            self._append_spell_to_story(record, card, styles)
+            cards.append(card)
+
+        with self.instrumentation.stage("imposition"):
+            sheets = impose_cards(cards, output_path, self.layout, imposition)
+        self._report_output_size(output_path)
+        print(f"🖨️  {len(cards)} fiches imposées sur {sheets} feuilles ({imposition.cards_per_sheet} par feuille) : {output_path}")
+        return sheets
+
+    @instrumented_build
+    def generate_grimoire_incremental(self, folder_path, output_path: str = "grimoire_avec_sommaire.pdf") -> bool:
+        """
+        Génère le grimoire en ne reconstruisant que ce qui a changé
+
+        Les pages de sorts proviennent du cache de pages (partagé entre joueurs de
+        même apparence) et seules les pages absentes du cache sont rendues. Le
+        sommaire est toujours régénéré, puis concaténé avec les pages en cache.
+        Un manifeste des empreintes d'entrée permet d'ignorer un grimoire inchangé.
+
+        Returns:
+            False si le grimoire était déjà à jour (aucune reconstruction), True sinon
+        """
+        build_dir = self._build_dir(output_path)
+        os.makedirs(build_dir, exist_ok=True)
+        manifest = BuildManifest(os.path.join(build_dir, "manifest.json"))
+
+        document = self.build_render_model(folder_path)
+        records = list(document.spells())
+        inputs, spell_hashes = self._build_fingerprint(records)
+
+        if manifest.is_up_to_date(output_path, inputs, spell_hashes):
+            print(f"⏭️  Grimoire à jour, reconstruction ignorée : {output_path}")
+            return False
+
+        changed = sum(1 for name, h in spell_hashes.items() if manifest.spell_changed(name, h))
+        cache = self._get_page_cache()
+        misses_before = cache.misses
+        styles = self._grimoire_styles()
+        pages = []
+        for record in records:
+            def render(path, record=record):
+                story = []
+                self._append_spell_to_story(record, story, styles)
+                story.pop()  # Pas de saut de page final dans une page isolée
+                with self.instrumentation.stage("doc_build"):
+                    self._write_document(story, path)
+            pages.append(cache.get_or_render(self._page_key(record), render))
+
+        toc_path = os.path.join(build_dir, "sommaire.pdf")
+        story = []
+        with self.instrumentation.stage("toc"):
+            self._append_grimoire_toc(story, document, styles)
+            story.pop()
+            self._write_document(story, toc_path)
+
+        with self.instrumentation.stage("merge"):
+            merge_pdfs([toc_path] + pages, output_path)
+        manifest.update(output_path, inputs, spell_hashes)
+        cache.evict()
+        rendered = cache.misses - misses_before
+        self.instrumentation.count("page_cache_misses", rendered)
+        self.instrumentation.count("page_cache_hits", len(records) - rendered)
+        self._report_output_size(output_path)
+        print(f"Grimoire avec sommaire généré : {output_path} "
+              f"({changed} sorts modifiés, {rendered}/{len(records)} pages rendues)")
+        return True
+
+    def _get_page_cache(self) -> SpellPageCache:
+        """Cache des pages rendues (par défaut dans <output_dir>/.cache/pages)"""
+        if self.page_cache is None:
+            self.page_cache = SpellPageCache(os.path.join(self.output_dir, ".cache", "pages"))
+        return self.page_cache
+
+    def _page_key(self, record: Spell) -> str:
+        """Clé de cache d'une page : sort, thème, couleurs effectives, polices et réglages d'image"""
+        return SpellPageCache.make_key(
+            self._spell_hash(record),
+            self.theme.theme_name,
+            self.theme_colors,
+            [self._font_hash(self.font_path), self._font_hash(self.font_path_title), self.font_name, self.font_name_title],
+            extra=self._get_image_cache().settings_key() + self.layout.key(),
+        )
+
+    def _font_hash(self, path: str) -> str:
+        """Empreinte d'une police, mémorisée tant que sa taille et sa date sont inchangées"""
+        if not path or not os.path.exists(path):
+            return file_hash(path)
+        stat = os.stat(path)
+        memo_key = (os.path.abspath(path), stat.st_mtime_ns, stat.st_size)
+        if memo_key not in self._font_hashes:
+            self._font_hashes[memo_key] = file_hash(path)
+        return self._font_hashes[memo_key]
+
+    def _get_image_cache(self) -> IllustrationCache:
+        """Cache des illustrations réduites (par défaut dans <output_dir>/.cache/illustrations)"""
+        if self.image_cache is None:
+            self.image_cache = IllustrationCache(os.path.join(self.output_dir, ".cache", "illustrations"))
+        return self.image_cache
+
+    def _build_document(self, story: list, output_path: str):
+        """Construit un PDF de grimoire et affiche le gain de taille des illustrations"""
+        with self.instrumentation.stage("doc_build"):
+            self._write_document(story, output_path)
+        self._report_output_size(output_path)
+
+    def _report_output_size(self, output_path: str):
+        """Affiche la taille du PDF et celle des illustrations intégrées depuis le dernier rapport"""
+        image_cache = self._get_image_cache()
+        print(f"📦 {output_path} : {os.path.getsize(output_path) / 1024:.0f} Ko ({image_cache.report()})")
+        print(f"🔤 {FONT_REGISTRY.report((self.font_path, self.font_path_title))}")
+        image_cache.reset_stats()
+
+    def stale_reason(self, output_path: str, source=None) -> str:
+        """
+        Indique, sans rien générer, pourquoi un grimoire incrémental serait reconstruit
+
+        Returns:
+            Raison de la reconstruction, ou None si le grimoire est à jour
+        """
+        if not os.path.exists(output_path):
+            return "grimoire absent"
+        manifest_path = os.path.join(self._build_dir(output_path), "manifest.json")
+        if not os.path.exists(manifest_path):
+            return "pas de manifeste de construction"
+        manifest = BuildManifest(manifest_path)
+        inputs, spell_hashes = self._build_fingerprint(self._select_spells(source if source is not None else self._default_source()))
+        if manifest.is_up_to_date(output_path, inputs, spell_hashes):
+            return None
+        changed_inputs = [name for name, value in inputs.items() if manifest.inputs.get(name) != value]
+        if changed_inputs:
+            return f"entrées modifiées : {', '.join(changed_inputs)}"
+        changed = sum(1 for name, h in spell_hashes.items() if manifest.spell_changed(name, h))
+        removed = len(set(manifest.spells) - set(spell_hashes))
+        return f"{changed} sorts modifiés ou ajoutés, {removed} retirés"
+
+    def _build_fingerprint(self, records: list[Spell]):
+        """Empreintes des entrées globales et de chaque page de sort d'un grimoire"""
+        return self._build_inputs(), {record.sanitized_name: self._spell_hash(record) for record in records}
+
+    def _build_dir(self, output_path: str) -> str:
+        """Dossier de construction incrémentale (manifeste et sommaire) d'un grimoire"""
+        name = self._sanitize_filename(os.path.splitext(os.path.basename(output_path))[0])
+        # Deux grimoires de même nom dans des dossiers différents ne partagent pas leur manifeste
+        path_hash = data_hash(os.path.abspath(output_path))[:8]
+        return os.path.join(self.output_dir, ".build", f"{name}-{path_hash}")
+
+    def _build_inputs(self) -> dict:
+        """Empreintes des entrées globales du grimoire : configs joueur/thème et polices"""
+        inputs = {
+            "theme:config": file_hash(f"{self.theme.theme_path}/config.json"),
+            "font:body": self._font_hash(self.font_path),
+            "font:title": self._font_hash(self.font_path_title),
+        }
+        if self.player:
+            inputs["player:config"] = file_hash(f"{self.player.player_path}/config.json")
+            inputs["player:overrides"] = data_hash(self.player.get_custom_overrides())
+        return inputs
+
+    def _spell_hash(self, record: Spell) -> str:
+        """Empreinte d'une page de sort : contenu de la fiche et illustration"""
+        image_path = f"{self.illustrations_folder}/{record.sanitized_name}.png"
+        return data_hash({"spell": record.to_dict(), "illustration": file_hash(image_path)})
+
+    def _grimoire_styles(self) -> StyleBundle:
+        """Retourne les styles des grimoires (fiches de sorts et sommaire), partagés par toutes les pages"""
+        return self.styles
+
+    def _grimoire_heading(self):
+        """Titre du grimoire et nombre de sorts préparables, selon le joueur ou le thème"""
         # Titre personnalisé selon le thème/joueur
         if self.player:
-            grimoire_title = self.player.get_grimoire_title()
-            max_spells = self.player.get_max_prepared_spells()
+            return self.player.get_grimoire_title(), self.player.get_max_prepared_spells()
         elif self.theme:
-            grimoire_title = self.theme.get_title()
-            max_spells = self.theme.get_max_prepared_spells()
-        else:
-            grimoire_title = "Carnis Resurrectionem"  # Legacy
-            max_spells = 10
-            
-        story.append(Paragraph(grimoire_title, styles["TitreSommaire"]))
+            return self.theme.get_title(), self.theme.get_max_prepared_spells()
+        return "Carnis Resurrectionem", 10  # Legacy
+
+    def _append_grimoire_toc(self, story: list, document: GrimoireDocument, styles):
+        """Ajoute au récit la page de sommaire du grimoire, suivie d'un saut de page"""
+        story.append(Paragraph(document.title, styles["TitreSommaire"]))
         story.append(Spacer(1, 10))
         
         # Champ pour le nombre de sorts préparés aligné à droite
-        sorts_prepares_text = f"Préparable : {max_spells}"
-        sorts_prepares_table = Table([[sorts_prepares_text]], colWidths=[13*cm])
-        sorts_prepares_table.setStyle(TableStyle([
-            ('FONTNAME', (0, 0), (0, 0), self.font_name),
-            ('FONTSIZE', (0, 0), (0, 0), 12),
-            ('TEXTCOLOR', (0, 0), (0, 0), colors.darkblue),
-            ('ALIGN', (0, 0), (0, 0), 'RIGHT'),
-            ('VALIGN', (0, 0), (0, 0), 'MIDDLE'),
-        ]))
+        sorts_prepares_text = f"Préparable : {document.max_prepared}"
+        sorts_prepares_table = Table([[sorts_prepares_text]], colWidths=[self._width(13*cm)])
+        sorts_prepares_table.setStyle(styles.prepared_count)
         story.append(sorts_prepares_table)
         story.append(Spacer(1, 15))
 
-        # Lire tous les sorts et les organiser (avec filtrage)
-        sorts_par_niveau = {}
-        fichiers = [f for f in sorted(os.listdir(folder_path)) if f.endswith(".json") and f != "index.json"]
-        
-        for file in fichiers:
-            with open(os.path.join(folder_path, file), encoding='utf-8') as f:
-                data = json.load(f)
-                sorts = data if isinstance(data, list) else [data]
-                
-                for spell in sorts:
-                    # Filtrer les sorts selon le joueur/thème AVANT de les organiser
-                    nom_sort = spell.get("Nom", "Sort inconnu")
-                    if self.player and not self.player.should_include_spell(sanitize_filename(nom_sort)):
-                        continue
-                    elif self.theme and not self.theme.should_include_spell(nom_sort):
-                        continue
-                    
-                    niveau = spell.get("Niveau", 0)
-                    if niveau not in sorts_par_niveau:
-                        sorts_par_niveau[niveau] = []
-                    sorts_par_niveau[niveau].append(spell)
-
-        # Trier les sorts par niveau, puis par nom
-        for niveau in sorted(sorts_par_niveau.keys()):
-            sorts_par_niveau[niveau].sort(key=lambda x: x.get("Nom", ""))
-
         # Générer le contenu du sommaire
-        for niveau in sorted(sorts_par_niveau.keys()):
-            niveau_text = f"Niveau {niveau}" if niveau > 0 else "Tours de magie"
-            story.append(Paragraph(f"<b>{niveau_text}</b>", styles["NiveauHeader"]))
+        for section in document.sections:
+            story.append(Paragraph(f"<b>{section.title}</b>", styles["NiveauHeader"]))
             
             table_data = []
-            for spell in sorts_par_niveau[niveau]:
-                nom_sort = spell.get("Nom", "Sort inconnu")
-                rituel = spell.get("Rituel", "Non")
-                
+            for record in section.spells:
                 # Déterminer le symbole selon le type de sort
-                if rituel.lower() in ["oui", "yes", "true"]:
+                if record.ritual:
                     symbole = "R"  # R pour rituel
                 else:
                     symbole = "☐"  # Case vide pour cocher manuellement
                 
-                table_data.append([symbole, nom_sort])
+                table_data.append([symbole, record.name])
             
             if table_data:
-                table = Table(table_data, colWidths=[0.8*cm, 12*cm])
-                table.setStyle(TableStyle([
-                    ('FONTNAME', (0, 0), (0, -1), self.font_name_title),  # Police titre pour les symboles
-                    ('FONTNAME', (1, 0), (1, -1), self.font_name),        # Police manuscrite pour les noms
-                    ('FONTSIZE', (0, 0), (-1, -1), 11),
-                    ('ALIGN', (0, 0), (0, -1), 'CENTER'),
-                    ('ALIGN', (1, 0), (1, -1), 'LEFT'),
-                    ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
-                    ('LEFTPADDING', (0, 0), (-1, -1), 3),
-                    ('RIGHTPADDING', (0, 0), (-1, -1), 3),
-                    ('TOPPADDING', (0, 0), (-1, -1), 2),
-                    ('BOTTOMPADDING', (0, 0), (-1, -1), 2),
-                ]))
+                table = Table(table_data, colWidths=[self._width(0.8*cm), self._width(12*cm)])
+                table.setStyle(styles.toc_level)
                 story.append(table)
                 story.append(Spacer(1, 10))
 
         # Saut de page après le sommaire
         story.append(PageBreak())
 
-        # === GÉNÉRATION DES FICHES DE SORTS ===
-        # Réutiliser la logique de la méthode generate_compiled_pdf
-        for niveau in sorted(sorts_par_niveau.keys()):
-            for spell in sorts_par_niveau[niveau]:
-                self._append_spell_to_story(spell, story, styles)
+    def _new_document(self, output_path: str, template=SimpleDocTemplate) -> SimpleDocTemplate:
+        """Crée le document au format et avec les marges du grimoire"""
+        return template(output_path, pagesize=self.layout.page_size,
+                                 leftMargin=self.layout.margin_left, rightMargin=self.layout.margin_right,
+                                 topMargin=self.layout.margin_top, bottomMargin=self.layout.margin_bottom)
 
-        # Construire le PDF final
-        doc = SimpleDocTemplate(output_path, pagesize=A5,
-                                leftMargin=MARGIN_LEFT, rightMargin=MARGIN_RIGHT,
-                                topMargin=MARGIN_TOP, bottomMargin=MARGIN_BOTTOM)
-        doc.build(story)
-        print(f"Grimoire avec sommaire généré : {output_path}")
+    def _write_document(self, story: list, output_path: str):
+        """Construit un PDF en relevant les glyphes intégrés de chaque police"""
+        self._new_document(output_path).build(story, canvasmaker=FontStatsCanvas)
+
+    def _write_document_stream(self, chunks: Iterable[list], output_path: str):
+        """Construit un PDF à partir de paquets de flowables produits pendant la mise en page"""
+        self._new_document(output_path, StreamingDocTemplate).build_stream(chunks, canvasmaker=FontStatsCanvas)
+
+    def _width(self, width: float) -> float:
+        """Adapte une largeur prévue pour la page A5 à la largeur utile de la mise en page"""
+        return width * self.layout.width_scale
 
     def _sanitize_filename(self, title: str) -> str:
         """Nettoie un titre pour en faire un nom de fichier valide"""
@@ -515,8 +731,18 @@ class SpellPDFGenerator:
         sanitized = sanitized.strip('_')
         return sanitized
 
-    def generate_player_grimoire(self, output_path: str = None):
-        """Génère un grimoire personnalisé pour un joueur spécifique"""
+    def generate_player_grimoire(self, output_path: str = None, incremental: bool = False, source=None,
+                                 streaming: bool = False, chunk_size: int = DEFAULT_CHUNK_SIZE):
+        """
+        Génère un grimoire personnalisé pour un joueur spécifique
+
+        Args:
+            output_path: Chemin du PDF (titre du grimoire par défaut)
+            incremental: Ne reconstruit que les pages dont les entrées ont changé
+            source: Source des sorts (dossier, JSONL, archive zip ou liste de sources), source par défaut si None
+            streaming: Produit les pages de sorts à la demande, par parties fusionnées à la fin (grands grimoires)
+            chunk_size: Sorts par partie en mode streaming (un seul document, à mémoire non bornée, si None ou 0)
+        """
         if not self.player:
             raise ValueError("Cette méthode nécessite une configuration de joueur")
         
@@ -529,19 +755,41 @@ class SpellPDFGenerator:
         print(f"🧙‍♂️ Génération du grimoire pour {self.player.get_character_name()}...")
         
         # Utilise la méthode standard mais avec la configuration du joueur
-        self.generate_grimoire_with_table_of_contents("fiches_sorts", output_path)
+        source = source if source is not None else self._default_source()
+        if incremental:
+            self.generate_grimoire_incremental(source, output_path)
+        elif streaming:
+            self.generate_grimoire_streaming(source, output_path, chunk_size)
+        else:
+            self.generate_grimoire_with_table_of_contents(source, output_path)
         
         print(f"✅ Grimoire de {self.player.get_character_name()} généré : {output_path}")
 
-    def generate_theme_grimoire(self, output_path: str):
-        """Génère un grimoire basé sur un thème spécifique"""
+    def generate_theme_grimoire(self, output_path: str, incremental: bool = False, source=None,
+                                streaming: bool = False, chunk_size: int = DEFAULT_CHUNK_SIZE):
+        """
+        Génère un grimoire basé sur un thème spécifique
+
+        Args:
+            output_path: Chemin du PDF
+            incremental: Ne reconstruit que les pages dont les entrées ont changé
+            source: Source des sorts (dossier, JSONL, archive zip ou liste de sources), source par défaut si None
+            streaming: Produit les pages de sorts à la demande, par parties fusionnées à la fin (grands grimoires)
+            chunk_size: Sorts par partie en mode streaming (un seul document, à mémoire non bornée, si None ou 0)
+        """
         if not self.theme:
             raise ValueError("Cette méthode nécessite une configuration de thème")
         
         print(f"🎭 Génération du grimoire thème '{self.theme.theme_name}'...")
         
         # Utilise la méthode standard mais avec la configuration du thème
-        self.generate_grimoire_with_table_of_contents("fiches_sorts", output_path)
+        source = source if source is not None else self._default_source()
+        if incremental:
+            self.generate_grimoire_incremental(source, output_path)
+        elif streaming:
+            self.generate_grimoire_streaming(source, output_path, chunk_size)
+        else:
+            self.generate_grimoire_with_table_of_contents(source, output_path)
         
         print(f"✅ Grimoire thème '{self.theme.theme_name}' généré : {output_path}")
 
@@ -1,6 +1,9 @@
 import os
 import base64
-from openai import OpenAI
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Dict, Iterable
+from character_sheet.rate_limit import TokenBucket
+from character_sheet.response_cache import ResponseCache, cached_chat_completion, cached_image_generation
 from character_sheet.utils import sanitize_filename
 from .theme_manager import ThemeManager
 
@@ -10,10 +13,22 @@ PROMPT_GENERATION_INSTRUCTION = (
     "Format your result in a single English sentence suitable for use with DALL·E."
 )
 
+def is_illustrated(output_dir: str, spell_name: str) -> bool:
+    """Indique si un sort a déjà ses deux illustrations (petite et grande) dans un dossier"""
+    filename = sanitize_filename(spell_name) + ".png"
+    return (os.path.exists(os.path.join(output_dir, filename))
+            and os.path.exists(os.path.join(output_dir, "large", filename)))
+
+
 class SpellIllustrationGenerator:
-    def __init__(self, api_key: str, output_dir="illustrations", model="gpt-image-1", theme_manager: ThemeManager = None):
+    def __init__(self, api_key: str, output_dir="illustrations", model="gpt-image-1", theme_manager: ThemeManager = None,
+                 requests_per_second: float = 1.0, response_cache: ResponseCache = None):
+        from openai import OpenAI  # Import différé : le SDK est lourd et inutile hors génération
+
         self.api_key = api_key
         self.client = OpenAI(api_key=self.api_key)
+        self.rate_limiter = TokenBucket(rate=requests_per_second)
+        self.response_cache = response_cache
         self.output_dir = output_dir
         self.model = model
         self.theme_manager = theme_manager
@@ -26,17 +41,18 @@ class SpellIllustrationGenerator:
             stylistic_constraints = self.theme_manager.get_stylistic_constraints() if self.theme_manager else "A detailed fantasy illustration"
             themed_constraints = f"{stylistic_constraints} Style: {self.theme_style}"
             
-            response = self.client.chat.completions.create(
-                model="gpt-4",
-                messages=[
+            params = {
+                "model": "gpt-4",
+                "messages": [
                     {"role": "system", "content": PROMPT_GENERATION_INSTRUCTION },
                     {"role": "user", "content": f"""Spell name: {spell_name}
                      Description: {description}
                      Stylistic constraints: {themed_constraints}"""}
                 ],
-                temperature=0.7
-            )
-            prompt_text = response.choices[0].message.content.strip()
+                "temperature": 0.7
+            }
+            prompt_text = cached_chat_completion(self.client, params, cache=self.response_cache,
+                                                 rate_limiter=self.rate_limiter).strip()
             print(f"🧠 Prompt généré par GPT pour '{spell_name}' (style: {self.theme_style}): {prompt_text}")
             return prompt_text
         except Exception as e:
@@ -44,9 +60,14 @@ class SpellIllustrationGenerator:
             base_prompt = self.theme_manager.get_base_prompt() if self.theme_manager else "A detailed illustration of the spell: {name}"
             return base_prompt.format(name=spell_name)
 
-    def generate_illustration(self, spell_name: str, description: str) -> str:
-        filename = sanitize_filename(spell_name) + ".png"
-        filepath = os.path.join(self.output_dir, filename)
+    def _small_path(self, spell_name: str) -> str:
+        return os.path.join(self.output_dir, sanitize_filename(spell_name) + ".png")
+
+    def _large_path(self, spell_name: str) -> str:
+        return os.path.join(self.output_dir, "large", sanitize_filename(spell_name) + ".png")
+
+    def generate_illustration(self, spell_name: str, description: str, concept_prompt: str = None) -> str:
+        filepath = self._small_path(spell_name)
 
         if os.path.exists(filepath):
             print(f"✔ Illustration déjà générée pour '{spell_name}', chargée depuis {filepath}")
@@ -54,19 +75,19 @@ class SpellIllustrationGenerator:
 
         # Combiner les contraintes stylistiques du thème avec le style
         stylistic_constraints = self.theme_manager.get_stylistic_constraints() if self.theme_manager else "A detailed fantasy illustration"
-        themed_prompt = f"{stylistic_constraints} Style: {self.theme_style}. " + self.generate_prompt_with_chatgpt(spell_name, description)
+        if concept_prompt is None:
+            concept_prompt = self.generate_prompt_with_chatgpt(spell_name, description)
+        themed_prompt = f"{stylistic_constraints} Style: {self.theme_style}. " + concept_prompt
 
         try:
-            response = self.client.images.generate(
-                model=self.model,
-                prompt=themed_prompt,
-                n=1,
-                size="1024x1024",
-                output_format="png",
-                quality="low"
-            )
-
-            image_base64 = response.data[0].b64_json
+            image_base64 = cached_image_generation(self.client, {
+                "model": self.model,
+                "prompt": themed_prompt,
+                "n": 1,
+                "size": "1024x1024",
+                "output_format": "png",
+                "quality": "low"
+            }, cache=self.response_cache, rate_limiter=self.rate_limiter)
             image_bytes = base64.b64decode(image_base64)
 
             # Save the image to a file
@@ -80,18 +101,16 @@ class SpellIllustrationGenerator:
             print(f"❌ Erreur lors de la génération de l'illustration pour '{spell_name}': {e}")
             return None
 
-    def generate_large_illustration(self, spell_name: str, description: str, prompt_addition: str = "") -> str:
-        large_dir = os.path.join(self.output_dir, "large")
-        os.makedirs(large_dir, exist_ok=True)
-
-        filename = sanitize_filename(spell_name) + ".png"
-        filepath = os.path.join(large_dir, filename)
+    def generate_large_illustration(self, spell_name: str, description: str, prompt_addition: str = "",
+                                    concept_prompt: str = None) -> str:
+        filepath = self._large_path(spell_name)
+        os.makedirs(os.path.dirname(filepath), exist_ok=True)
 
         if os.path.exists(filepath):
             print(f"✔ Illustration large déjà générée pour '{spell_name}', chargée depuis {filepath}")
             return filepath
 
-        base_prompt = self.generate_prompt_with_chatgpt(spell_name, description)
+        base_prompt = concept_prompt if concept_prompt is not None else self.generate_prompt_with_chatgpt(spell_name, description)
         stylistic_constraints = self.theme_manager.get_stylistic_constraints() if self.theme_manager else "A detailed fantasy illustration"
         large_context = self.theme_manager.get_large_illustration_context() if self.theme_manager else ""
         final_prompt = (
@@ -102,16 +121,14 @@ class SpellIllustrationGenerator:
         )
 
         try:
-            response = self.client.images.generate(
-                model=self.model,
-                prompt=final_prompt.strip(),
-                n=1,
-                size="1024x1536", 
-                output_format="png",
-                quality="medium"
-            )
-
-            image_base64 = response.data[0].b64_json
+            image_base64 = cached_image_generation(self.client, {
+                "model": self.model,
+                "prompt": final_prompt.strip(),
+                "n": 1,
+                "size": "1024x1536",
+                "output_format": "png",
+                "quality": "medium"
+            }, cache=self.response_cache, rate_limiter=self.rate_limiter)
             image_bytes = base64.b64decode(image_base64)
 
             with open(filepath, "wb") as f:
@@ -123,3 +140,69 @@ class SpellIllustrationGenerator:
         except Exception as e:
             print(f"❌ Erreur lors de la génération de l'illustration large pour '{spell_name}': {e}")
             return None
+
+    def generate_both_illustrations(self, spell_name: str, description: str) -> str:
+        """Génère les illustrations manquantes (petite et large) d'un sort avec un seul prompt conceptuel
+
+        Returns:
+            Chemin de la petite illustration, ou None si elle n'a pas pu être générée
+        """
+        need_small = not os.path.exists(self._small_path(spell_name))
+        need_large = not os.path.exists(self._large_path(spell_name))
+        if not (need_small or need_large):
+            return self._small_path(spell_name)
+
+        concept_prompt = self.generate_prompt_with_chatgpt(spell_name, description)
+        small_path = self._small_path(spell_name)
+        if need_small:
+            small_path = self.generate_illustration(spell_name, description, concept_prompt=concept_prompt)
+        if need_large:
+            self.generate_large_illustration(spell_name, description, concept_prompt=concept_prompt)
+        return small_path
+
+    def generate_missing_illustrations(self, spells: Iterable[dict], max_workers: int = 4) -> Dict[str, str]:
+        """
+        Génère en parallèle les illustrations manquantes d'un ensemble de sorts
+
+        Les sorts sont dédoublonnés par nom ; chaque sort n'obtient qu'un prompt
+        conceptuel, partagé par ses deux tailles d'illustration. Le débit global
+        reste borné par le limiteur de requêtes.
+
+        Args:
+            spells: Fiches de sorts (dictionnaires avec "Nom" et "Description complète")
+            max_workers: Nombre de sorts illustrés simultanément
+
+        Returns:
+            Dictionnaire nom nettoyé -> chemin de la petite illustration (None si échec)
+        """
+        missing = {}
+        for spell in spells:
+            name = spell.get("Nom", "Sort inconnu")
+            key = sanitize_filename(name)
+            if key in missing:
+                continue
+            if is_illustrated(self.output_dir, name):
+                continue
+            missing[key] = (name, spell.get("Description complète", ""))
+
+        if not missing:
+            return {}
+
+        print(f"🎨 Génération de {len(missing)} illustrations manquantes ({max_workers} en parallèle)...")
+        results = {}
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = {
+                executor.submit(self.generate_both_illustrations, name, description): key
+                for key, (name, description) in missing.items()
+            }
+            for future in as_completed(futures):
+                key = futures[future]
+                try:
+                    results[key] = future.result()
+                except Exception as e:
+                    print(f"❌ Impossible de générer l'illustration pour {missing[key][0]}: {e}")
+                    results[key] = None
+        if self.response_cache is not None:
+            self.response_cache.evict()
+            print(f"🗄️  Cache des réponses API : {self.response_cache.report()}")
+        return results
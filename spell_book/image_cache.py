@@ -0,0 +1,130 @@
+import hashlib
+import math
+import os
+import tempfile
+from typing import Dict, Tuple
+
+from .manifest import file_hash
+
+POINTS_PER_INCH = 72
+
+
+class IllustrationCache:
+    """Cache des illustrations redimensionnées pour l'intégration dans les PDF.
+
+    Les illustrations sources (1024x1024 PNG) sont bien plus grandes que leur
+    emplacement sur la page. Chaque source est réduite à la résolution cible
+    (300 dpi par défaut) pour sa taille d'affichage, puis recompressée en JPEG
+    (ou en PNG si elle a de la transparence). Les dérivés sont indexés par le
+    chemin et l'empreinte de la source : ils sont invalidés dès que la source
+    change, sans toucher à ceux d'une illustration homonyme d'un autre thème.
+    """
+
+    def __init__(self, cache_dir: str, dpi: int = 300, jpeg_quality: int = 85):
+        self.cache_dir = cache_dir
+        self.dpi = dpi
+        self.jpeg_quality = jpeg_quality
+        self._hashes: Dict[Tuple[str, int, int], str] = {}
+        self.reset_stats()
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+    def reset_stats(self):
+        """Remet à zéro les tailles cumulées (sources et dérivés intégrés)"""
+        self.source_bytes = 0
+        self.embedded_bytes = 0
+        self.images = 0
+
+    def settings_key(self) -> str:
+        """Paramètres qui influent sur le rendu des dérivés"""
+        return f"{self.dpi}dpi-q{self.jpeg_quality}"
+
+    def _source_hash(self, source_path: str) -> str:
+        """Empreinte de la source, mémorisée tant que sa taille et sa date sont inchangées"""
+        stat = os.stat(source_path)
+        memo_key = (os.path.abspath(source_path), stat.st_mtime_ns, stat.st_size)
+        if memo_key not in self._hashes:
+            self._hashes[memo_key] = file_hash(source_path)
+        return self._hashes[memo_key]
+
+    @staticmethod
+    def _stem(source_path: str) -> str:
+        """Préfixe propre à une source : son nom, suivi d'une empreinte de son chemin absolu"""
+        path_hash = hashlib.sha256(os.path.abspath(source_path).encode("utf-8")).hexdigest()[:8]
+        return f"{os.path.splitext(os.path.basename(source_path))[0]}-{path_hash}"
+
+    def get(self, source_path: str, width: float, height: float) -> str:
+        """
+        Retourne le chemin d'un dérivé adapté à l'emplacement (en points) de l'image
+
+        En cas d'échec du redimensionnement, la source est retournée telle quelle.
+        """
+        target = (
+            math.ceil(width / POINTS_PER_INCH * self.dpi),
+            math.ceil(height / POINTS_PER_INCH * self.dpi),
+        )
+        stem = self._stem(source_path)
+        source_hash = self._source_hash(source_path)[:16]
+        prefix = f"{stem}_{source_hash}_{target[0]}x{target[1]}_{self.settings_key()}"
+
+        derived_path = None
+        for ext in (".jpg", ".png"):
+            if os.path.exists(os.path.join(self.cache_dir, prefix + ext)):
+                derived_path = os.path.join(self.cache_dir, prefix + ext)
+        if derived_path is None:
+            try:
+                derived_path = self._render(source_path, prefix, target)
+                self._remove_stale(stem, source_hash)
+            except Exception as e:
+                print(f"⚠ Impossible de réduire l'illustration {source_path}: {e}")
+                derived_path = source_path
+
+        self.images += 1
+        self.source_bytes += os.path.getsize(source_path)
+        self.embedded_bytes += os.path.getsize(derived_path)
+        return derived_path
+
+    def _render(self, source_path: str, prefix: str, target: Tuple[int, int]) -> str:
+        """Crée le dérivé redimensionné dans le cache et retourne son chemin"""
+        from PIL import Image as PILImage
+
+        with PILImage.open(source_path) as img:
+            has_alpha = img.mode in ("RGBA", "LA") or (img.mode == "P" and "transparency" in img.info)
+            resized = img.copy()
+            resized.thumbnail(target, PILImage.LANCZOS)  # Ne fait jamais d'agrandissement
+
+        ext = ".png" if has_alpha else ".jpg"
+        fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, prefix=".tmp_", suffix=ext)
+        os.close(fd)
+        try:
+            if has_alpha:
+                resized.save(tmp_path, "PNG", optimize=True)
+            else:
+                resized.convert("RGB").save(tmp_path, "JPEG", quality=self.jpeg_quality, optimize=True)
+            derived_path = os.path.join(self.cache_dir, prefix + ext)
+            os.replace(tmp_path, derived_path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+        return derived_path
+
+    def _remove_stale(self, stem: str, source_hash: str):
+        """Supprime les dérivés des versions précédentes d'une source"""
+        for file in os.listdir(self.cache_dir):
+            if not file.startswith(stem + "_"):
+                continue
+            parts = os.path.splitext(file[len(stem) + 1:])[0].split("_")
+            # <empreinte>_<taille>_<réglages> : un nom plus long appartient à une autre source
+            if len(parts) == 3 and parts[0] != source_hash:
+                try:
+                    os.remove(os.path.join(self.cache_dir, file))
+                except FileNotFoundError:
+                    pass  # Déjà supprimé par un autre processus
+
+    def report(self) -> str:
+        """Résumé du gain de taille des illustrations intégrées"""
+        if not self.images:
+            return "aucune illustration intégrée"
+        return (f"{self.images} illustrations : {self.source_bytes / 1024:.0f} Ko → "
+                f"{self.embedded_bytes / 1024:.0f} Ko intégrés")
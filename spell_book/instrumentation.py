@@ -0,0 +1,134 @@
+import cProfile
+import functools
+import io
+import logging
+import pstats
+import time
+import tracemalloc
+from contextlib import contextmanager
+from typing import Any, Dict, List
+
+logger = logging.getLogger("spell_book")
+
+
+class BuildInstrumentation:
+    """Chronomètres, compteurs et profilage optionnel d'une génération de grimoire.
+
+    Les étapes (`stage`) cumulent leur durée et leur nombre d'appels, les sorts
+    (`spell`) sont chronométrés individuellement. Une étape peut en contenir
+    d'autres : `seconds` inclut leurs durées, `self_seconds` les exclut (les
+    `self_seconds` de toutes les étapes s'additionnent sans double compte).
+    Le profilage cProfile et la mesure mémoire tracemalloc ne sont actifs
+    qu'entre `start()` et `stop()`.
+    """
+
+    def __init__(self, profile: bool = False, trace_memory: bool = False):
+        self.profile = profile
+        self.trace_memory = trace_memory
+        self.stages: Dict[str, Dict[str, float]] = {}
+        self.counters: Dict[str, int] = {}
+        self.spell_timings: Dict[str, float] = {}
+        self.peak_memory_bytes: int = None
+        self._profiler: cProfile.Profile = None
+        self._profile_stats: str = None
+        self._started_tracemalloc = False
+        self._open_stages: List[float] = []  # Durée des sous-étapes de chaque étape en cours
+
+    @contextmanager
+    def stage(self, name: str):
+        """Chronomètre une étape (les durées d'une même étape sont cumulées)"""
+        start = time.perf_counter()
+        self._open_stages.append(0.0)
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            children = self._open_stages.pop()
+            if self._open_stages:
+                self._open_stages[-1] += elapsed
+            entry = self.stages.setdefault(name, {"seconds": 0.0, "self_seconds": 0.0, "calls": 0})
+            entry["seconds"] += elapsed
+            entry["self_seconds"] += elapsed - children
+            entry["calls"] += 1
+
+    @contextmanager
+    def spell(self, spell_name: str):
+        """Chronomètre la mise en page d'un sort"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.spell_timings[spell_name] = self.spell_timings.get(spell_name, 0.0) + time.perf_counter() - start
+
+    def count(self, name: str, value: int = 1):
+        """Incrémente un compteur"""
+        self.counters[name] = self.counters.get(name, 0) + value
+
+    def start(self):
+        """Démarre le profilage cProfile et/ou la mesure mémoire si demandés"""
+        if self.profile and self._profiler is None:
+            self._profiler = cProfile.Profile()
+            self._profiler.enable()
+        if self.trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracemalloc = True
+
+    def stop(self):
+        """Arrête le profilage et conserve ses résultats"""
+        if self._profiler is not None:
+            self._profiler.disable()
+            output = io.StringIO()
+            pstats.Stats(self._profiler, stream=output).sort_stats("cumulative").print_stats(25)
+            self._profile_stats = output.getvalue()
+            self._profiler = None
+        if self._started_tracemalloc:
+            self.peak_memory_bytes = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+            self._started_tracemalloc = False
+
+    def slowest_spells(self, top: int = 10) -> List[Dict[str, Any]]:
+        """Retourne les sorts les plus lents à mettre en page"""
+        ranked = sorted(self.spell_timings.items(), key=lambda item: item[1], reverse=True)
+        return [{"spell": name, "seconds": round(seconds, 4)} for name, seconds in ranked[:top]]
+
+    def report(self, top: int = 10) -> Dict[str, Any]:
+        """Rapport structuré (sérialisable en JSON) de la génération"""
+        stages = sorted(self.stages.items(), key=lambda item: item[1]["seconds"], reverse=True)
+        report = {
+            "stages": {name: {"seconds": round(v["seconds"], 4), "self_seconds": round(v["self_seconds"], 4),
+                              "calls": v["calls"]} for name, v in stages},
+            "counters": dict(self.counters),
+            "slowest_spells": self.slowest_spells(top),
+        }
+        if self.peak_memory_bytes is not None:
+            report["peak_memory_bytes"] = self.peak_memory_bytes
+        if self._profile_stats:
+            report["profile"] = self._profile_stats
+        return report
+
+    def log_report(self, label: str = "grimoire", top: int = 5):
+        """Envoie un résumé du rapport sur le logger `spell_book`"""
+        report = self.report(top)
+        for name, entry in report["stages"].items():
+            logger.info("%s - étape %s : %.3fs (%d appels)", label, name, entry["seconds"], entry["calls"])
+        for name, value in report["counters"].items():
+            logger.info("%s - compteur %s : %d", label, name, value)
+        for entry in report["slowest_spells"]:
+            logger.info("%s - sort lent %s : %.3fs", label, entry["spell"], entry["seconds"])
+        if "peak_memory_bytes" in report:
+            logger.info("%s - pic mémoire : %.1f Mo", label, report["peak_memory_bytes"] / 1024 / 1024)
+        if "profile" in report:
+            logger.debug("%s - profil cProfile :\n%s", label, report["profile"])
+
+
+def instrumented_build(method):
+    """Décorateur des méthodes de génération : active le profilage et journalise le rapport"""
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        self.instrumentation.start()
+        try:
+            return method(self, *args, **kwargs)
+        finally:
+            self.instrumentation.stop()
+            self.instrumentation.log_report(label=method.__name__)
+    return wrapper
@@ -0,0 +1,200 @@
+from dataclasses import dataclass
+from typing import List, Tuple
+
+from reportlab.lib.pagesizes import A4, A5, A6, landscape, letter, portrait
+from reportlab.lib.units import cm, mm
+from reportlab.platypus import PageBreak
+from reportlab.platypus.frames import Frame
+
+from .fonts import FontStatsCanvas
+
+PAGE_SIZES = {
+    "A4": A4,
+    "A5": A5,
+    "A6": A6,
+    "LETTER": letter,
+}
+
+# Marges historiques des grimoires A5
+DEFAULT_MARGINS = (1.2 * cm, 1.0 * cm, 0.5 * cm, 1.0 * cm)  # gauche, droite, haut, bas
+
+
+def parse_page_size(value) -> Tuple[float, float]:
+    """Retourne une taille de page (en points) depuis un nom ("A4", "letter"...) ou un couple (largeur, hauteur)"""
+    if isinstance(value, str):
+        try:
+            return PAGE_SIZES[value.upper()]
+        except KeyError:
+            raise ValueError(f"Format de page inconnu : {value} (disponibles : {', '.join(PAGE_SIZES)})")
+    width, height = value
+    return float(width), float(height)
+
+
+@dataclass(frozen=True)
+class PageLayout:
+    """Format de page et marges des fiches de sorts (A5 et marges historiques par défaut)"""
+    page_size: Tuple[float, float] = A5
+    margin_left: float = DEFAULT_MARGINS[0]
+    margin_right: float = DEFAULT_MARGINS[1]
+    margin_top: float = DEFAULT_MARGINS[2]
+    margin_bottom: float = DEFAULT_MARGINS[3]
+
+    @classmethod
+    def from_options(cls, page_size="A5", margins_cm: Tuple[float, float, float, float] = None) -> "PageLayout":
+        """
+        Args:
+            page_size: Nom du format ou couple (largeur, hauteur) en points
+            margins_cm: Marges (gauche, droite, haut, bas) en centimètres
+        """
+        margins = tuple(m * cm for m in margins_cm) if margins_cm else DEFAULT_MARGINS
+        return cls(parse_page_size(page_size), *margins)
+
+    @property
+    def frame_width(self) -> float:
+        return self.page_size[0] - self.margin_left - self.margin_right
+
+    @property
+    def frame_height(self) -> float:
+        return self.page_size[1] - self.margin_top - self.margin_bottom
+
+    @property
+    def width_scale(self) -> float:
+        """Rapport de largeur utile avec la mise en page A5 d'origine, pour adapter les largeurs fixes"""
+        return self.frame_width / DEFAULT_LAYOUT_FRAME_WIDTH
+
+    def key(self) -> str:
+        """Identifiant stable de la mise en page (clés de cache)"""
+        values = self.page_size + (self.margin_left, self.margin_right, self.margin_top, self.margin_bottom)
+        return "layout:" + "x".join(f"{value:.2f}" for value in values)
+
+
+DEFAULT_LAYOUT_FRAME_WIDTH = PageLayout().frame_width
+
+
+@dataclass(frozen=True)
+class Imposition:
+    """Imposition de plusieurs fiches par feuille (2 ou 4), avec traits de coupe"""
+    cards_per_sheet: int = 2
+    sheet_size: Tuple[float, float] = A4
+    cut_marks: bool = True
+    sheet_margin: float = 5 * mm
+    mark_length: float = 4 * mm
+
+    def __post_init__(self):
+        if self.cards_per_sheet not in (1, 2, 4):
+            raise ValueError("L'imposition accepte 1, 2 ou 4 fiches par feuille")
+
+    @property
+    def grid(self) -> Tuple[int, int]:
+        """(colonnes, lignes) de la grille de fiches"""
+        return {1: (1, 1), 2: (2, 1), 4: (2, 2)}[self.cards_per_sheet]
+
+    @property
+    def oriented_sheet_size(self) -> Tuple[float, float]:
+        """Taille de feuille orientée pour des fiches en portrait (paysage pour 2 fiches)"""
+        return landscape(self.sheet_size) if self.cards_per_sheet == 2 else portrait(self.sheet_size)
+
+    def cells(self) -> List[Tuple[float, float, float, float]]:
+        """Cellules (x, y, largeur, hauteur) de la feuille, de haut en bas et de gauche à droite"""
+        sheet_width, sheet_height = self.oriented_sheet_size
+        columns, rows = self.grid
+        cell_width = (sheet_width - 2 * self.sheet_margin) / columns
+        cell_height = (sheet_height - 2 * self.sheet_margin) / rows
+        return [
+            (self.sheet_margin + column * cell_width,
+             sheet_height - self.sheet_margin - (row + 1) * cell_height,
+             cell_width, cell_height)
+            for row in range(rows) for column in range(columns)
+        ]
+
+
+def _draw_cut_marks(canvas, imposition: Imposition):
+    """Trace les traits de coupe dans la marge de la feuille, dans le prolongement des bords des fiches"""
+    sheet_width, sheet_height = imposition.oriented_sheet_size
+    margin, length = imposition.sheet_margin, imposition.mark_length
+    xs = sorted({round(x, 2) for x, _, w, _ in imposition.cells()} | {round(x + w, 2) for x, _, w, _ in imposition.cells()})
+    ys = sorted({round(y, 2) for _, y, _, h in imposition.cells()} | {round(y + h, 2) for _, y, _, h in imposition.cells()})
+    canvas.saveState()
+    canvas.setLineWidth(0.3)
+    for x in xs:
+        canvas.line(x, 0, x, min(length, margin))
+        canvas.line(x, sheet_height - min(length, margin), x, sheet_height)
+    for y in ys:
+        canvas.line(0, y, min(length, margin), y)
+        canvas.line(sheet_width - min(length, margin), y, sheet_width, y)
+    # Petites croix aux intersections intérieures
+    for x in xs[1:-1]:
+        for y in ys:
+            canvas.line(x - length / 2, y, x + length / 2, y)
+            canvas.line(x, y - length / 2, x, y + length / 2)
+    for y in ys[1:-1]:
+        for x in (xs[0], xs[-1]):
+            canvas.line(x - length / 2, y, x + length / 2, y)
+    canvas.restoreState()
+
+
+def impose_cards(cards: List[list], output_path: str, layout: PageLayout, imposition: Imposition) -> int:
+    """
+    Dispose les fiches (listes de flowables) sur des feuilles, plusieurs par feuille
+
+    Chaque fiche est mise en page à la taille de `layout` puis réduite pour
+    tenir dans sa cellule, comme une page du grimoire. Une fiche trop longue
+    continue dans la cellule suivante.
+
+    Returns:
+        Nombre de feuilles produites
+    """
+    sheet_size = imposition.oriented_sheet_size
+    cells = imposition.cells()
+    card_width, card_height = layout.page_size
+    pdf = FontStatsCanvas(output_path, pagesize=sheet_size)
+    sheets = 0
+    cell_index = len(cells)  # Force une nouvelle feuille pour la première fiche
+
+    def next_cell():
+        nonlocal cell_index, sheets
+        if cell_index >= len(cells):
+            if sheets:
+                pdf.showPage()
+            sheets += 1
+            cell_index = 0
+            if imposition.cut_marks:
+                _draw_cut_marks(pdf, imposition)
+        x, y, width, height = cells[cell_index]
+        cell_index += 1
+        return x, y, width, height
+
+    for card in cards:
+        pending = [flowable for flowable in card if not isinstance(flowable, PageBreak)]
+        while pending:
+            x, y, width, height = next_cell()
+            scale = min(width / card_width, height / card_height)
+            pdf.saveState()
+            # Centre la fiche réduite dans sa cellule
+            pdf.translate(x + (width - card_width * scale) / 2, y + (height - card_height * scale) / 2)
+            pdf.scale(scale, scale)
+            frame = Frame(layout.margin_left, layout.margin_bottom, layout.frame_width, layout.frame_height)
+            drawn = 0
+            while pending:
+                if frame.add(pending[0], pdf, trySplit=0):
+                    pending.pop(0)
+                    drawn += 1
+                    continue
+                parts = frame.split(pending[0], pdf)
+                if parts:
+                    pending[0:1] = parts
+                    if frame.add(pending[0], pdf, trySplit=0):
+                        pending.pop(0)
+                        drawn += 1
+                        continue
+                if not drawn:
+                    # Élément plus grand qu'une fiche vide : l'ignorer plutôt que boucler
+                    print(f"⚠ Élément trop grand pour une fiche, ignoré : {pending.pop(0).__class__.__name__}")
+                    continue
+                break
+            pdf.restoreState()
+
+    if sheets:
+        pdf.showPage()
+    pdf.save()
+    return sheets
@@ -0,0 +1,74 @@
+import hashlib
+import json
+import os
+from typing import Any, Dict
+
+from character_sheet.utils import atomic_write_json
+
+MISSING = "absent"
+
+
+def file_hash(path: str) -> str:
+    """Retourne l'empreinte SHA-256 du contenu d'un fichier ("absent" s'il n'existe pas)"""
+    if not path or not os.path.exists(path):
+        return MISSING
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(65536), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def data_hash(data: Any) -> str:
+    """Retourne l'empreinte SHA-256 d'une donnée JSON (clés triées)"""
+    payload = json.dumps(data, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class BuildManifest:
+    """Empreintes des entrées ayant servi à construire un grimoire.
+
+    Le manifeste retient les entrées globales (configs joueur/thème, polices)
+    et une empreinte par sort (fiche JSON + illustration).
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        data = self._load()
+        self.output_path: str = data.get("output_path")
+        self.inputs: Dict[str, str] = data.get("inputs", {})
+        self.spells: Dict[str, str] = data.get("spells", {})
+
+    def _load(self) -> Dict[str, Any]:
+        if os.path.exists(self.path):
+            try:
+                with open(self.path, encoding="utf-8") as f:
+                    return json.load(f)
+            except (OSError, json.JSONDecodeError):
+                print(f"⚠️ Manifeste illisible, reconstruction complète : {self.path}")
+        return {}
+
+    def spell_changed(self, spell_name: str, spell_hash: str) -> bool:
+        """Indique si l'empreinte d'un sort a changé depuis la dernière construction"""
+        return self.spells.get(spell_name) != spell_hash
+
+    def is_up_to_date(self, output_path: str, inputs: Dict[str, str], spells: Dict[str, str]) -> bool:
+        """Indique si le grimoire existant correspond exactement aux entrées fournies"""
+        return (
+            os.path.exists(output_path)
+            and self.output_path == output_path
+            and inputs == self.inputs
+            and spells == self.spells
+        )
+
+    def update(self, output_path: str, inputs: Dict[str, str], spells: Dict[str, str]):
+        """Enregistre les empreintes de la construction qui vient de réussir"""
+        self.output_path = output_path
+        self.inputs = dict(inputs)
+        self.spells = dict(spells)
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        atomic_write_json(self.path, {
+            "output_path": self.output_path,
+            "inputs": self.inputs,
+            "spells": self.spells,
+        })
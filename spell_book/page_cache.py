@@ -0,0 +1,91 @@
+import os
+import tempfile
+from typing import Callable, Optional
+
+from .manifest import data_hash
+
+DEFAULT_MAX_BYTES = 200 * 1024 * 1024
+
+
+class SpellPageCache:
+    """Cache disque des pages de sorts déjà rendues en PDF.
+
+    Une page de sort ne dépend que du contenu du sort, du thème, des couleurs
+    effectives et des polices : elle est donc partagée entre tous les joueurs
+    qui ont la même apparence. L'éviction est LRU (date de dernier accès portée
+    par le mtime des fichiers) avec une taille totale bornée.
+    """
+
+    def __init__(self, cache_dir: str, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+    @staticmethod
+    def make_key(spell_hash: str, theme: str, colors: dict, fonts: list, extra: str = "") -> str:
+        """Construit la clé d'une page à partir de tout ce qui influe sur son rendu"""
+        return data_hash({"spell": spell_hash, "theme": theme, "colors": colors, "fonts": fonts, "extra": extra})
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, f"{key}.pdf")
+
+    def get(self, key: str) -> Optional[str]:
+        """Retourne le chemin de la page en cache (et la marque comme récente), ou None"""
+        path = self._path(key)
+        try:
+            os.utime(path)
+        except FileNotFoundError:
+            return None
+        return path
+
+    def get_or_render(self, key: str, render: Callable[[str], None]) -> str:
+        """Retourne la page en cache, ou la rend via `render(chemin)` puis la stocke"""
+        path = self.get(key)
+        if path:
+            self.hits += 1
+            return path
+
+        self.misses += 1
+        fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, prefix=".tmp_", suffix=".pdf")
+        os.close(fd)
+        try:
+            render(tmp_path)
+            os.replace(tmp_path, self._path(key))
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+        return self._path(key)
+
+    def size(self) -> int:
+        """Taille totale des pages en cache, en octets"""
+        return sum(entry.stat().st_size for entry in self._entries())
+
+    def _entries(self):
+        return [
+            entry for entry in os.scandir(self.cache_dir)
+            if entry.is_file() and entry.name.endswith(".pdf") and not entry.name.startswith(".tmp_")
+        ]
+
+    def evict(self) -> int:
+        """Supprime les pages les moins récemment utilisées au-delà de la taille maximale
+
+        Returns:
+            Nombre de pages supprimées
+        """
+        entries = sorted(self._entries(), key=lambda entry: entry.stat().st_mtime)
+        total = sum(entry.stat().st_size for entry in entries)
+        removed = 0
+        for entry in entries:
+            if total <= self.max_bytes:
+                break
+            try:
+                size = entry.stat().st_size
+                os.remove(entry.path)
+            except FileNotFoundError:
+                continue  # Déjà supprimée par un autre processus
+            total -= size
+            removed += 1
+        return removed
@@ -0,0 +1,113 @@
+import gc
+import os
+from typing import Iterable
+
+
+def merge_pdfs(parts: Iterable[str], output_path: str):
+    """Concatène plusieurs PDF dans l'ordre donné, en remplaçant la sortie de façon atomique"""
+    from pypdf import PdfWriter  # Import différé : seules les constructions incrémentales fusionnent
+
+    writer = PdfWriter()
+    for part in parts:
+        writer.append(part)
+    # Les pages rendues séparément dupliquent ressources et polices : on dédoublonne
+    writer.compress_identical_objects()
+
+    tmp_path = output_path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        writer.write(f)
+    writer.close()
+    os.replace(tmp_path, output_path)
+
+
+def concat_pdfs_streaming(parts: Iterable[str], output_path: str) -> int:
+    """
+    Concatène plusieurs PDF en recopiant leurs objets au fil de l'eau, partie par partie
+
+    Contrairement à `merge_pdfs`, le document fusionné n'est jamais chargé en
+    entier : chaque partie est lue, ses pages et les objets qu'elles utilisent
+    sont renumérotés et écrits directement dans la sortie, puis la partie est
+    oubliée. La mémoire est bornée par la plus grande partie (en contrepartie,
+    les polices intégrées par chaque partie ne sont pas dédoublonnées).
+
+    Returns:
+        Nombre de pages du document produit
+    """
+    from pypdf import PdfReader
+    from pypdf.generic import ArrayObject, DictionaryObject, IndirectObject, NameObject, NumberObject
+
+    root_number, pages_number = 1, 2
+    offsets = {}
+    kids = []
+    base = pages_number  # Les objets de chaque partie sont décalés de `base`
+
+    tmp_path = output_path + ".tmp"
+    with open(tmp_path, "wb") as out:
+        out.write(b"%PDF-1.4\n%\xe2\xe3\xcf\xd3\n")
+
+        def write_object(number: int, obj):
+            offsets[number] = out.tell()
+            out.write(f"{number} 0 obj\n".encode("ascii"))
+            obj.write_to_stream(out)
+            out.write(b"\nendobj\n")
+
+        for part in parts:
+            reader = PdfReader(part)
+            seen, pending = set(), []
+
+            def renumber(obj, base=base, seen=seen, pending=pending):
+                """Remplace en place les références d'un objet par leur numéro dans la sortie"""
+                if isinstance(obj, IndirectObject):
+                    if obj.idnum not in seen:
+                        seen.add(obj.idnum)
+                        pending.append(obj.idnum)
+                    return IndirectObject(base + obj.idnum, 0, None)
+                if isinstance(obj, DictionaryObject):
+                    for key, value in list(dict.items(obj)):
+                        dict.__setitem__(obj, key, renumber(value))
+                elif isinstance(obj, ArrayObject):
+                    for i, value in enumerate(list.__iter__(obj)):
+                        list.__setitem__(obj, i, renumber(value))
+                return obj
+
+            pages = list(reader.pages)
+            seen.update(page.indirect_reference.idnum for page in pages)
+            for page in pages:
+                # Les attributs hérités ont été recopiés sur chaque page par pypdf : le parent est remplacé
+                del page[NameObject("/Parent")]
+                renumber(page)
+                page[NameObject("/Parent")] = IndirectObject(pages_number, 0, None)
+                number = base + page.indirect_reference.idnum
+                write_object(number, page)
+                kids.append(number)
+            while pending:
+                number = pending.pop()
+                write_object(base + number, renumber(reader.get_object(number)))
+            base += int(reader.trailer["/Size"])
+            # Les objets pypdf d'une partie se référencent entre eux : libérés tout de suite, pas au prochain passage du ramasse-miettes
+            del reader, pages
+            gc.collect()
+
+        write_object(pages_number, DictionaryObject({
+            NameObject("/Type"): NameObject("/Pages"),
+            NameObject("/Count"): NumberObject(len(kids)),
+            NameObject("/Kids"): ArrayObject(IndirectObject(kid, 0, None) for kid in kids),
+        }))
+        write_object(root_number, DictionaryObject({
+            NameObject("/Type"): NameObject("/Catalog"),
+            NameObject("/Pages"): IndirectObject(pages_number, 0, None),
+        }))
+
+        size = max(offsets) + 1
+        xref_offset = out.tell()
+        out.write(f"xref\n0 {size}\n".encode("ascii"))
+        out.write(b"0000000000 65535 f \n")
+        for number in range(1, size):
+            if number in offsets:
+                out.write(f"{offsets[number]:010d} 00000 n \n".encode("ascii"))
+            else:
+                out.write(b"0000000000 65535 f \n")
+        out.write(f"trailer\n<< /Size {size} /Root {root_number} 0 R >>\nstartxref\n{xref_offset}\n%%EOF\n".encode("ascii"))
+    os.replace(tmp_path, output_path)
+    return len(kids)
+
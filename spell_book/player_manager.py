@@ -11,6 +11,7 @@ class PlayerManager:
         self.player_path = f"players/{player_name}"
         self.config = self.load_config()
         self.theme = ThemeManager(self.config["theme"])
+        self._known_spells_set = frozenset(self.get_known_spells())
         
     def load_config(self) -> Dict[str, Any]:
         """Charge la configuration du joueur depuis le fichier JSON"""
@@ -39,10 +40,9 @@ class PlayerManager:
         
     def should_include_spell(self, spell_name: str) -> bool:
         """Détermine si un sort doit être inclus dans le grimoire de ce joueur"""
-        known_spells = self.get_known_spells()
-        if not known_spells:  # Si pas de liste spécifique, utiliser le filtre du thème
+        if not self._known_spells_set:  # Si pas de liste spécifique, utiliser le filtre du thème
             return self.theme.should_include_spell(spell_name)
-        return spell_name in known_spells
+        return spell_name in self._known_spells_set
     
     def get_custom_overrides(self) -> Dict[str, Any]:
         """Retourne les surcharges personnalisées du joueur"""
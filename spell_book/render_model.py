@@ -0,0 +1,61 @@
+import os
+from dataclasses import dataclass, field
+from typing import Dict, Iterator, List, Optional
+
+from .spell import Spell
+
+
+def level_title(level: int) -> str:
+    """Intitulé d'un niveau de sort dans le sommaire"""
+    return f"Niveau {level}" if level > 0 else "Tours de magie"
+
+
+@dataclass
+class SpellSection:
+    """Sorts d'un même niveau, triés par nom"""
+    level: int
+    spells: List[Spell]
+
+    @property
+    def title(self) -> str:
+        return level_title(self.level)
+
+
+@dataclass
+class GrimoireDocument:
+    """Modèle de rendu d'un grimoire, indépendant du format de sortie.
+
+    Construit une seule fois à partir du corpus filtré et du thème, il est
+    ensuite rendu par chaque backend (PDF, HTML, Markdown) sans relire ni
+    refiltrer les fiches.
+    """
+    title: str
+    max_prepared: int
+    theme_name: str
+    colors: Dict[str, str]
+    sections: List[SpellSection]
+    illustrations: Dict[str, Optional[str]] = field(default_factory=dict)
+
+    @classmethod
+    def build(cls, title: str, max_prepared: int, theme_name: str, colors: Dict[str, str],
+              spells_by_level: Dict[int, List[Spell]], illustrations_folder: str) -> "GrimoireDocument":
+        sections = [SpellSection(level, spells_by_level[level]) for level in sorted(spells_by_level)]
+        illustrations = {}
+        for section in sections:
+            for spell in section.spells:
+                path = os.path.join(illustrations_folder, f"{spell.sanitized_name}.png")
+                illustrations[spell.sanitized_name] = path if os.path.exists(path) else None
+        return cls(title=title, max_prepared=max_prepared, theme_name=theme_name, colors=dict(colors),
+                   sections=sections, illustrations=illustrations)
+
+    def spells(self) -> Iterator[Spell]:
+        """Parcourt les sorts dans l'ordre du grimoire (par niveau, puis par nom)"""
+        for section in self.sections:
+            yield from section.spells
+
+    def illustration(self, spell: Spell) -> Optional[str]:
+        """Chemin de l'illustration d'un sort, ou None"""
+        return self.illustrations.get(spell.sanitized_name)
+
+    def __len__(self) -> int:
+        return sum(len(section.spells) for section in self.sections)
@@ -0,0 +1,184 @@
+import re
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional
+
+from character_sheet.utils import sanitize_filename
+
+BOOLEAN_TRUE_VALUES = ("oui", "yes", "true")
+BOOLEAN_FALSE_VALUES = ("non", "no", "false")
+MAX_SPELL_LEVEL = 9
+
+# Portée exprimée seulement par une distance : 18, "18", "18 m", "4,5 mètres"...
+RANGE_PATTERN = re.compile(r"^\s*(\d+(?:[.,]\d+)?)\s*(?:m|mètres?|metres?)?\s*$", re.IGNORECASE)
+
+# Attribut du record -> clé JSON des fiches (champs textuels)
+TEXT_FIELDS = (
+    ("original_name", "Nom original"),
+    ("school", "École"),
+    ("casting_time", "Temps d'incantation"),
+    ("target", "Cible"),
+    ("components", "Composantes"),
+    ("duration", "Durée"),
+    ("ritual_time", "Temps du rituel"),
+    ("attack_save", "Type d'attaque / sauvegarde"),
+    ("summary", "Effet synthétique"),
+    ("description", "Description complète"),
+    ("higher_levels", "Effet en surcaste"),
+)
+REQUIRED_FIELDS = ("Nom", "Niveau", "Description complète")
+KNOWN_FIELDS = {"Nom", "Niveau", "Portée", "Concentration", "Rituel"} | {key for _, key in TEXT_FIELDS}
+
+
+class SpellValidationError(ValueError):
+    """Fiche de sort non conforme au schéma"""
+
+    def __init__(self, problems: List[str], source_file: str = ""):
+        self.problems = problems
+        self.source_file = source_file
+        super().__init__(f"{source_file or 'fiche'} : {'; '.join(problems)}")
+
+
+def _parse_bool(value: Any) -> bool:
+    """Interprète les booléens écrits en texte ("oui", "non"...) dans les fiches"""
+    if isinstance(value, str):
+        return value.strip().lower() in BOOLEAN_TRUE_VALUES
+    return bool(value)
+
+
+def _is_bool_like(value: Any) -> bool:
+    if isinstance(value, (bool, type(None))):
+        return True
+    return isinstance(value, str) and value.strip().lower() in BOOLEAN_TRUE_VALUES + BOOLEAN_FALSE_VALUES
+
+
+def _parse_level(value: Any) -> Optional[int]:
+    """Retourne le niveau du sort sous forme d'entier, ou None s'il n'est pas valide"""
+    if isinstance(value, bool):
+        return None
+    if isinstance(value, int):
+        level = value
+    elif isinstance(value, str) and value.strip().isdigit():
+        level = int(value.strip())
+    else:
+        return None
+    return level if 0 <= level <= MAX_SPELL_LEVEL else None
+
+
+def _format_metres(value: float) -> str:
+    return f"{value:g}".replace(".", ",") + " mètres"
+
+
+def parse_range(value: Any):
+    """
+    Normalise une portée
+
+    Returns:
+        (distance en mètres ou None, texte à afficher)
+    """
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return float(value), _format_metres(value)
+    if isinstance(value, str):
+        match = RANGE_PATTERN.match(value)
+        if match:
+            metres = float(match.group(1).replace(",", "."))
+            return metres, _format_metres(metres)
+        return None, value.strip()
+    return None, "-"
+
+
+def validate_spell(data: Any) -> List[str]:
+    """Vérifie une fiche de sort brute et retourne la liste des problèmes (vide si elle est valide)"""
+    if not isinstance(data, dict):
+        return [f"objet JSON attendu, {type(data).__name__} trouvé"]
+    if "erreur" in data:
+        return [f"fiche en erreur ({data['erreur']})"]
+
+    problems = [f"champ « {key} » manquant" for key in REQUIRED_FIELDS if key not in data]
+    name = data.get("Nom")
+    if "Nom" in data and (not isinstance(name, str) or not name.strip()):
+        problems.append("« Nom » doit être un texte non vide")
+    if "Niveau" in data and _parse_level(data["Niveau"]) is None:
+        problems.append(f"« Niveau » doit être un entier entre 0 et {MAX_SPELL_LEVEL} ({data['Niveau']!r})")
+    for key in ("Concentration", "Rituel"):
+        if key in data and not _is_bool_like(data[key]):
+            problems.append(f"« {key} » doit valoir oui/non ou true/false ({data[key]!r})")
+    portee = data.get("Portée")
+    if portee is not None and (isinstance(portee, bool) or not isinstance(portee, (int, float, str))):
+        problems.append(f"« Portée » doit être une distance ou un texte ({portee!r})")
+    for _, key in TEXT_FIELDS:
+        if data.get(key) is not None and not isinstance(data[key], str):
+            problems.append(f"« {key} » doit être un texte ({type(data[key]).__name__} trouvé)")
+    return problems
+
+
+@dataclass(slots=True)
+class Spell:
+    """Fiche de sort validée, dont les champs sont typés et normalisés une seule fois au chargement.
+
+    Le niveau est un entier, rituel et concentration sont des booléens et la
+    portée est convertie en mètres quand c'est une distance. Les `__slots__`
+    évitent un dictionnaire par instance sur les gros corpus.
+    """
+    name: str
+    sanitized_name: str
+    level: int
+    school: str
+    ritual: bool
+    concentration: bool
+    range_m: Optional[float]
+    range_text: str
+    original_name: Optional[str] = None
+    casting_time: Optional[str] = None
+    target: Optional[str] = None
+    components: Optional[str] = None
+    duration: Optional[str] = None
+    ritual_time: Optional[str] = None
+    attack_save: Optional[str] = None
+    summary: Optional[str] = None
+    description: str = ""
+    higher_levels: Optional[str] = None
+    source_file: str = ""
+    extra: Optional[Dict[str, Any]] = None  # Champs hors schéma, conservés tels quels
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any], source_file: str = "") -> "Spell":
+        """Valide et normalise une fiche brute
+
+        Raises:
+            SpellValidationError: si la fiche n'est pas conforme au schéma
+        """
+        problems = validate_spell(data)
+        if problems:
+            raise SpellValidationError(problems, source_file)
+
+        range_m, range_text = parse_range(data.get("Portée"))
+        text_fields = {attribute: data.get(key) for attribute, key in TEXT_FIELDS}
+        text_fields["school"] = text_fields["school"] or ""
+        text_fields["description"] = text_fields["description"] or ""
+        extra = {key: value for key, value in data.items() if key not in KNOWN_FIELDS}
+        return cls(
+            name=data["Nom"],
+            sanitized_name=sanitize_filename(data["Nom"]),
+            level=_parse_level(data["Niveau"]),
+            ritual=_parse_bool(data.get("Rituel", False)),
+            concentration=_parse_bool(data.get("Concentration", False)),
+            range_m=range_m,
+            range_text=range_text,
+            source_file=source_file,
+            extra=extra or None,
+            **text_fields,
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Fiche au format JSON des fichiers de sorts, avec les valeurs normalisées"""
+        data = {"Nom": self.name, "Niveau": self.level, "Portée": self.range_text,
+                "Concentration": self.concentration, "Rituel": "oui" if self.ritual else "non"}
+        for attribute, key in TEXT_FIELDS:
+            data[key] = getattr(self, attribute)
+        if self.extra:
+            data.update(self.extra)
+        return data
+
+    @property
+    def data(self) -> Dict[str, Any]:
+        return self.to_dict()
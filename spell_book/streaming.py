@@ -0,0 +1,46 @@
+from typing import Iterable, Iterator, List
+
+from reportlab.platypus import Flowable, SimpleDocTemplate
+
+# Sorts par partie des grimoires construits en flux : le canevas ne garde que les pages d'une partie
+DEFAULT_CHUNK_SIZE = 250
+
+
+class StreamingDocTemplate(SimpleDocTemplate):
+    """Document ReportLab alimenté à la demande par des paquets de flowables (un paquet par sort).
+
+    ReportLab consomme le récit par le début et oublie chaque flowable une fois
+    dessiné ; ici, le récit n'est jamais construit en entier : il est complété
+    paquet par paquet juste avant de s'épuiser. Seuls les flowables du sort en
+    cours de mise en page restent en mémoire. Le canevas garde en revanche
+    chaque page rendue jusqu'à l'enregistrement : la mémoire d'un document
+    croît encore avec son nombre de pages, d'où l'écriture en parties
+    (DEFAULT_CHUNK_SIZE sorts) des grands grimoires.
+    """
+
+    # Flowables gardés d'avance : ReportLab regarde le suivant (keepWithNext) et s'arrête sur une liste vide
+    LOOKAHEAD = 2
+    _chunks: Iterator[List[Flowable]] = None
+    _story: List[Flowable] = None
+
+    def build_stream(self, chunks: Iterable[List[Flowable]], **kwargs):
+        """Construit le document à partir d'un itérable de paquets de flowables"""
+        self._chunks = iter(chunks)
+        self._story = story = []
+        self._refill(story)
+        if story:
+            self.build(story, **kwargs)
+
+    def _refill(self, flowables: List[Flowable]):
+        while self._chunks is not None and len(flowables) < self.LOOKAHEAD:
+            chunk = next(self._chunks, None)
+            if chunk is None:
+                self._chunks = None
+            else:
+                flowables.extend(chunk)
+
+    def filterFlowables(self, flowables: List[Flowable]):
+        # Appelé par ReportLab avant chaque flowable (récit ou file interne d'actions en attente)
+        if flowables is self._story:
+            self._refill(flowables)
+        super().filterFlowables(flowables)
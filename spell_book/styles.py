@@ -0,0 +1,145 @@
+import threading
+from dataclasses import dataclass
+from typing import Dict, Tuple
+
+from reportlab.lib import colors
+from reportlab.lib.enums import TA_CENTER, TA_LEFT
+from reportlab.lib.styles import ParagraphStyle, StyleSheet1, getSampleStyleSheet
+from reportlab.platypus import TableStyle
+
+# Constantes de mise en page et style
+FONT_SIZE_TITLE = 20
+FONT_SIZE_SUBTITLE = 12
+FONT_SIZE_BODY = 11
+LINE_HEIGHT_BODY = 14
+
+# Espacements (les marges sont portées par PageLayout)
+SPACER_SMALL = 5
+SPACER_MEDIUM = 7
+SPACER_LARGE = 9
+
+DEFAULT_THEME_COLORS = {"title": "#8B0000", "subtitle": "#2F4F4F", "body": "#000000"}
+
+# Ensembles de styles déjà construits, partagés par les générateurs et les constructions du processus
+_BUNDLES: Dict[Tuple, "StyleBundle"] = {}
+_BUNDLES_LOCK = threading.Lock()
+
+
+@dataclass(frozen=True)
+class StyleBundle:
+    """Styles ReportLab d'un grimoire (paragraphes et tableaux), construits une seule fois par thème.
+
+    Les styles ne sont jamais modifiés après leur construction : un même
+    ensemble peut être partagé par toutes les pages d'un grimoire et par des
+    constructions simultanées dans plusieurs threads.
+    """
+    paragraphs: StyleSheet1
+    title_with_image: TableStyle
+    spell_stats: TableStyle
+    prepared_count: TableStyle
+    toc_level: TableStyle
+
+    def __getitem__(self, name: str) -> ParagraphStyle:
+        return self.paragraphs[name]
+
+    @classmethod
+    def for_theme(cls, font_name: str, font_name_title: str, theme_colors: Dict[str, str]) -> "StyleBundle":
+        """Retourne l'ensemble de styles d'un thème, construit une seule fois par processus"""
+        effective_colors = {**DEFAULT_THEME_COLORS, **theme_colors}
+        key = (font_name, font_name_title, tuple(sorted(effective_colors.items())))
+        with _BUNDLES_LOCK:
+            bundle = _BUNDLES.get(key)
+            if bundle is None:
+                bundle = _BUNDLES[key] = cls.build(font_name, font_name_title, effective_colors)
+        return bundle
+
+    @classmethod
+    def build(cls, font_name: str, font_name_title: str, theme_colors: Dict[str, str]) -> "StyleBundle":
+        """
+        Args:
+            font_name: Police du corps de texte
+            font_name_title: Police des titres
+            theme_colors: Couleurs hexadécimales du thème ("title", "subtitle", "body")
+        """
+        theme_colors = {**DEFAULT_THEME_COLORS, **theme_colors}
+        color_title = colors.toColor(theme_colors["title"])
+        color_subtitle = colors.toColor(theme_colors["subtitle"])
+        color_body = colors.toColor(theme_colors["body"])
+
+        styles = getSampleStyleSheet()
+        styles.add(ParagraphStyle(name='Titre', fontName=font_name_title, fontSize=FONT_SIZE_TITLE, alignment=TA_CENTER, spaceAfter=SPACER_LARGE, textColor=color_title))
+        styles.add(ParagraphStyle(name='SousTitre', fontName=font_name, fontSize=FONT_SIZE_SUBTITLE, alignment=TA_LEFT, spaceAfter=SPACER_SMALL, textColor=color_subtitle))
+        styles.add(ParagraphStyle(name='Corps', fontName=font_name, fontSize=FONT_SIZE_BODY, alignment=TA_LEFT, leading=LINE_HEIGHT_BODY, textColor=color_body))
+
+        # Styles pour le sommaire
+        styles.add(ParagraphStyle(
+            name='TitreSommaire',
+            fontName=font_name_title,
+            fontSize=24,
+            alignment=TA_CENTER,
+            spaceAfter=20,
+            textColor=color_title
+        ))
+        styles.add(ParagraphStyle(
+            name='NiveauHeader',
+            fontName=font_name,
+            fontSize=16,
+            alignment=TA_LEFT,
+            spaceAfter=8,
+            spaceBefore=15,
+            textColor=color_subtitle
+        ))
+        styles.add(ParagraphStyle(
+            name='SortEntry',
+            fontName=font_name,
+            fontSize=11,
+            alignment=TA_LEFT,
+            spaceAfter=2,
+            textColor=color_body
+        ))
+        styles.add(ParagraphStyle(
+            name='SortsPreparesStyle',
+            fontName=font_name,
+            fontSize=12,
+            alignment=TA_CENTER,
+            spaceAfter=8,
+            textColor=colors.darkblue
+        ))
+
+        return cls(
+            paragraphs=styles,
+            title_with_image=TableStyle([
+                ("VALIGN", (0, 0), (0, 0), "MIDDLE"),
+                ("ALIGN", (0, 0), (0, 0), "RIGHT"),
+                ("VALIGN", (1, 0), (1, 0), "TOP"),
+                ("ALIGN", (1, 0), (1, 0), "RIGHT"),
+            ]),
+            spell_stats=TableStyle([
+                ('TEXTCOLOR', (0, 0), (-1, 0), colors.slategrey),
+                ('TEXTCOLOR', (0, 2), (-1, 2), colors.slategrey),
+                ('FONTNAME', (0, 0), (-1, -1), font_name),
+                ('FONTSIZE', (0, 0), (-1, -1), 10),
+                ('BOTTOMPADDING', (0, 0), (-1, -1), 6),
+                ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+                ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
+            ]),
+            prepared_count=TableStyle([
+                ('FONTNAME', (0, 0), (0, 0), font_name),
+                ('FONTSIZE', (0, 0), (0, 0), 12),
+                ('TEXTCOLOR', (0, 0), (0, 0), colors.darkblue),
+                ('ALIGN', (0, 0), (0, 0), 'RIGHT'),
+                ('VALIGN', (0, 0), (0, 0), 'MIDDLE'),
+            ]),
+            toc_level=TableStyle([
+                ('FONTNAME', (0, 0), (0, -1), font_name_title),  # Police titre pour les symboles
+                ('FONTNAME', (1, 0), (1, -1), font_name),        # Police manuscrite pour les noms
+                ('FONTSIZE', (0, 0), (-1, -1), 11),
+                ('ALIGN', (0, 0), (0, -1), 'CENTER'),  # Centrer les symboles
+                ('ALIGN', (1, 0), (1, -1), 'LEFT'),    # Aligner les noms à gauche
+                ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
+                ('LEFTPADDING', (0, 0), (-1, -1), 3),
+                ('RIGHTPADDING', (0, 0), (-1, -1), 3),
+                ('TOPPADDING', (0, 0), (-1, -1), 2),
+                ('BOTTOMPADDING', (0, 0), (-1, -1), 2),
+            ]),
+        )
@@ -1,6 +1,6 @@
 import json
 import os
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional
 
 class ThemeManager:
     """Gestionnaire des thèmes pour les grimoires"""
@@ -33,8 +33,8 @@ class ThemeManager:
         return self.config.get("illustration_style", "fantasy art")
     
     def get_colors(self) -> Dict[str, str]:
-        """Retourne les couleurs du thème"""
-        return self.config.get("colors", {})
+        """Retourne une copie des couleurs du thème"""
+        return dict(self.config.get("colors", {}))
     
     def get_title(self) -> str:
         """Retourne le titre du grimoire pour ce thème"""
@@ -44,6 +44,13 @@ class ThemeManager:
         """Retourne le nombre maximum de sorts préparés par défaut"""
         return self.config.get("max_prepared_spells", 10)
     
+    def get_spell_filter(self) -> Optional[List[str]]:
+        """Retourne les termes du filtre de sorts, ou None si tous les sorts sont inclus"""
+        spell_filter = self.config.get("spell_filter", "all")
+        if isinstance(spell_filter, list):
+            return spell_filter
+        return None
+    
     def should_include_spell(self, spell_name: str) -> bool:
         """Détermine si un sort doit être inclus dans ce thème"""
         spell_filter = self.config.get("spell_filter", "all")
@@ -0,0 +1,306 @@
+import os
+import time
+from dataclasses import dataclass, field
+from typing import Dict, FrozenSet, List, Sequence, Set, Tuple, Union
+
+from .batch import GrimoireTarget, build_grimoires, discover_targets
+from .corpus import SpellCorpus, default_spell_source
+
+# Empreinte d'un fichier surveillé : date de modification et taille
+FileStamp = Tuple[int, int]
+
+
+@dataclass
+class TargetDependencies:
+    """Fichiers et sorts dont dépend un grimoire, relevés après sa dernière construction"""
+    theme_name: str = None
+    font_paths: FrozenSet[str] = frozenset()
+    spells: FrozenSet[str] = frozenset()
+
+
+@dataclass
+class RebuildReport:
+    """Résultat d'un cycle de surveillance : modifications regroupées et grimoires reconstruits"""
+    changed: List[str] = field(default_factory=list)
+    targets: List[str] = field(default_factory=list)
+    build_seconds: float = 0.0
+    latency_seconds: float = 0.0
+    errors: int = 0
+
+
+class GrimoireWatcher:
+    """
+    Surveille les fiches de sorts et les configurations, et reconstruit les grimoires concernés
+
+    Les dossiers sont relus par scrutation (os.scandir) à intervalle régulier,
+    sans dépendance externe. Les modifications rapprochées sont regroupées :
+    un lot n'est traité qu'après `debounce` secondes sans nouvelle modification,
+    puis seuls les grimoires qui dépendent d'un fichier modifié sont
+    reconstruits (en mode incrémental) :
+      - fiche de sort : grimoires dont la sélection (filtres joueur et thème)
+        contient le sort, avant ou après la modification ;
+      - players/<joueur>/... : le grimoire de ce joueur ;
+      - themes/<thème>/... (configuration, illustrations) : les grimoires de ce
+        thème, y compris ceux des joueurs qui l'utilisent ;
+      - fonts/... : les grimoires qui utilisent la police.
+    """
+
+    def __init__(self, players: List[str] = None, themes: List[str] = None,
+                 spells_folder: Union[str, Sequence[str]] = None, output_dir: str = "grimoires", jobs: int = 1,
+                 interval: float = 0.5, debounce: float = 0.5, players_dir: str = "players",
+                 themes_dir: str = "themes", fonts_dir: str = "fonts"):
+        """
+        Args:
+            players: Joueurs surveillés (tous ceux de players/ si ni joueur ni thème n'est donné)
+            themes: Thèmes surveillés (tous ceux de themes/ si ni joueur ni thème n'est donné)
+            spells_folder: Dossier des fiches, fichier JSONL, archive zip ou liste de ces sources
+                           (fiches_sorts/ ou fiches_sorts.zip si None)
+            output_dir: Dossier de sortie des PDF
+            jobs: Grimoires reconstruits en parallèle (1 = dans le processus courant)
+            interval: Intervalle de scrutation des fichiers, en secondes
+            debounce: Délai sans modification avant de reconstruire, en secondes
+        """
+        self.players = players
+        self.themes = themes
+        if players is not None or themes is not None:
+            self.players, self.themes = players or [], themes or []
+        if spells_folder is None:
+            spells_folder = default_spell_source()
+        self.spells_folder = spells_folder
+        self.spell_sources = [spells_folder] if isinstance(spells_folder, str) else list(spells_folder)
+        self.output_dir = output_dir
+        self.jobs = jobs
+        self.interval = interval
+        self.debounce = debounce
+        self.players_dir = players_dir
+        self.themes_dir = themes_dir
+        self.fonts_dir = fonts_dir
+
+        self.corpus: SpellCorpus = None
+        self.targets: List[GrimoireTarget] = []
+        self.dependencies: Dict[str, TargetDependencies] = {}
+        self._snapshot: Dict[str, FileStamp] = {}
+
+    # Scrutation des fichiers
+
+    def scan(self) -> Dict[str, FileStamp]:
+        """Relève la date de modification et la taille de chaque fichier surveillé"""
+        stamps = {}
+        for source in self.spell_sources:
+            if os.path.isdir(source):
+                self._scan_folder(source, stamps, recursive=False)
+            elif os.path.exists(source):
+                self._stamp(os.path.normpath(source), stamps)
+        for folder in (self.players_dir, self.themes_dir, self.fonts_dir):
+            self._scan_folder(folder, stamps, recursive=True)
+        return stamps
+
+    def _scan_folder(self, folder: str, stamps: Dict[str, FileStamp], recursive: bool):
+        try:
+            entries = list(os.scandir(folder))
+        except OSError:
+            return
+        for entry in entries:
+            if entry.name.startswith("."):
+                continue
+            path = os.path.normpath(entry.path)
+            if entry.is_dir():
+                if recursive:
+                    self._scan_folder(path, stamps, recursive)
+            else:
+                self._stamp(path, stamps, entry)
+
+    @staticmethod
+    def _stamp(path: str, stamps: Dict[str, FileStamp], entry: os.DirEntry = None):
+        try:
+            stat = entry.stat() if entry is not None else os.stat(path)
+        except OSError:
+            return  # Fichier supprimé entre la liste et la lecture
+        stamps[path] = (stat.st_mtime_ns, stat.st_size)
+
+    @staticmethod
+    def _diff(before: Dict[str, FileStamp], after: Dict[str, FileStamp]) -> Set[str]:
+        """Fichiers ajoutés, supprimés ou modifiés entre deux relevés"""
+        return {path for path in before.keys() | after.keys() if before.get(path) != after.get(path)}
+
+    def wait_for_changes(self) -> Tuple[Set[str], float]:
+        """
+        Attend un lot de modifications stable (aucune nouvelle modification pendant `debounce` secondes)
+
+        Returns:
+            Fichiers modifiés et instant (perf_counter) de la première modification détectée
+        """
+        changed: Set[str] = set()
+        first_seen = last_seen = None
+        while True:
+            time.sleep(self.interval)
+            current = self.scan()
+            new = self._diff(self._snapshot, current)
+            self._snapshot = current
+            now = time.perf_counter()
+            if new:
+                changed |= new
+                first_seen = first_seen or now
+                last_seen = now
+            elif changed and now - last_seen >= self.debounce:
+                return changed, first_seen
+
+    # Dépendances des grimoires
+
+    def _is_spell_source(self, path: str) -> bool:
+        for source in map(os.path.normpath, self.spell_sources):
+            if os.path.isdir(source):
+                if os.path.dirname(path) == source and path.endswith(".json") and os.path.basename(path) != "index.json":
+                    return True
+            elif path == source:
+                return True
+        return False
+
+    @staticmethod
+    def _top_folder(path: str, folder: str) -> str:
+        """Nom du sous-dossier de `folder` contenant `path`, ou None"""
+        relative = os.path.relpath(path, os.path.normpath(folder))
+        if relative.startswith(".."):
+            return None
+        parts = relative.split(os.sep)
+        return parts[0] if len(parts) > 1 else None
+
+    def _dependencies(self, target: GrimoireTarget) -> TargetDependencies:
+        """Relève le thème, les polices et les sorts retenus d'un grimoire avec les filtres joueur/thème"""
+        from .generator import SpellPDFGenerator
+        generator = SpellPDFGenerator(player=target.player, theme=target.theme,
+                                      output_dir=self.output_dir, corpus=self.corpus)
+        return TargetDependencies(
+            theme_name=generator.theme.theme_name,
+            font_paths=frozenset(os.path.normpath(p) for p in (generator.font_path, generator.font_path_title)),
+            spells=frozenset(spell.sanitized_name for spell in generator._select_spells(self.corpus)),
+        )
+
+    def _refresh_dependencies(self):
+        """Recalcule les dépendances de chaque grimoire ; une configuration illisible est signalée"""
+        for target in self.targets:
+            try:
+                self.dependencies[target.label] = self._dependencies(target)
+            except Exception as e:
+                print(f"⚠️  Dépendances de {target.label} indisponibles : {e}")
+                self.dependencies[target.label] = TargetDependencies()
+
+    @staticmethod
+    def _changed_spells(before: SpellCorpus, after: SpellCorpus) -> Set[str]:
+        """Sorts ajoutés, retirés ou modifiés entre deux chargements du corpus"""
+        old = {record.sanitized_name: record.to_dict() for record in before} if before is not None else {}
+        new = {record.sanitized_name: record.to_dict() for record in after}
+        return {name for name in old.keys() | new.keys() if old.get(name) != new.get(name)}
+
+    def affected_targets(self, changed: Set[str], changed_spells: Set[str] = frozenset(),
+                         previous: Dict[str, TargetDependencies] = None) -> List[GrimoireTarget]:
+        """
+        Grimoires qui dépendent d'au moins un fichier ou sort modifié
+
+        Args:
+            changed: Fichiers modifiés
+            changed_spells: Sorts modifiés dans le corpus
+            previous: Dépendances avant la modification (un sort retiré d'une sélection compte aussi)
+        """
+        previous = previous or {}
+        changed_players = {self._top_folder(path, self.players_dir) for path in changed} - {None}
+        changed_themes = {self._top_folder(path, self.themes_dir) for path in changed} - {None}
+
+        affected = []
+        for target in self.targets:
+            before = previous.get(target.label)
+            after = self.dependencies.get(target.label, TargetDependencies())
+            states = [after] + ([before] if before is not None else [])
+            # Grimoire nouveau ou dont la configuration était illisible : toujours reconstruit
+            if (before is None or before.theme_name is None or after.theme_name is None
+                    or (target.player and target.player in changed_players)
+                    or any(state.theme_name in changed_themes for state in states)
+                    or any(state.font_paths & changed for state in states)
+                    or any(state.spells & changed_spells for state in states)):
+                affected.append(target)
+        return affected
+
+    # Reconstruction
+
+    def _discover(self) -> List[GrimoireTarget]:
+        return discover_targets(players=self.players, themes=self.themes,
+                                players_dir=self.players_dir, themes_dir=self.themes_dir)
+
+    def rebuild(self, changed: Set[str], first_seen: float) -> RebuildReport:
+        """Recharge ce qui a changé et reconstruit les grimoires concernés"""
+        report = RebuildReport(changed=sorted(changed))
+        previous = dict(self.dependencies)
+        changed_spells = set()
+        if any(self._is_spell_source(path) for path in changed):
+            corpus = self._load_corpus()
+            if corpus is None:
+                report.errors += 1
+            else:
+                changed_spells = self._changed_spells(self.corpus, corpus)
+                self.corpus = corpus
+        self.targets = self._discover()
+        self._refresh_dependencies()
+
+        targets = self.affected_targets(changed, changed_spells, previous)
+        report.targets = [target.label for target in targets]
+        if targets:
+            start = time.perf_counter()
+            report.errors += self._build(targets)
+            report.build_seconds = time.perf_counter() - start
+        report.latency_seconds = time.perf_counter() - first_seen
+        return report
+
+    def start(self) -> RebuildReport:
+        """Premier relevé des fichiers et construction incrémentale de tous les grimoires surveillés"""
+        self._snapshot = self.scan()
+        # Fiches illisibles au démarrage : corpus vide jusqu'à leur correction
+        self.corpus = self._load_corpus() or SpellCorpus(folder_path=self.spells_folder)
+        self.targets = self._discover()
+        self._refresh_dependencies()
+        start = time.perf_counter()
+        errors = self._build(self.targets)
+        elapsed = time.perf_counter() - start
+        return RebuildReport(targets=[target.label for target in self.targets], build_seconds=elapsed,
+                             latency_seconds=elapsed, errors=errors)
+
+    def _load_corpus(self) -> SpellCorpus:
+        """Recharge les fiches ; en cas d'erreur (JSON en cours d'écriture...), la signale et retourne None"""
+        try:
+            return SpellCorpus.load(self.spells_folder)
+        except Exception as e:
+            print(f"❌ Fiches de sorts illisibles, corpus précédent conservé : {e}")
+            return None
+
+    def _build(self, targets: List[GrimoireTarget]) -> int:
+        """Reconstruit des grimoires et retourne le nombre d'échecs (la surveillance continue dans tous les cas)"""
+        try:
+            results = build_grimoires(targets, output_dir=self.output_dir, jobs=self.jobs,
+                                      incremental=True, corpus=self.corpus)
+        except Exception as e:
+            print(f"❌ Reconstruction interrompue : {e}")
+            return len(targets)
+        return sum(1 for result in results if result.error)
+
+    def run(self, cycles: int = None):
+        """Surveille les fichiers et reconstruit à chaque lot de modifications (indéfiniment si cycles est None)"""
+        self.start()
+        print(f"👀 Surveillance de {len(self._snapshot)} fichiers ({len(self.targets)} grimoires), Ctrl+C pour arrêter")
+        done = 0
+        while cycles is None or done < cycles:
+            changed, first_seen = self.wait_for_changes()
+            try:
+                self._print_report(self.rebuild(changed, first_seen))
+            except Exception as e:
+                print(f"❌ Lot de modifications non traité : {e}")
+            done += 1
+
+    @staticmethod
+    def _print_report(report: RebuildReport):
+        preview = ", ".join(report.changed[:5]) + (f", … (+{len(report.changed) - 5})" if len(report.changed) > 5 else "")
+        print(f"🔔 {len(report.changed)} fichier(s) modifié(s) : {preview}")
+        if not report.targets:
+            print("💤 Aucun grimoire ne dépend de ces fichiers")
+            return
+        status = "✅" if not report.errors else "⚠️ "
+        print(f"{status} {len(report.targets)} grimoire(s) reconstruit(s) en {report.build_seconds:.2f}s "
+              f"({report.latency_seconds:.2f}s depuis la première modification) : {', '.join(report.targets)}")